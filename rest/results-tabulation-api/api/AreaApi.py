@@ -1,5 +1,6 @@
 from schemas import AreaSchema
-from util import get_area_type, get_paginated_query
+from util import get_area_type
+from util.pagination import get_keyset_page, get_keyset_paginated_response
 from orm.entities import Area
 
 
@@ -10,10 +11,9 @@ def get_all(electionId=None, areaName=None, associatedAreaId=None, areaType=None
         associated_area_id=associatedAreaId,
         area_type=get_area_type(area_type=areaType)
     )
-    query = get_paginated_query(query)
-    result = query.all()
+    result, next_cursor = get_keyset_page(query, [Area.Model.areaId])
 
-    return AreaSchema(many=True).dump(result).data
+    return get_keyset_paginated_response(AreaSchema(many=True).dump(result).data, next_cursor)
 
 
 def get_by_id(areaId):
@@ -1,5 +1,7 @@
 from app import db
-from util import RequestBody, get_ballot_type, get_paginated_query
+
+from util import RequestBody, get_ballot_type
+from util.pagination import get_keyset_page, get_keyset_paginated_response
 
 from schemas import Ballot_Schema as Schema
 from orm.entities import Ballot
@@ -13,9 +15,10 @@ def get_all(ballotId=None, ballotType=None, electionId=None):
         electionId=electionId
     )
 
-    result = get_paginated_query(result).all()
+    # Ordered by the numeric value of the ballot id, with the id itself to break ties like "01" and "1".
+    result, next_cursor = get_keyset_page(result, [Ballot.Model.ballotSerial, Ballot.Model.ballotId])
 
-    return Schema(many=True).dump(result).data
+    return get_keyset_paginated_response(Schema(many=True).dump(result).data, next_cursor)
 
 
 def create(body):
@@ -7,6 +7,7 @@ from exception.messages import MESSAGE_CODE_ELECTION_NOT_FOUND
 from orm.entities.Election.election_helper import get_root_token
 from orm.entities import Election
 from schemas import ElectionSchema as Schema
+from schemas.serializers import ElectionSerializer
 from util import RequestBody, get_paginated_query
 
 
@@ -16,7 +17,7 @@ def get_all():
 
     result = get_paginated_query(result).all()
 
-    return Schema(many=True).dump(result).data
+    return ElectionSerializer.dump_many([election.get_snapshot() for election in result])
 
 
 @authorize(required_roles=ALL_ROLES)
@@ -28,7 +29,7 @@ def get_by_id(electionId):
             code=MESSAGE_CODE_ELECTION_NOT_FOUND
         )
 
-    return Schema().dump(result).data
+    return ElectionSerializer.dump(result.get_snapshot())
 
 
 @authorize(required_roles=[ADMIN_ROLE])
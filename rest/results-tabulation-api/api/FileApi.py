@@ -1,9 +1,13 @@
-from io import BytesIO
+import unicodedata
 
-from flask import send_file
+from flask import Response, current_app, request, stream_with_context
+from werkzeug.urls import url_quote
 
+from exception import NotFoundException
+from exception.messages import MESSAGE_CODE_FILE_NOT_FOUND
 from schemas import File_Schema as Schema
 from orm.entities.IO import File as Model
+from orm.entities.IO.File import FileBlob
 
 
 def get_by_id(fileId):
@@ -14,19 +18,96 @@ def get_by_id(fileId):
     return Schema().dump(result).data
 
 
+def _get_content_range(file_size, etag):
+    """
+    Gets the single byte range requested, if any. Multiple ranges are not supported and responded with the whole
+    content.
+
+    :return: (start, stop) of the range, None if the whole content is requested, or False if the range can't be
+    satisfied.
+    """
+    if request.range is None or request.range.units != "bytes" or len(request.range.ranges) != 1:
+        return None
+
+    # The range is ignored if the content has changed since the client has fetched the first part.
+    if request.if_range.etag is not None and request.if_range.etag != etag:
+        return None
+
+    content_range = request.range.range_for_length(file_size)
+    if content_range is None:
+        return False
+
+    return content_range
+
+
 def response_file(fileId, as_attachment):
     file = Model.get_by_id(
         fileId=fileId
     )
 
-    fileName = "%d-%s" % (file.fileId, file.fileName)
+    if file is None or file.fileBlob is None:
+        NotFoundException(
+            message="File not found (fileId=%d)" % fileId,
+            code=MESSAGE_CODE_FILE_NOT_FOUND
+        )
 
-    return send_file(
-        BytesIO(file.fileContent),
-        mimetype=file.fileMimeType,
-        attachment_filename=fileName,
-        as_attachment=as_attachment
-    )
+    # The content is addressed by its hash, hence the hash never changes unless the content does.
+    etag = file.fileBlobHash
+    file_size = file.fileSize
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+
+        return response
+
+    content_range = _get_content_range(file_size=file_size, etag=etag)
+
+    if content_range is False:
+        response = Response(status=416)
+        response.headers["Content-Range"] = "bytes */%d" % file_size
+    else:
+        if content_range is None:
+            start, stop = 0, file_size
+            status = 200
+        else:
+            start, stop = content_range
+            status = 206
+
+        response = Response(
+            stream_with_context(FileBlob.iter_content(fileBlobHash=file.fileBlobHash, start=start, stop=stop)),
+            status=status,
+            mimetype=file.fileMimeType,
+            direct_passthrough=True
+        )
+        response.content_length = stop - start
+
+        if status == 206:
+            response.content_range = "bytes %d-%d/%d" % (start, stop - 1, file_size)
+
+    response.accept_ranges = "bytes"
+    response.set_etag(etag)
+
+    cache_timeout = current_app.get_send_file_max_age(file.fileName)
+    if cache_timeout is not None:
+        response.cache_control.public = True
+        response.cache_control.max_age = cache_timeout
+
+    if as_attachment:
+        fileName = "%d-%s" % (file.fileId, file.fileName)
+
+        try:
+            fileName.encode("latin-1")
+            file_names = {"filename": fileName}
+        except UnicodeEncodeError:
+            file_names = {
+                "filename": unicodedata.normalize("NFKD", fileName).encode("latin-1", "ignore").decode("latin-1"),
+                "filename*": "UTF-8''%s" % url_quote(fileName)
+            }
+
+        response.headers.add("Content-Disposition", "attachment", **file_names)
+
+    return response
 
 
 def get_inline_file(fileId):
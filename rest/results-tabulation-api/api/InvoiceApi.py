@@ -1,5 +1,6 @@
 from app import db
-from util import RequestBody, get_paginated_query
+from util import RequestBody
+from util.pagination import get_keyset_page, get_keyset_paginated_response
 
 from schemas import Invoice_Schema as Schema
 from orm.entities import Invoice as Model
@@ -15,9 +16,9 @@ def get_all(electionId=None, issuingOfficeId=None, receivingOfficeId=None, issue
         issuedTo=issuedTo
     )
 
-    result = get_paginated_query(result).all()
+    result, next_cursor = get_keyset_page(result, [Model.Model.invoiceId])
 
-    return Schema(many=True).dump(result).data
+    return get_keyset_paginated_response(Schema(many=True).dump(result).data, next_cursor)
 
 
 def get_by_id(invoiceId):
@@ -0,0 +1,7 @@
+from flask import Response
+
+from util import instrumentation
+
+
+def get():
+    return Response(instrumentation.get_metrics_text(), content_type=instrumentation.METRICS_MIMETYPE)
@@ -9,7 +9,9 @@ from orm.entities.Submission import TallySheet
 from orm.entities.Submission.TallySheet import TallySheetModel
 from orm.entities.SubmissionVersion import TallySheetVersion
 from schemas import TallySheetSchema
-from util import RequestBody, get_paginated_query, result_push_service
+from schemas.serializers import TallySheetSerializer
+from util import RequestBody, result_push_service, unit_of_work
+from util.pagination import get_keyset_page, get_keyset_paginated_response
 
 
 @authorize(required_roles=ALL_ROLES)
@@ -21,9 +23,12 @@ def getAll(electionId=None, areaId=None, tallySheetCode=None, voteType=None):
         voteType=voteType
     )
 
-    result = get_paginated_query(result).all()
+    result, next_cursor = get_keyset_page(
+        result.options(*TallySheet.get_list_query_options()), [TallySheetModel.tallySheetId]
+    )
+    TallySheet.load_area_map_lists(result)
 
-    return TallySheetSchema(many=True).dump(result).data
+    return get_keyset_paginated_response(TallySheetSerializer.dump_many(result), next_cursor)
 
 
 @authorize(required_roles=ALL_ROLES)
@@ -40,6 +45,7 @@ def get_by_id(tallySheetId):
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def unlock(tallySheetId):
     tally_sheet = TallySheet.get_by_id(tallySheetId=tallySheetId)
 
@@ -87,6 +93,7 @@ def unlock(tallySheetId):
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def lock(tallySheetId, body):
     request_body = RequestBody(body)
     tallySheetVersionId = request_body.get("lockedVersionId")
@@ -160,6 +167,7 @@ def lock(tallySheetId, body):
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def notify(tallySheetId):
     tally_sheet = TallySheet.get_by_id(tallySheetId=tallySheetId)
 
@@ -168,24 +176,19 @@ def notify(tallySheetId):
 
     tally_sheet.set_notified_version()
 
-    db.session.commit()
+    # Queued along with the notified version and pushed by the result push dispatcher.
+    result_push_service.notify_results(
+        tally_sheet=tally_sheet,
+        tally_sheet_version_id=tally_sheet.notifiedVersionId
+    )
 
-    try:
-        result_push_service.notify_results(
-            tally_sheet=tally_sheet,
-            tally_sheet_version_id=tally_sheet.notifiedVersionId
-        )
-    except:  # rollback notification flag
-        print("Result push service failed. Check the url configuration.")
-        tally_sheet.notifiedVersionId = None
-        tally_sheet.notifiedStampId = None
-        db.session.commit()
-        return "Push Service Failed. Please check configuration and try again.", 500
+    db.session.commit()
 
     return TallySheetSchema().dump(tally_sheet).data, 201
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def release(tallySheetId):
     tally_sheet = TallySheet.get_by_id(tallySheetId=tallySheetId)
 
@@ -197,24 +200,19 @@ def release(tallySheetId):
 
     tally_sheet.set_released_version()
 
-    db.session.commit()
+    # Queued along with the released version and pushed by the result push dispatcher.
+    result_push_service.release_results(
+        tally_sheet=tally_sheet,
+        tally_sheet_version_id=tally_sheet.releasedVersionId
+    )
 
-    try:
-        result_push_service.release_results(
-            tally_sheet=tally_sheet,
-            tally_sheet_version_id=tally_sheet.releasedVersionId
-        )
-    except:  # rollback release flag
-        print("Result push service failed. Check the url configuration.")
-        tally_sheet.releasedVersionId = None
-        tally_sheet.releasedStampId = None
-        db.session.commit()
-        return "Push Service Failed. Please check configuration and try again.", 500
+    db.session.commit()
 
     return TallySheetSchema().dump(tally_sheet).data, 201
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def request_edit(tallySheetId):
     tally_sheet = TallySheet.get_by_id(tallySheetId=tallySheetId)
 
@@ -239,6 +237,7 @@ def request_edit(tallySheetId):
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def submit(tallySheetId, body):
     request_body = RequestBody(body)
     tallySheetVersionId = request_body.get("submittedVersionId")
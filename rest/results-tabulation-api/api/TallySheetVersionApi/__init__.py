@@ -1,4 +1,4 @@
-from flask import Response
+from flask import Response, request
 from app import db
 from auth import authorize
 from constants.AUTH_CONSTANTS import ALL_ROLES
@@ -7,18 +7,30 @@ from exception.messages import MESSAGE_CODE_TALLY_SHEET_NOT_FOUND, MESSAGE_CODE_
 from orm.entities.Submission import TallySheet
 from orm.entities.SubmissionVersion import TallySheetVersion
 from schemas import TallySheetVersionSchema
-from util import get_paginated_query, RequestBody
+from schemas.serializers import TallySheetVersionSerializer
+from util import RequestBody, rendered_report_cache, columnar, unit_of_work
+from util.pagination import get_keyset_page, get_keyset_paginated_response
 
 
+@authorize(required_roles=ALL_ROLES)
 def get_all(tallySheetId):
+    tally_sheet = TallySheet.get_by_id(tallySheetId=tallySheetId)
+
+    if tally_sheet is None:
+        raise NotFoundException(
+            message="Tally sheet not found (tallySheetId=%d)" % tallySheetId,
+            code=MESSAGE_CODE_TALLY_SHEET_NOT_FOUND
+        )
+
     result = TallySheetVersion.get_all(tallySheetId=tallySheetId)
 
-    result = get_paginated_query(result).all()
+    result, next_cursor = get_keyset_page(result, [TallySheetVersion.Model.tallySheetVersionId])
 
-    return TallySheetVersionSchema(many=True).dump(result).data
+    return get_keyset_paginated_response(TallySheetVersionSchema(many=True).dump(result).data, next_cursor)
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def create_empty(tallySheetId):
     tallySheet, tallySheetVersion = TallySheet.create_empty_version(
         tallySheetId=tallySheetId
@@ -29,6 +41,7 @@ def create_empty(tallySheetId):
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def create_empty_and_get_html(tallySheetId):
     tallySheet, tallySheetVersion = TallySheet.create_empty_version(
         tallySheetId=tallySheetId
@@ -38,6 +51,22 @@ def create_empty_and_get_html(tallySheetId):
     return Response(tallySheetVersion.html(), mimetype='text/html')
 
 
+def _get_rendered_report_response(tally_sheet, tallySheetVersionId, render_type):
+    rendered_report = rendered_report_cache.get_rendered_report(tally_sheet=tally_sheet,
+                                                                tallySheetVersionId=tallySheetVersionId,
+                                                                render_type=render_type)
+
+    # The validator is weak, since the footer of each response carries the requesting user and the time of the request.
+    if request.if_none_match.contains_weak(rendered_report.etag):
+        response = Response(status=304)
+    else:
+        response = Response(rendered_report.get_html(), mimetype='text/html')
+
+    response.set_etag(rendered_report.etag, weak=True)
+
+    return response
+
+
 @authorize(required_roles=ALL_ROLES)
 def letter_html(tallySheetId, tallySheetVersionId):
     tally_sheet = TallySheet.get_by_id(tallySheetId=tallySheetId)
@@ -57,7 +86,8 @@ def letter_html(tallySheetId, tallySheetVersionId):
             code=MESSAGE_CODE_TALLY_SHEET_VERSION_NOT_FOUND
         )
 
-    return Response(tally_sheet.html_letter(tallySheetVersionId=tallySheetVersionId), mimetype='text/html')
+    return _get_rendered_report_response(tally_sheet=tally_sheet, tallySheetVersionId=tallySheetVersionId,
+                                         render_type=rendered_report_cache.RENDER_TYPE_LETTER_HTML)
 
 
 @authorize(required_roles=ALL_ROLES)
@@ -79,7 +109,8 @@ def html(tallySheetId, tallySheetVersionId):
             code=MESSAGE_CODE_TALLY_SHEET_VERSION_NOT_FOUND
         )
 
-    return Response(tally_sheet.html(tallySheetVersionId=tallySheetVersionId), mimetype='text/html')
+    return _get_rendered_report_response(tally_sheet=tally_sheet, tallySheetVersionId=tallySheetVersionId,
+                                         render_type=rendered_report_cache.RENDER_TYPE_HTML)
 
 
 @authorize(required_roles=ALL_ROLES)
@@ -96,10 +127,32 @@ def get_by_id(tallySheetId, tallySheetVersionId):
         tallySheetVersionId=tallySheetVersionId
     )
 
-    return TallySheetVersionSchema().dump(result).data
+    # The content can be responded in columns instead, as negotiated by the Accept header.
+    mimetype = request.accept_mimetypes.best_match(columnar.COLUMNAR_MIMETYPES, default=columnar.MIMETYPE_JSON)
+    if mimetype == columnar.MIMETYPE_JSON:
+        return TallySheetVersionSerializer.dump(result), 200, {"Vary": "Accept"}
+
+    if result is None:
+        raise NotFoundException(
+            message="Tally sheet version not found (tallySheetVersionId=%d)" % tallySheetVersionId,
+            code=MESSAGE_CODE_TALLY_SHEET_VERSION_NOT_FOUND
+        )
+
+    columnar_result = columnar.get_columnar_result(
+        query=result.get_content_query(),
+        columns=TallySheetVersion.CONTENT_COLUMNS,
+        dictionary_column_names=TallySheetVersion.CONTENT_DICTIONARY_COLUMN_NAMES,
+        metadata=TallySheetVersionSchema(exclude=("content",)).dump(result).data
+    )
+
+    response = Response(columnar_result.serialize(mimetype), mimetype=mimetype)
+    response.vary.add("Accept")
+
+    return response
 
 
 @authorize(required_roles=ALL_ROLES)
+@unit_of_work.deferred
 def create(tallySheetId, body):
     request_body = RequestBody(body)
 
@@ -18,7 +18,8 @@ ma = Marshmallow()
 cache = Cache(config={
     "DEBUG": True,  # some Flask specific configs
     "CACHE_TYPE": "simple",  # Flask-Caching related configs
-    "CACHE_DEFAULT_TIMEOUT": 18144000000  # One month
+    "CACHE_DEFAULT_TIMEOUT": 18144000000,  # One month
+    "CACHE_THRESHOLD": 1000  # Maximum number of items before the oldest start getting dropped
 })
 
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -65,7 +66,7 @@ def create_app():
     app.config.from_envvar('ENV_CONFIG')
 
     # Configure the SQLAlchemy part of the app instance
-    app.config['SQLALCHEMY_ECHO'] = app.config['DEBUG']
+    app.config['SQLALCHEMY_ECHO'] = app.config.get('SQLALCHEMY_ECHO', app.config['DEBUG'])
 
     if app.config['DATABASE_PLUGIN'] == "sqlite":
         # this is for unit tests
@@ -88,13 +89,29 @@ def create_app():
     # Initialize Marshmallow
     ma.init_app(app)
 
-    # add CORS support
-    CORS(app)
+    # add CORS support, exposing the pagination headers to the clients.
+    CORS(app, expose_headers=["Link", "X-Next-Cursor"])
 
     # Read the swagger.yml file to configure the endpoints
     connex_app.add_api("swagger.yml", strict_validation=True,
                        validate_responses=False)
 
+    # Load the static assets once, instead of reading them from the disk on every render.
+    from util import static_assets
+    static_assets.load(app.static_folder)
+
+    # Records the cost of each request per endpoint, which is exposed at /metrics.
+    from util import instrumentation
+    instrumentation.init_app(app)
+
+    # Counts the flushes and the queries of each request, and responds them in the debug headers.
+    from util import unit_of_work
+    unit_of_work.init_app(app)
+
+    # Shares the election snapshots with the other requests only once the changes they were built from are committed.
+    from orm.entities.Election import ElectionSnapshot
+    ElectionSnapshot.init_app(app)
+
     @app.context_processor
     def inject_to_template():
         is_prod_env = False
@@ -103,18 +120,36 @@ def create_app():
             is_prod_env = app.config['PROD_ENV']
 
         from auth import get_user_name
-        current_user_name = ''
+        from util import rendered_report_cache
+
+        if rendered_report_cache.is_rendering_cached_report():
+            current_user_name = rendered_report_cache.CURRENT_USER_PLACEHOLDER
+            current_timestamp = rendered_report_cache.CURRENT_TIMESTAMP_PLACEHOLDER
+        else:
+            current_user_name = ''
+
+            try:
+                current_user_name = get_user_name()
+            except:
+                pass
+
+            current_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-        try:
-            current_user_name = get_user_name()
-        except:
-            pass
         return dict(
             isProdEnv=is_prod_env,
             current_user=current_user_name,
-            current_timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            current_timestamp=current_timestamp,
+            static_asset_src=static_assets.get_src,
+            static_asset_url=static_assets.get_url
         )
 
     cache.init_app(app)
 
+    if app.config.get('RESULT_PUSH_DISPATCHER_ENABLED', True):
+        # Started along with the first request, so that the management commands don't start pushing results.
+        @app.before_first_request
+        def start_result_push_dispatcher():
+            from util import result_push_dispatcher
+            result_push_dispatcher.start(app)
+
     return connex_app
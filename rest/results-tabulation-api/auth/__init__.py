@@ -1,3 +1,4 @@
+import hashlib
 from typing import Dict, Set
 
 import connexion
@@ -24,6 +25,12 @@ AREA_ID = "areaId"
 USER_ACCESS_AREA_IDS = "userAccessAreaIds"
 USER_NAME = "userName"
 USER_ROLES = "userRoles"
+USER_CLAIMS = "userClaims"
+
+USER_ACCESS_AREA_IDS_CACHE_TIMEOUT = 60 * 60  # One hour
+
+# Root election id of each area, loaded per worker process. The election of an area never changes.
+_area_root_election_id_map = {}
 
 Countries = "Countries"
 CountingCentres = "CountingCentres"
@@ -69,6 +76,10 @@ def get_claims() -> Dict[str, Dict]:
     :return: dict of claim id to claim value.
     """
 
+    # The token is decoded only once per request.
+    if USER_CLAIMS in connexion.context:
+        return connexion.context[USER_CLAIMS]
+
     claims: dict = decode_token(get_jwt_token())
     filtered_claims = {}
 
@@ -95,6 +106,8 @@ def get_claims() -> Dict[str, Dict]:
     if ROLE_CLAIM in claims.keys():
         filtered_claims[ROLE_CLAIM] = claims.get(ROLE_CLAIM)
 
+    connexion.context[USER_CLAIMS] = filtered_claims
+
     return filtered_claims
 
 
@@ -210,13 +223,54 @@ def _get_role_area_ids(parentAreaIds, areaType, voteTypes=[]):
     return _role_area_ids
 
 
-@decorator
-@authenticate
-def authorize(func, required_roles=None, *args, **kwargs):
-    from orm.enums import AreaTypeEnum
+def _get_claim_area_ids(required_roles):
+    claims: Dict = get_claims()
+
+    claim_area_ids = set()
+    for role in required_roles:
+        claim = AREA_CLAIM_PREFIX + role
+        if claim in claims.keys() and has_role(role):
+            claim_area_ids.update([x.get(AREA_ID) for x in claims.get(claim)])
+
+    return claim_area_ids
 
-    if required_roles is None:
-        return func(*args, **kwargs)
+
+def _get_root_election_ids(area_ids):
+    from orm.entities import Area, Election
+
+    missing_area_ids = [area_id for area_id in area_ids if area_id not in _area_root_election_id_map]
+    if len(missing_area_ids) > 0:
+        # The unknown areas are not kept, since they might be built later.
+        _area_root_election_id_map.update(db.session.query(Area.Model.areaId, Election.Model.rootElectionId).filter(
+            Area.Model.areaId.in_(missing_area_ids),
+            Election.Model.electionId == Area.Model.electionId
+        ).all())
+
+    return sorted({
+        _area_root_election_id_map[area_id] for area_id in area_ids if area_id in _area_root_election_id_map
+    })
+
+
+def _get_area_hierarchy_version(required_roles):
+    from orm.entities.Area import AreaIndex
+
+    # Only the hierarchies of the elections of the areas in the token, each read once per request at most along with
+    # the area index.
+    return ",".join([
+        "%d.%s" % (root_election_id, AreaIndex.get_hierarchy_version(rootElectionId=root_election_id))
+        for root_election_id in _get_root_election_ids(_get_claim_area_ids(required_roles))
+    ])
+
+
+def _get_user_access_area_ids_cache_key(required_roles):
+    token_hash = hashlib.sha256(get_jwt_token().encode()).hexdigest()
+
+    return "%s:%s:%s:%s" % (USER_ACCESS_AREA_IDS, token_hash, ",".join(required_roles),
+                            _get_area_hierarchy_version(required_roles))
+
+
+def _get_user_access_area_ids(required_roles):
+    from orm.enums import AreaTypeEnum
 
     claims: Dict = get_claims()
 
@@ -315,31 +369,46 @@ def authorize(func, required_roles=None, *args, **kwargs):
             ])
 
         elif role is EC_LEADERSHIP_ROLE:
+            # To list, view and unlock All Island Reports
+            user_access_area_ids.extend(claim_area_ids)
+
+            user_access_area_ids.extend([
+                area.areaId for area in _get_role_area_ids(
+                    parentAreaIds=claim_area_ids,
+                    areaType=AreaTypeEnum.ElectoralDistrict
+                )
+            ])
+
+            user_access_area_ids.extend([
+                area.areaId for area in _get_role_area_ids(
+                    parentAreaIds=claim_area_ids,
+                    areaType=AreaTypeEnum.PollingDivision
+                )
+            ])
+
+            user_access_area_ids.extend([
+                area.areaId for area in _get_role_area_ids(
+                    parentAreaIds=claim_area_ids,
+                    areaType=AreaTypeEnum.CountingCentre
+                )
+            ])
+
+    return claim_found, set(user_access_area_ids)
+
+
+@decorator
+@authenticate
+def authorize(func, required_roles=None, *args, **kwargs):
+    if required_roles is None:
+        return func(*args, **kwargs)
+
+    cache_key = _get_user_access_area_ids_cache_key(required_roles)
+    cached_user_access_area_ids = cache.get(cache_key)
+    if cached_user_access_area_ids is None:
+        cached_user_access_area_ids = _get_user_access_area_ids(required_roles)
+        cache.set(cache_key, cached_user_access_area_ids, timeout=USER_ACCESS_AREA_IDS_CACHE_TIMEOUT)
 
-            for country_id in claim_area_ids:
-                # To list, view and unlock All Island Reports
-                user_access_area_ids.extend(claim_area_ids)
-
-                user_access_area_ids.extend([
-                    area.areaId for area in _get_role_area_ids(
-                        parentAreaIds=claim_area_ids,
-                        areaType=AreaTypeEnum.ElectoralDistrict
-                    )
-                ])
-
-                user_access_area_ids.extend([
-                    area.areaId for area in _get_role_area_ids(
-                        parentAreaIds=claim_area_ids,
-                        areaType=AreaTypeEnum.PollingDivision
-                    )
-                ])
-
-                user_access_area_ids.extend([
-                    area.areaId for area in _get_role_area_ids(
-                        parentAreaIds=claim_area_ids,
-                        areaType=AreaTypeEnum.CountingCentre
-                    )
-                ])
+    claim_found, user_access_area_ids = cached_user_access_area_ids
 
     if not claim_found:
         UnauthorizedException(
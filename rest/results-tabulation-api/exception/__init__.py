@@ -1,6 +1,10 @@
 from connexion import ProblemException
 
 
+def BadRequestException(message="", code=None):
+    raise ProblemException(400, "Bad Request", message, "BadRequest", code)
+
+
 def UnauthorizedException(message="", code=None):
     raise ProblemException(401, "Unauthorized", message, "Unauthorized", code)
 
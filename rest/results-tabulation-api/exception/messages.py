@@ -27,5 +27,9 @@ MESSAGE_CODE_TALLY_SHEET_ALREADY_RELEASED = 26
 MESSAGE_CODE_TALLY_SHEET_ALREADY_NOTIFIED = 27
 MESSAGE_CODE_TALLY_SHEET_NOT_ALLOWED_TO_BE_RELEASED = 28
 MESSAGE_CODE_TALLY_SHEET_NOT_ALLOWED_TO_BE_NOTIFIED = 29
-# next: 28
+MESSAGE_CODE_FILE_NOT_FOUND = 30
+MESSAGE_CODE_INVALID_PAGINATION_CURSOR = 31
+MESSAGE_CODE_BALLOT_BOOK_INVALID_RANGE = 32
+MESSAGE_CODE_BALLOT_AMBIGUOUS_SERIAL = 33
+# next: 34
 # Do not change the numbers and new always. These are linked to client applications.
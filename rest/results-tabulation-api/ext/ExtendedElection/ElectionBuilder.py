@@ -0,0 +1,307 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+
+from app import db
+from auth import get_ip, get_user_name
+from orm.entities import Area, Submission, Proof, History, Meta
+from orm.entities.Audit import Stamp, Barcode
+from orm.entities.IO import Folder
+from orm.entities.Meta import MetaData
+from orm.entities.Submission import TallySheet
+from orm.enums import SubmissionTypeEnum
+from util.id_allocation import allocate_ids
+
+ELECTION_BUILDER_BATCH_SIZE = 1000
+
+
+class ElectionBuilderEntry:
+    """
+    A row planned to be inserted. The id of the row is allocated only at the time of inserting, hence the entries
+    refer each other by the entry objects instead of ids.
+    """
+
+    def __init__(self, model, values, partition=None):
+        self.model = model
+        self.values = values
+        self.partition = partition
+        self.id = None
+
+    def get_referred_entries(self):
+        return [value for value in self.values.values() if isinstance(value, ElectionBuilderEntry)]
+
+
+def print_progress(message, done=None, total=None):
+    if total is None:
+        print("[BUILD] %s" % message)
+    else:
+        print("[BUILD] %s (%d/%d)" % (message, done, total))
+
+
+def _resolve_value(value):
+    if isinstance(value, ElectionBuilderEntry):
+        return value.id
+    elif callable(value):
+        return value()
+    else:
+        return value
+
+
+class ElectionBuilder:
+    """
+    Builds an election in two phases. First the datasets are planned in to deduplicated entries in memory, and then
+    the entries are inserted table by table with bulk inserts and pre-allocated ids.
+
+    Tables are inserted in the order their first entries were planned, hence an entry must be planned only after the
+    entries it refers.
+
+    Entries can be planned under a partition, such as an electoral district. When built with workers, the entries
+    without a partition are inserted and committed first, and then each partition is inserted by a worker with its own
+    session. An entry referred from another partition is moved out of its partition, along with the entries it refers.
+    """
+
+    def __init__(self, progress=None, batch_size=ELECTION_BUILDER_BATCH_SIZE):
+        self.progress = progress or print_progress
+        self.batch_size = batch_size
+
+        self._entries = OrderedDict()
+        self._link_keys = {}
+        self._partition = None
+        self._insert_locks = {}
+
+        # Every stamp of a build is on behalf of the same request.
+        self._stamp_ip = get_ip()
+        self._stamp_created_by = get_user_name()
+        self._stamp_created_at = datetime.now()
+
+    def set_partition(self, partition):
+        """
+        Sets the partition of the entries planned hereafter. None for the entries to be inserted before the partitions.
+        """
+        self._partition = partition
+
+    def add(self, model, **values):
+        entry = ElectionBuilderEntry(model=model, values=values, partition=self._partition)
+
+        if model not in self._entries:
+            self._entries[model] = []
+
+        self._entries[model].append(entry)
+
+        return entry
+
+    def add_link(self, model, **values):
+        """
+        Plans an association row, unless the same association has been planned already.
+        """
+        if model not in self._link_keys:
+            self._link_keys[model] = set()
+
+        link_key = tuple(values[key] for key in sorted(values))
+        if link_key in self._link_keys[model]:
+            return None
+
+        self._link_keys[model].add(link_key)
+
+        return self.add(model, **values)
+
+    def add_area(self, area_class, areaName, electionId):
+        # Areas of all the types are planned as one table, so that they are inserted in the order they were planned.
+        return self.add(
+            Area.Model,
+            areaName=areaName,
+            areaType=area_class.Model.__mapper_args__["polymorphic_identity"],
+            electionId=electionId,
+            _registeredVotersCount=None,
+            _registeredPostalVotersCount=None
+        )
+
+    def add_meta(self, metaDataDict):
+        meta = self.add(Meta.Model)
+        for meta_key in metaDataDict:
+            self.add(MetaData.Model, metaId=meta, metaDataKey=meta_key, metaDataValue=metaDataDict[meta_key])
+
+        return meta
+
+    def add_stamp(self):
+        barcode = self.add(Barcode.Model, barcodeString=lambda: Barcode._get_barcode_string(barcode.id))
+
+        return self.add(Stamp.Model, ip=self._stamp_ip, createdBy=self._stamp_created_by,
+                        createdAt=self._stamp_created_at, barcodeId=barcode)
+
+    def add_tally_sheet(self, template, electionId, areaId, metaDataDict):
+        """
+        Plans the same rows as TallySheet.create does.
+
+        The tally sheet code is kept on the entry, since the tally sheets of an area are looked up by the code while
+        planning.
+        """
+        meta = self.add_meta(metaDataDict)
+
+        proof = self.add(
+            Proof.Model,
+            proofType=Submission.get_submission_proof_type(submissionType=SubmissionTypeEnum.TallySheet),
+            scannedFilesFolderId=self.add(Folder.Model),
+            proofStampId=self.add_stamp(),
+            finished=False
+        )
+        submission = self.add(
+            Submission.Model,
+            submissionId=self.add(History.Model),
+            submissionType=SubmissionTypeEnum.TallySheet,
+            electionId=electionId,
+            areaId=areaId,
+            submissionProofId=proof
+        )
+
+        tally_sheet = self.add(
+            TallySheet.Model,
+            tallySheetId=submission,
+            templateId=template.templateId,
+            metaId=meta
+        )
+        tally_sheet.tallySheetCode = template.templateName
+
+        return tally_sheet
+
+    def get_summary(self):
+        summary = OrderedDict()
+        for model in self._entries:
+            summary[model.__tablename__] = summary.get(model.__tablename__, 0) + len(self._entries[model])
+
+        return summary
+
+    def get_partitions(self):
+        """
+        Groups the entries by partition, keeping the insert order of the tables in each.
+
+        :return: OrderedDict of partition to OrderedDict of model to entries. The entries without a partition are
+        grouped under None.
+        """
+
+        def _move_out_of_partition(entry):
+            if entry.partition is not None:
+                entry.partition = None
+                for referred_entry in entry.get_referred_entries():
+                    _move_out_of_partition(referred_entry)
+
+        for model in self._entries:
+            for entry in self._entries[model]:
+                for referred_entry in entry.get_referred_entries():
+                    if referred_entry.partition is not None and referred_entry.partition != entry.partition:
+                        _move_out_of_partition(referred_entry)
+
+        partitions = OrderedDict([(None, OrderedDict())])
+        for model in self._entries:
+            for entry in self._entries[model]:
+                if entry.partition not in partitions:
+                    partitions[entry.partition] = OrderedDict()
+
+                if model not in partitions[entry.partition]:
+                    partitions[entry.partition][model] = []
+
+                partitions[entry.partition][model].append(entry)
+
+        return partitions
+
+    def _insert(self, model, entries, partition=None):
+        primary_key_name = model.__mapper__.primary_key[0].key
+        is_id_allocated = primary_key_name not in entries[0].values
+
+        if is_id_allocated:
+            for entry, entry_id in zip(entries, allocate_ids(model, len(entries))):
+                entry.id = entry_id
+
+        mappings = []
+        for entry in entries:
+            mapping = {key: _resolve_value(value) for key, value in entry.values.items()}
+
+            if is_id_allocated:
+                mapping[primary_key_name] = entry.id
+            else:
+                entry.id = mapping[primary_key_name]
+
+            mappings.append(mapping)
+
+        for batch_start in range(0, len(mappings), self.batch_size):
+            batch_end = min(batch_start + self.batch_size, len(mappings))
+            db.session.bulk_insert_mappings(model, mappings[batch_start:batch_end])
+
+            if partition is None:
+                self.progress("Inserted %s" % model.__tablename__, batch_end, len(mappings))
+            else:
+                self.progress("Inserted %s of %s" % (model.__tablename__, partition), batch_end, len(mappings))
+
+    def _build_partition(self, app, partition, partition_entries):
+        with app.app_context():
+            started_at = time.time()
+
+            try:
+                for model in partition_entries:
+                    # The workers take turns on a table, and commit it right away, so that the ids allocated by one
+                    # are visible to the next. Meanwhile the other workers can insert the other tables.
+                    with self._insert_locks[model]:
+                        self._insert(model, partition_entries[model], partition=partition)
+                        db.session.commit()
+            except Exception:
+                # The traceback is raised again from the future of the partition.
+                db.session.rollback()
+                raise
+            finally:
+                db.session.remove()
+
+            self.progress("Built %s in %.2f seconds" % (partition, time.time() - started_at))
+
+    def build(self, dry_run=False, workers=None):
+        """
+        :param dry_run: only the planned row counts are reported if True.
+        :param workers: number of partitions to be inserted in parallel. All the entries are inserted in the current
+        session if None. Otherwise the entries without a partition are committed before the partitions are inserted.
+        """
+        summary = self.get_summary()
+        for table_name in summary:
+            self.progress("Planned %d %s rows" % (summary[table_name], table_name))
+
+        if workers is not None:
+            partitions = self.get_partitions()
+            self.progress("Planned %d partitions" % (len(partitions) - 1))
+
+        if dry_run:
+            self.progress("Dry run, hence nothing was inserted")
+            return summary
+
+        # Rows added through the session so far are referred by the entries.
+        db.session.flush()
+
+        if workers is None:
+            for model in self._entries:
+                self._insert(model, self._entries[model])
+
+            return summary
+
+        for model in partitions[None]:
+            self._insert(model, partitions[None][model])
+
+        # The partitions are inserted by other sessions, which can refer only the committed rows.
+        db.session.commit()
+
+        if db.engine.dialect.name == "sqlite":
+            # The in memory database of the unit tests is a single connection, which the sessions can't use at once.
+            workers = 1
+
+        app = current_app._get_current_object()
+        self._insert_locks = {model: threading.Lock() for model in self._entries}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._build_partition, app, partition, partitions[partition])
+                for partition in partitions if partition is not None
+            ]
+
+        for future in futures:
+            future.result()
+
+        return summary
@@ -21,9 +21,11 @@ from ext.ExtendedElection.ExtendedElectionParliamentaryElection2020.ExtendedTall
     ExtendedTallySheetVersion_PE_27
 from ext.ExtendedElection.ExtendedElectionParliamentaryElection2020.ExtendedTallySheetVersion.ExtendedTallySheetVersion_PE_4 import \
     ExtendedTallySheetVersion_PE_4
+from ext.ExtendedElection.ElectionBuilder import ElectionBuilder
 from ext.ExtendedElection.util import get_rows_from_csv, update_dashboard_tables
-from orm.entities import Candidate, Template, Party, Meta
-from orm.entities.Area import AreaMap
+from orm.entities import Candidate, Template, Party, Area, Election
+from orm.entities.Election import ElectionParty, ElectionCandidate
+from orm.entities.Area import AreaMap, AreaClosure
 from orm.entities.Area.Electorate import Country, ElectoralDistrict, PollingDivision, PollingDistrict
 from orm.entities.Area.Office import PollingStation, CountingCentre, DistrictCentre, ElectionCommission
 from orm.entities.Submission import TallySheet
@@ -57,7 +59,8 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
     def build_election(self, party_candidate_dataset_file=None,
                        polling_station_dataset_file=None, postal_counting_centers_dataset_file=None,
-                       invalid_vote_categories_dataset_file=None):
+                       invalid_vote_categories_dataset_file=None, dry_run=False, progress=None,
+                       workers=None):
         root_election = self.election
         # postal_election = root_election.add_sub_election(electionName="Postal", voteType=Postal)
         # ordinary_election = root_election.add_sub_election(electionName="Ordinary", voteType=NonPostal)
@@ -436,6 +439,8 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
             ]
         ).add_derivative_template_row(tally_sheet_template_pe_ce_ro_pr_2_candidate_wise_first_preference_row)
 
+        election_builder = ElectionBuilder(progress=progress)
+
         data_entry_store = {
             AreaTypeEnum.Country: {},
             AreaTypeEnum.ElectoralDistrict: {},
@@ -449,18 +454,44 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
         electoral_district_election_store = {}
         party_store = {}
+        election_party_store = {root_election.electionId: []}
+
+        def _add_election_party(election, party):
+            election_party = election_builder.add_link(ElectionParty.Model, electionId=election, partyId=party)
+
+            if election_party is not None:
+                election_party_store[election].append(party)
+
+        def _add_election_candidate(election, party, candidate):
+            election_builder.add_link(ElectionCandidate.Model, electionId=election, partyId=party,
+                                      candidateId=candidate, qualifiedForPreferences=False)
+
+        def _add_sub_election(parent_election, electionName, voteType, isListed=False):
+            election = election_builder.add(
+                Election.Model,
+                electionTemplateName=root_election.electionTemplateName,
+                electionName=electionName,
+                parentElectionId=parent_election,
+                rootElectionId=root_election.electionId,
+                voteType=voteType,
+                isListed=isListed
+            )
+            election_party_store[election] = []
+
+            return election
 
         def _get_candidate(row):
             election, postal_election, ordinary_election = _get_electoral_district_election(row)
 
             party = _get_party(row)
 
-            candidate = Candidate.create(candidateName=row["Candidate Name"], candidateNumber=row["Candidate Number"])
+            candidate = election_builder.add(Candidate.Model, candidateName=row["Candidate Name"],
+                                             candidateNumber=row["Candidate Number"])
 
-            root_election.add_candidate(candidateId=candidate.candidateId, partyId=party.partyId)
-            election.add_candidate(candidateId=candidate.candidateId, partyId=party.partyId)
-            postal_election.add_candidate(candidateId=candidate.candidateId, partyId=party.partyId)
-            ordinary_election.add_candidate(candidateId=candidate.candidateId, partyId=party.partyId)
+            _add_election_candidate(root_election.electionId, party, candidate)
+            _add_election_candidate(election, party, candidate)
+            _add_election_candidate(postal_election, party, candidate)
+            _add_election_candidate(ordinary_election, party, candidate)
 
             return candidate
 
@@ -473,7 +504,8 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
             party_abbreviation = row["Party Abbreviation"]
 
             if party_name_unique not in party_store:
-                party = Party.create(
+                party = election_builder.add(
+                    Party.Model,
                     partyName=party_name,
                     partySymbol=party_symbol,
                     partyAbbreviation=party_abbreviation
@@ -483,10 +515,10 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
             party = party_store[party_name_unique]
 
-            root_election.add_party(partyId=party.partyId)
-            election.add_party(partyId=party.partyId)
-            postal_election.add_party(partyId=party.partyId)
-            ordinary_election.add_party(partyId=party.partyId)
+            _add_election_party(root_election.electionId, party)
+            _add_election_party(election, party)
+            _add_election_party(postal_election, party)
+            _add_election_party(ordinary_election, party)
 
             return party_store[party_name_unique]
 
@@ -494,15 +526,18 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
             electoral_district_name = row["Electoral District"]
 
             if electoral_district_name not in electoral_district_election_store:
-                election = root_election.add_sub_election(
+                election = _add_sub_election(
+                    root_election.electionId,
                     electionName="%s - %s" % (root_election.electionName, electoral_district_name),
                     voteType=PostalAndNonPostal, isListed=True
                 )
-                postal_election = election.add_sub_election(
+                postal_election = _add_sub_election(
+                    election,
                     electionName="%s - %s - Postal" % (root_election.electionName, electoral_district_name),
                     voteType=Postal
                 )
-                ordinary_election = election.add_sub_election(
+                ordinary_election = _add_sub_election(
+                    election,
                     electionName="%s - %s - Ordinary" % (root_election.electionName, electoral_district_name),
                     voteType=NonPostal
                 )
@@ -521,7 +556,7 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
             if area_key in data_entry_store[area_type]:
                 data_entry_obj = data_entry_store[area_type][area_key]
             else:
-                area = area_class.create(area_name, electionId=election.electionId)
+                area = election_builder.add_area(area_class, areaName=area_name, electionId=election)
 
                 data_entry_obj = {
                     "area": area
@@ -552,7 +587,7 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
                 return tally_sheets
 
-            data_entry_obj = _get_area_entry(root_election, area_class, area_name, area_key,
+            data_entry_obj = _get_area_entry(root_election.electionId, area_class, area_name, area_key,
                                              _create_country_tally_sheets)
 
             return data_entry_obj
@@ -566,68 +601,68 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
             def _create_electoral_district_tally_sheets(area):
                 tally_sheets = [
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_ce_ro_v2, electionId=election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_ce_ro_v2, electionId=election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": election
+                        }
                     ),
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_r2, electionId=election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_r2, electionId=election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": election
+                        }
                     ),
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_ce_ro_v1, electionId=postal_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": postal_election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_ce_ro_v1, electionId=postal_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": postal_election
+                        }
                     ),
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_r1, electionId=postal_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": postal_election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_r1, electionId=postal_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": postal_election
+                        }
                     )
                 ]
 
-                for party in election.parties:
+                for party in election_party_store[election]:
                     tally_sheets += [
-                        TallySheet.create(
-                            template=tally_sheet_template_pe_ce_ro_pr_1, electionId=postal_election.electionId,
-                            areaId=area.areaId,
-                            metaId=Meta.create({
-                                "areaId": area.areaId,
-                                "partyId": party.partyId,
-                                "electionId": postal_election.electionId
-                            }).metaId
+                        election_builder.add_tally_sheet(
+                            template=tally_sheet_template_pe_ce_ro_pr_1, electionId=postal_election,
+                            areaId=area,
+                            metaDataDict={
+                                "areaId": area,
+                                "partyId": party,
+                                "electionId": postal_election
+                            }
                         ),
-                        TallySheet.create(
-                            template=tally_sheet_template_pe_ce_ro_pr_2, electionId=election.electionId,
-                            areaId=area.areaId,
-                            metaId=Meta.create({
-                                "areaId": area.areaId,
-                                "partyId": party.partyId,
-                                "electionId": election.electionId
-                            }).metaId
+                        election_builder.add_tally_sheet(
+                            template=tally_sheet_template_pe_ce_ro_pr_2, electionId=election,
+                            areaId=area,
+                            metaDataDict={
+                                "areaId": area,
+                                "partyId": party,
+                                "electionId": election
+                            }
                         ),
-                        TallySheet.create(
-                            template=tally_sheet_template_pe_ce_ro_pr_3, electionId=election.electionId,
-                            areaId=area.areaId,
-                            metaId=Meta.create({
-                                "areaId": area.areaId,
-                                "partyId": party.partyId,
-                                "electionId": election.electionId
-                            }).metaId
+                        election_builder.add_tally_sheet(
+                            template=tally_sheet_template_pe_ce_ro_pr_3, electionId=election,
+                            areaId=area,
+                            metaDataDict={
+                                "areaId": area,
+                                "partyId": party,
+                                "electionId": election
+                            }
                         )
                     ]
 
@@ -647,33 +682,33 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
             def _create_polling_division_tally_sheets(area):
                 tally_sheets = [
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_ce_ro_v1, electionId=ordinary_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": ordinary_election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_ce_ro_v1, electionId=ordinary_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": ordinary_election
+                        }
                     ),
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_r1, electionId=ordinary_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": ordinary_election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_r1, electionId=ordinary_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": ordinary_election
+                        }
                     )
                 ]
 
-                for party in election.parties:
-                    tally_sheets.append(TallySheet.create(
-                        template=tally_sheet_template_pe_ce_ro_pr_1, electionId=ordinary_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "partyId": party.partyId,
-                            "electionId": ordinary_election.electionId
-                        }).metaId
+                for party in election_party_store[election]:
+                    tally_sheets.append(election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_ce_ro_pr_1, electionId=ordinary_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "partyId": party,
+                            "electionId": ordinary_election
+                        }
                     ))
 
                 return tally_sheets
@@ -691,7 +726,9 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
             area_class = PollingDistrict
             area_name = row["Polling District"]
-            area_key = "%s-%s-%s" % (electoral_district.areaName, polling_division.areaName, area_name)
+            area_key = "%s-%s-%s" % (
+                electoral_district.values["areaName"], polling_division.values["areaName"], area_name
+            )
 
             data_entry_obj = _get_area_entry(election, area_class, area_name, area_key)
 
@@ -707,14 +744,15 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
             area_class = PollingStation
             area_name = row["Polling Station"]
             area_key = "%s-%s-%s-%s" % (
-                electoral_district.areaName, polling_division.areaName, polling_district.areaName, area_name
+                electoral_district.values["areaName"], polling_division.values["areaName"],
+                polling_district.values["areaName"], area_name
             )
 
             data_entry_obj = _get_area_entry(election, area_class, area_name, area_key)
             area = data_entry_obj["area"]
 
-            area._registeredVotersCount = row["Registered Normal Voters"]
-            area._registeredPostalVotersCount = row["Registered Postal Voters"]
+            area.values["_registeredVotersCount"] = row["Registered Normal Voters"]
+            area.values["_registeredPostalVotersCount"] = row["Registered Postal Voters"]
 
             return data_entry_obj
 
@@ -725,37 +763,37 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
             area_class = CountingCentre
             area_name = row["Counting Centre"]
-            area_key = "%s-%s" % (electoral_district.areaName, area_name)
+            area_key = "%s-%s" % (electoral_district.values["areaName"], area_name)
 
             def _create_counting_centre_tally_sheets(area):
                 tally_sheets = [
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_27, electionId=ordinary_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": ordinary_election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_27, electionId=ordinary_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": ordinary_election
+                        }
                     )
                 ]
 
-                for party in election.parties:
-                    tally_sheets.append(TallySheet.create(
-                        template=tally_sheet_template_pe_4, electionId=ordinary_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "partyId": party.partyId,
-                            "electionId": ordinary_election.electionId
-                        }).metaId
+                for party in election_party_store[election]:
+                    tally_sheets.append(election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_4, electionId=ordinary_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "partyId": party,
+                            "electionId": ordinary_election
+                        }
                     ))
 
-                tally_sheets.append(TallySheet.create(
-                    template=tally_sheet_template_ce_201, electionId=ordinary_election.electionId, areaId=area.areaId,
-                    metaId=Meta.create({
-                        "areaId": area.areaId,
-                        "electionId": ordinary_election.electionId
-                    }).metaId
+                tally_sheets.append(election_builder.add_tally_sheet(
+                    template=tally_sheet_template_ce_201, electionId=ordinary_election, areaId=area,
+                    metaDataDict={
+                        "areaId": area,
+                        "electionId": ordinary_election
+                    }
                 ))
 
                 return tally_sheets
@@ -772,37 +810,37 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
             area_class = CountingCentre
             area_name = row["Postal Vote Counting Centre"]
-            area_key = "%s-%s" % (electoral_district.areaName, area_name)
+            area_key = "%s-%s" % (electoral_district.values["areaName"], area_name)
 
             def _create_counting_centre_tally_sheets(area):
                 tally_sheets = [
-                    TallySheet.create(
-                        template=tally_sheet_template_pe_27, electionId=postal_election.electionId, areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "electionId": postal_election.electionId
-                        }).metaId
+                    election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_27, electionId=postal_election, areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "electionId": postal_election
+                        }
                     )
                 ]
 
-                for party in postal_election.parties:
-                    tally_sheets.append(TallySheet.create(
-                        template=tally_sheet_template_pe_4, electionId=postal_election.electionId,
-                        areaId=area.areaId,
-                        metaId=Meta.create({
-                            "areaId": area.areaId,
-                            "partyId": party.partyId,
-                            "electionId": postal_election.electionId
-                        }).metaId
+                for party in election_party_store[postal_election]:
+                    tally_sheets.append(election_builder.add_tally_sheet(
+                        template=tally_sheet_template_pe_4, electionId=postal_election,
+                        areaId=area,
+                        metaDataDict={
+                            "areaId": area,
+                            "partyId": party,
+                            "electionId": postal_election
+                        }
                     ))
 
-                tally_sheets.append(TallySheet.create(
-                    template=tally_sheet_template_ce_201_pv, electionId=postal_election.electionId,
-                    areaId=area.areaId,
-                    metaId=Meta.create({
-                        "areaId": area.areaId,
-                        "electionId": postal_election.electionId
-                    }).metaId
+                tally_sheets.append(election_builder.add_tally_sheet(
+                    template=tally_sheet_template_ce_201_pv, electionId=postal_election,
+                    areaId=area,
+                    metaDataDict={
+                        "areaId": area,
+                        "electionId": postal_election
+                    }
                 ))
 
                 return tally_sheets
@@ -834,18 +872,37 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
 
             return data_entry_obj
 
-        for row in get_rows_from_csv(party_candidate_dataset_file):
+        party_candidate_rows = get_rows_from_csv(party_candidate_dataset_file)
+        for row in party_candidate_rows:
             _get_candidate(row)
 
+        election_builder.progress("Planned party candidate dataset", len(party_candidate_rows),
+                                  len(party_candidate_rows))
+
         # for row in get_rows_from_csv(invalid_vote_categories_dataset_file):
         #     root_election.add_invalid_vote_category(row["Invalid Vote Category Description"])
 
-        for row in get_rows_from_csv(polling_station_dataset_file):
+        def _add_child_area(parent_entry, child_entry):
+            election_builder.add_link(Area.AreaAreaModel, parentAreaId=parent_entry["area"],
+                                      childAreaId=child_entry["area"])
+
+        def _add_child_tally_sheet(parent_tally_sheet, child_tally_sheet):
+            election_builder.add_link(TallySheet.TallySheetTallySheetModel, parentTallySheetId=parent_tally_sheet,
+                                      childTallySheetId=child_tally_sheet)
+
+        polling_station_rows = get_rows_from_csv(polling_station_dataset_file)
+        for row_index, row in enumerate(polling_station_rows):
             row["Country"] = "Sri Lanka"
             row["Election Commission"] = "Sri Lanka Election Commission"
             row["Polling Station"] = row["Polling Station (English)"]
 
-            print("[ROW] ========= ", row)
+            # The rows of an electoral district are built together, when built with workers.
+            election_builder.set_partition(row["Electoral District"])
+
+            if (row_index + 1) % election_builder.batch_size == 0:
+                election_builder.progress("Planning polling station dataset", row_index + 1,
+                                          len(polling_station_rows))
+
             country_entry = _get_country_entry(row=row)
 
             electoral_district_entry = _get_electoral_district_entry(row=row)
@@ -857,42 +914,44 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
             postal_vote_counting_centre_entry = _get_postal_vote_counting_centre_entry(row=row)
             polling_station_entry = _get_polling_station_entry(row=row)
 
-            country_entry["area"].add_child(electoral_district_entry["area"].areaId)
-            electoral_district_entry["area"].add_child(polling_division_entry["area"].areaId)
-            polling_division_entry["area"].add_child(polling_district_entry["area"].areaId)
-            polling_district_entry["area"].add_child(polling_station_entry["area"].areaId)
-            election_commission_entry["area"].add_child(district_centre_entry["area"].areaId)
+            _add_child_area(country_entry, electoral_district_entry)
+            _add_child_area(electoral_district_entry, polling_division_entry)
+            _add_child_area(polling_division_entry, polling_district_entry)
+            _add_child_area(polling_district_entry, polling_station_entry)
+            _add_child_area(election_commission_entry, district_centre_entry)
 
-            district_centre_entry["area"].add_child(counting_centre_entry["area"].areaId)
-            counting_centre_entry["area"].add_child(polling_station_entry["area"].areaId)
+            _add_child_area(district_centre_entry, counting_centre_entry)
+            _add_child_area(counting_centre_entry, polling_station_entry)
 
-            district_centre_entry["area"].add_child(postal_vote_counting_centre_entry["area"].areaId)
-            postal_vote_counting_centre_entry["area"].add_child(polling_station_entry["area"].areaId)
+            _add_child_area(district_centre_entry, postal_vote_counting_centre_entry)
+            _add_child_area(postal_vote_counting_centre_entry, polling_station_entry)
 
-            AreaMap.create(
+            election_builder.add(
+                AreaMap.Model,
                 electionId=root_election.electionId,
                 voteType=NonPostal,
-                pollingStationId=polling_station_entry["area"].areaId,
-                countingCentreId=counting_centre_entry["area"].areaId,
-                districtCentreId=district_centre_entry["area"].areaId,
-                electionCommissionId=election_commission_entry["area"].areaId,
-                pollingDistrictId=polling_district_entry["area"].areaId,
-                pollingDivisionId=polling_division_entry["area"].areaId,
-                electoralDistrictId=electoral_district_entry["area"].areaId,
-                countryId=country_entry["area"].areaId
+                pollingStationId=polling_station_entry["area"],
+                countingCentreId=counting_centre_entry["area"],
+                districtCentreId=district_centre_entry["area"],
+                electionCommissionId=election_commission_entry["area"],
+                pollingDistrictId=polling_district_entry["area"],
+                pollingDivisionId=polling_division_entry["area"],
+                electoralDistrictId=electoral_district_entry["area"],
+                countryId=country_entry["area"]
             )
 
-            AreaMap.create(
+            election_builder.add(
+                AreaMap.Model,
                 electionId=root_election.electionId,
                 voteType=Postal,
-                pollingStationId=polling_station_entry["area"].areaId,
-                countingCentreId=postal_vote_counting_centre_entry["area"].areaId,
-                districtCentreId=district_centre_entry["area"].areaId,
-                electionCommissionId=election_commission_entry["area"].areaId,
-                pollingDistrictId=polling_district_entry["area"].areaId,
-                pollingDivisionId=polling_division_entry["area"].areaId,
-                electoralDistrictId=electoral_district_entry["area"].areaId,
-                countryId=country_entry["area"].areaId
+                pollingStationId=polling_station_entry["area"],
+                countingCentreId=postal_vote_counting_centre_entry["area"],
+                districtCentreId=district_centre_entry["area"],
+                electionCommissionId=election_commission_entry["area"],
+                pollingDistrictId=polling_district_entry["area"],
+                pollingDivisionId=polling_division_entry["area"],
+                electoralDistrictId=electoral_district_entry["area"],
+                countryId=country_entry["area"]
             )
 
             pe_27_tally_sheet = counting_centre_entry["tallySheets"][PE_27][0]
@@ -912,43 +971,45 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
             pe_ce_ro_pr_2_tally_sheet = electoral_district_entry["tallySheets"][PE_CE_RO_PR_2][0]
             pe_ce_ro_pr_3_tally_sheet = electoral_district_entry["tallySheets"][PE_CE_RO_PR_3][0]
 
-            pe_ce_ro_v1_tally_sheet.add_child(pe_27_tally_sheet)
-            pe_r1_tally_sheet.add_child(pe_ce_ro_v1_tally_sheet)
-            pe_ce_ro_v1_pv_tally_sheet.add_child(pe_27_pv_tally_sheet)
-            pe_r1_pv_tally_sheet.add_child(pe_ce_ro_v1_pv_tally_sheet)
-
-            pe_ce_ro_v2_tally_sheet.add_child(pe_ce_ro_v1_tally_sheet)
-            pe_ce_ro_v2_tally_sheet.add_child(pe_ce_ro_v1_pv_tally_sheet)
-            pe_r2_tally_sheet.add_child(pe_ce_ro_v2_tally_sheet)
-
-            pe_ce_ro_pr_1_tally_sheet.add_child(pe_4_tally_sheet)
-            pe_ce_ro_pr_1_pv_tally_sheet.add_child(pe_4_pv_tally_sheet)
-            pe_ce_ro_pr_2_tally_sheet.add_child(pe_ce_ro_pr_1_tally_sheet)
-            pe_ce_ro_pr_2_tally_sheet.add_child(pe_ce_ro_pr_1_pv_tally_sheet)
-            pe_ce_ro_pr_3_tally_sheet.add_child(pe_ce_ro_pr_2_tally_sheet)
-
-            TallySheetMap.create(
-                pe_27_tallySheetId=pe_27_tally_sheet.tallySheetId,
-                pe_4_tallySheetId=pe_4_tally_sheet.tallySheetId,
-                pe_ce_ro_v1_tallySheetId=pe_ce_ro_v1_tally_sheet.tallySheetId,
-                pe_r1_tallySheetId=pe_r1_tally_sheet.tallySheetId,
-                pe_ce_ro_pr_1_tallySheetId=pe_ce_ro_pr_1_tally_sheet.tallySheetId,
-                pe_ce_ro_v2_tallySheetId=pe_ce_ro_v2_tally_sheet.tallySheetId,
-                pe_r2_tallySheetId=pe_r2_tally_sheet.tallySheetId,
-                pe_ce_ro_pr_2_tallySheetId=pe_ce_ro_pr_2_tally_sheet.tallySheetId,
-                pe_ce_ro_pr_3_tallySheetId=pe_ce_ro_pr_3_tally_sheet.tallySheetId
+            _add_child_tally_sheet(pe_ce_ro_v1_tally_sheet, pe_27_tally_sheet)
+            _add_child_tally_sheet(pe_r1_tally_sheet, pe_ce_ro_v1_tally_sheet)
+            _add_child_tally_sheet(pe_ce_ro_v1_pv_tally_sheet, pe_27_pv_tally_sheet)
+            _add_child_tally_sheet(pe_r1_pv_tally_sheet, pe_ce_ro_v1_pv_tally_sheet)
+
+            _add_child_tally_sheet(pe_ce_ro_v2_tally_sheet, pe_ce_ro_v1_tally_sheet)
+            _add_child_tally_sheet(pe_ce_ro_v2_tally_sheet, pe_ce_ro_v1_pv_tally_sheet)
+            _add_child_tally_sheet(pe_r2_tally_sheet, pe_ce_ro_v2_tally_sheet)
+
+            _add_child_tally_sheet(pe_ce_ro_pr_1_tally_sheet, pe_4_tally_sheet)
+            _add_child_tally_sheet(pe_ce_ro_pr_1_pv_tally_sheet, pe_4_pv_tally_sheet)
+            _add_child_tally_sheet(pe_ce_ro_pr_2_tally_sheet, pe_ce_ro_pr_1_tally_sheet)
+            _add_child_tally_sheet(pe_ce_ro_pr_2_tally_sheet, pe_ce_ro_pr_1_pv_tally_sheet)
+            _add_child_tally_sheet(pe_ce_ro_pr_3_tally_sheet, pe_ce_ro_pr_2_tally_sheet)
+
+            election_builder.add(
+                TallySheetMap.Model,
+                pe_27_tallySheetId=pe_27_tally_sheet,
+                pe_4_tallySheetId=pe_4_tally_sheet,
+                pe_ce_ro_v1_tallySheetId=pe_ce_ro_v1_tally_sheet,
+                pe_r1_tallySheetId=pe_r1_tally_sheet,
+                pe_ce_ro_pr_1_tallySheetId=pe_ce_ro_pr_1_tally_sheet,
+                pe_ce_ro_v2_tallySheetId=pe_ce_ro_v2_tally_sheet,
+                pe_r2_tallySheetId=pe_r2_tally_sheet,
+                pe_ce_ro_pr_2_tallySheetId=pe_ce_ro_pr_2_tally_sheet,
+                pe_ce_ro_pr_3_tallySheetId=pe_ce_ro_pr_3_tally_sheet
             )
 
-            TallySheetMap.create(
-                pe_27_tallySheetId=pe_27_pv_tally_sheet.tallySheetId,
-                pe_4_tallySheetId=pe_4_pv_tally_sheet.tallySheetId,
-                pe_ce_ro_v1_tallySheetId=pe_ce_ro_v1_pv_tally_sheet.tallySheetId,
-                pe_r1_tallySheetId=pe_r1_pv_tally_sheet.tallySheetId,
-                pe_ce_ro_pr_1_tallySheetId=pe_ce_ro_pr_1_pv_tally_sheet.tallySheetId,
-                pe_ce_ro_v2_tallySheetId=pe_ce_ro_v2_tally_sheet.tallySheetId,
-                pe_r2_tallySheetId=pe_r2_tally_sheet.tallySheetId,
-                pe_ce_ro_pr_2_tallySheetId=pe_ce_ro_pr_2_tally_sheet.tallySheetId,
-                pe_ce_ro_pr_3_tallySheetId=pe_ce_ro_pr_3_tally_sheet.tallySheetId
+            election_builder.add(
+                TallySheetMap.Model,
+                pe_27_tallySheetId=pe_27_pv_tally_sheet,
+                pe_4_tallySheetId=pe_4_pv_tally_sheet,
+                pe_ce_ro_v1_tallySheetId=pe_ce_ro_v1_pv_tally_sheet,
+                pe_r1_tallySheetId=pe_r1_pv_tally_sheet,
+                pe_ce_ro_pr_1_tallySheetId=pe_ce_ro_pr_1_pv_tally_sheet,
+                pe_ce_ro_v2_tallySheetId=pe_ce_ro_v2_tally_sheet,
+                pe_r2_tallySheetId=pe_r2_tally_sheet,
+                pe_ce_ro_pr_2_tallySheetId=pe_ce_ro_pr_2_tally_sheet,
+                pe_ce_ro_pr_3_tallySheetId=pe_ce_ro_pr_3_tally_sheet
             )
 
         # for row in get_rows_from_csv(postal_counting_centers_dataset_file):
@@ -1011,8 +1072,23 @@ class ExtendedElectionParliamentaryElection2020(ExtendedElection):
         #         pe_ce_ro_pr_3_tallySheetId=pe_ce_ro_pr_3_tally_sheet.tallySheetId
         #     )
 
+        election_builder.set_partition(None)
+        election_builder.progress("Planned polling station dataset", len(polling_station_rows),
+                                  len(polling_station_rows))
+
+        election_builder.build(dry_run=dry_run, workers=workers)
+
+        if dry_run:
+            return root_election
+
+        # The sub elections and the parties were inserted in bulk, without going through the session.
+        db.session.expire(root_election)
+
+        # Stitched together once all the electoral districts are inserted.
+        AreaClosure.build(election=root_election)
+
         db.session.commit()
 
-        update_dashboard_tables()
+        update_dashboard_tables(electionId=root_election.electionId)
 
         return root_election
@@ -1,6 +1,3 @@
-from sqlalchemy import bindparam
-from sqlalchemy.orm import aliased
-
 from app import db
 from constants.TALLY_SHEET_COLUMN_SOURCE import TALLY_SHEET_COLUMN_SOURCE_META, TALLY_SHEET_COLUMN_SOURCE_CONTENT, \
     TALLY_SHEET_COLUMN_SOURCE_QUERY
@@ -11,6 +8,7 @@ from ext.ExtendedElection.ExtendedElectionPresidentialElection2019.TALLY_SHEET_C
 from constants.VOTE_TYPES import Postal, NonPostal
 from ext import TallySheetMap
 from ext.ExtendedElection import ExtendedElection
+from ext.ExtendedElection.ElectionBuilder import print_progress
 from ext.ExtendedElection.ExtendedElectionPresidentialElection2019 import RoleBasedAccess
 from ext.ExtendedElection.ExtendedElectionPresidentialElection2019.ExtendedTallySheetVersion.ExtendedTallySheetVersion_PRE_30_ED import \
     ExtendedTallySheetVersion_PRE_30_ED
@@ -24,7 +22,7 @@ from ext.ExtendedElection.ExtendedElectionPresidentialElection2019.ExtendedTally
     ExtendedTallySheetVersion_PRE_AI_ED
 from ext.ExtendedElection.util import get_rows_from_csv, update_dashboard_tables
 from orm.entities import Election, Candidate, Template, Party, Meta
-from orm.entities.Area import AreaMap
+from orm.entities.Area import AreaMap, AreaClosure
 from orm.entities.Area.Electorate import Country, ElectoralDistrict, PollingDivision, PollingDistrict
 from orm.entities.Area.Office import PollingStation, CountingCentre, DistrictCentre, ElectionCommission
 from orm.entities.Submission import TallySheet
@@ -56,105 +54,14 @@ class ExtendedElectionPresidentialElection2019(ExtendedElection):
                 templateName=templateName
             )
 
-    def get_area_map_query(self):
-        from orm.entities import Election, Area
-        from orm.entities.Area import AreaAreaModel
-        from orm.enums import AreaTypeEnum
-
-        country = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.Country).subquery()
-        electoral_district = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.ElectoralDistrict).subquery()
-        polling_division = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.PollingDivision).subquery()
-        polling_district = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.PollingDistrict).subquery()
-        polling_station = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.PollingStation).subquery()
-        counting_centre = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.CountingCentre).subquery()
-        district_centre = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.DistrictCentre).subquery()
-        election_commission = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.ElectionCommission).subquery()
-
-        country__electoral_district = aliased(AreaAreaModel)
-        electoral_district__polling_division = aliased(AreaAreaModel)
-        polling_division__polling_district = aliased(AreaAreaModel)
-        polling_district__polling_station = aliased(AreaAreaModel)
-        counting_centre__polling_station = aliased(AreaAreaModel)
-        district_centre__counting_centre = aliased(AreaAreaModel)
-        election_commission__district_centre = aliased(AreaAreaModel)
-
-        # For postal vote counting centres.
-        electoral_district__counting_centre = aliased(AreaAreaModel)
-
-        query_args = [
-            country.c.areaId.label("countryId"),
-            country.c.areaName.label("countryName"),
-            electoral_district.c.areaId.label("electoralDistrictId"),
-            electoral_district.c.areaName.label("electoralDistrictName"),
-            counting_centre.c.areaId.label("countingCentreId"),
-            counting_centre.c.areaName.label("countingCentreName"),
-            Election.Model.voteType
-        ]
-
-        query_filter = [
-            country__electoral_district.parentAreaId == country.c.areaId,
-            country__electoral_district.childAreaId == electoral_district.c.areaId,
-
-            district_centre__counting_centre.parentAreaId == district_centre.c.areaId,
-            district_centre__counting_centre.childAreaId == counting_centre.c.areaId,
-
-            election_commission__district_centre.parentAreaId == election_commission.c.areaId,
-            election_commission__district_centre.childAreaId == district_centre.c.areaId,
-
-            Election.Model.electionId == counting_centre.c.electionId
-        ]
-
-        if self.election.voteType == Postal:
-            query_args += [
-                bindparam("pollingDivisionId", None),
-                bindparam("pollingDivisionName", None),
-                bindparam("pollingDistrictId", None),
-                bindparam("pollingDistrictName", None),
-                bindparam("pollingStationId", None),
-                bindparam("pollingStationName", None)
-            ]
-            query_filter += [
-                electoral_district__counting_centre.parentAreaId == electoral_district.c.areaId,
-                electoral_district__counting_centre.childAreaId == counting_centre.c.areaId
-            ]
-        else:
-            query_args += [
-                polling_division.c.areaId.label("pollingDivisionId"),
-                polling_division.c.areaName.label("pollingDivisionName"),
-                polling_district.c.areaId.label("pollingDistrictId"),
-                polling_district.c.areaName.label("pollingDistrictName"),
-                polling_station.c.areaId.label("pollingStationId"),
-                polling_station.c.areaName.label("pollingStationName")
-            ]
-            query_filter += [
-                electoral_district__polling_division.parentAreaId == electoral_district.c.areaId,
-                electoral_district__polling_division.childAreaId == polling_division.c.areaId,
-
-                polling_division__polling_district.parentAreaId == polling_division.c.areaId,
-                polling_division__polling_district.childAreaId == polling_district.c.areaId,
-
-                polling_district__polling_station.parentAreaId == polling_district.c.areaId,
-                polling_district__polling_station.childAreaId == polling_station.c.areaId,
-
-                counting_centre__polling_station.parentAreaId == counting_centre.c.areaId,
-                counting_centre__polling_station.childAreaId == polling_station.c.areaId
-            ]
-
-        query = db.session.query(*query_args).filter(*query_filter)
-
-        return query
-
     def build_election(self, party_candidate_dataset_file=None,
                        polling_station_dataset_file=None, postal_counting_centers_dataset_file=None,
-                       invalid_vote_categories_dataset_file=None):
+                       invalid_vote_categories_dataset_file=None, dry_run=False, progress=None,
+                       workers=None):
+        if workers is not None:
+            raise NotImplementedError("Presidential elections are built through the session one row at a time, hence "
+                                      "can't be built in parallel with workers.")
+
         root_election = self.election
         postal_election = root_election.add_sub_election(electionName="Postal", voteType=Postal)
         ordinary_election = root_election.add_sub_election(electionName="Ordinary", voteType=NonPostal)
@@ -1182,8 +1089,15 @@ class ExtendedElectionPresidentialElection2019(ExtendedElection):
                 pre_34_ai_tallySheetId=pre_34_ai_tally_sheet.tallySheetId,
             )
 
+        AreaClosure.build(election=root_election)
+
+        if dry_run:
+            # Nothing is planned ahead, hence the rows built in the session are left for the caller to roll back.
+            (progress or print_progress)("Dry run, hence nothing was committed")
+            return root_election
+
         db.session.commit()
 
-        update_dashboard_tables()
+        update_dashboard_tables(electionId=root_election.electionId)
 
         return root_election
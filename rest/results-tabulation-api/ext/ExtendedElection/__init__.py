@@ -1,9 +1,5 @@
-from sqlalchemy import bindparam
-from sqlalchemy.orm import aliased
-from app import db
 from constants.TALLY_SHEET_CODES import CE_201
 from ext.ExtendedTallySheetVersion import ExtendedTallySheetVersion
-from sqlalchemy import and_, func, or_
 
 
 def get_extended_election(election):
@@ -44,7 +40,8 @@ class ExtendedElection:
 
     def build_election(self, party_candidate_dataset_file=None,
                        polling_station_dataset_file=None, postal_counting_centers_dataset_file=None,
-                       invalid_vote_categories_dataset_file=None):
+                       invalid_vote_categories_dataset_file=None, dry_run=False, progress=None,
+                       workers=None):
         pass
 
     def get_area_map_for_tally_sheet(self, tally_sheet):
@@ -52,36 +49,25 @@ class ExtendedElection:
 
         return self.get_area_map(area=area)
 
-    def get_area_map(self, area, group_by=None, filter=None):
+    def get_area_map_for_tally_sheets(self, tally_sheets):
+        """
+        :return: dict of tally sheet id to the area map of the tally sheet. Tally sheets of the same area share the area
+        map, hence has to be overridden along with get_area_map_for_tally_sheet if it maps by more than the area.
+        """
+        area_wise_area_map = {}
+        tally_sheet_wise_area_map = {}
+        for tally_sheet in tally_sheets:
+            if tally_sheet.areaId not in area_wise_area_map:
+                area_wise_area_map[tally_sheet.areaId] = self.get_area_map_for_tally_sheet(tally_sheet=tally_sheet)
+
+            tally_sheet_wise_area_map[tally_sheet.tallySheetId] = area_wise_area_map[tally_sheet.areaId]
+
+        return tally_sheet_wise_area_map
+
+    def get_area_map(self, area, group_by=None):
+        from orm.entities.Area import AreaIndex
         from orm.enums import AreaTypeEnum
 
-        area_map_subquery = self.get_area_map_query().subquery()
-
-        column_name_list = [
-            "pollingStationId", "pollingStationName",
-            "pollingDistrictId", "pollingDistrictName",
-            "countingCentreId", "countingCentreName",
-            "pollingDivisionId", "pollingDivisionName",
-            "electoralDistrictId", "electoralDistrictName",
-            "countryId", "countryName"
-        ]
-        column_name_to_column_map = {
-            "pollingStationId": area_map_subquery.c.pollingStationId,
-            "pollingStationName": area_map_subquery.c.pollingStationName,
-            "pollingDistrictId": area_map_subquery.c.pollingDistrictId,
-            "pollingDistrictName": area_map_subquery.c.pollingDistrictName,
-            "countingCentreId": area_map_subquery.c.countingCentreId,
-            "countingCentreName": area_map_subquery.c.countingCentreName,
-            "pollingDivisionId": area_map_subquery.c.pollingDivisionId,
-            "pollingDivisionName": area_map_subquery.c.pollingDivisionName,
-            "electoralDistrictId": area_map_subquery.c.electoralDistrictId,
-            "electoralDistrictName": area_map_subquery.c.electoralDistrictName,
-            "countryId": area_map_subquery.c.countryId,
-            "countryName": area_map_subquery.c.countryName
-        }
-        query_args = []
-        query_filter = []
-        query_group_by = []
         area_and_vote_type_wise_group_by_map = {
             AreaTypeEnum.CountingCentre: [
                 "countingCentreId",
@@ -127,111 +113,10 @@ class ExtendedElection:
             ]
         }
 
-        area_and_vote_type_wise_filter_map = {
-            AreaTypeEnum.PollingStation: [area_map_subquery.c.pollingStationId == area.areaId],
-            AreaTypeEnum.PollingDistrict: [area_map_subquery.c.pollingDistrictId == area.areaId],
-            AreaTypeEnum.CountingCentre: [area_map_subquery.c.countingCentreId == area.areaId],
-            AreaTypeEnum.PollingDivision: [area_map_subquery.c.pollingDivisionId == area.areaId],
-            AreaTypeEnum.ElectoralDistrict: [area_map_subquery.c.electoralDistrictId == area.areaId],
-            AreaTypeEnum.Country: [area_map_subquery.c.countryId == area.areaId]
-        }
-
         if group_by is None:
             if area.areaType in area_and_vote_type_wise_group_by_map:
                 group_by = area_and_vote_type_wise_group_by_map[area.areaType]
             else:
                 group_by = []
 
-        for column_name in column_name_list:
-            column = column_name_to_column_map[column_name]
-            if column_name in group_by:
-                query_group_by.append(column)
-
-                # Append the column to query.
-                query_args.append(column)
-            else:
-                query_args.append(bindparam(column_name, None))
-
-        if filter is None:
-            if area.areaType in area_and_vote_type_wise_filter_map:
-                filter = area_and_vote_type_wise_filter_map[area.areaType]
-            else:
-                filter = []
-
-        query_filter = filter
-
-        area_map = db.session.query(*query_args).filter(*query_filter).group_by(*query_group_by).all()
-
-        return area_map
-
-    def get_area_map_query(self):
-
-        from orm.entities import Election, Area
-        from orm.entities.Area import AreaAreaModel
-        from orm.enums import AreaTypeEnum
-
-        country = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.Country).subquery()
-        electoral_district = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.ElectoralDistrict).subquery()
-        polling_division = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.PollingDivision).subquery()
-        polling_district = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.PollingDistrict).subquery()
-        polling_station = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.PollingStation).subquery()
-        counting_centre = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.CountingCentre).subquery()
-        district_centre = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.DistrictCentre).subquery()
-        election_commission = db.session.query(Area.Model).filter(
-            Area.Model.areaType == AreaTypeEnum.ElectionCommission).subquery()
-
-        country__electoral_district = aliased(AreaAreaModel)
-        electoral_district__polling_division = aliased(AreaAreaModel)
-        polling_division__polling_district = aliased(AreaAreaModel)
-        polling_district__polling_station = aliased(AreaAreaModel)
-        counting_centre__polling_station = aliased(AreaAreaModel)
-        district_centre__counting_centre = aliased(AreaAreaModel)
-        election_commission__district_centre = aliased(AreaAreaModel)
-
-        query = db.session.query(
-            country.c.areaId.label("countryId"),
-            country.c.areaName.label("countryName"),
-            electoral_district.c.areaId.label("electoralDistrictId"),
-            electoral_district.c.areaName.label("electoralDistrictName"),
-            polling_division.c.areaId.label("pollingDivisionId"),
-            polling_division.c.areaName.label("pollingDivisionName"),
-            polling_district.c.areaId.label("pollingDistrictId"),
-            polling_district.c.areaName.label("pollingDistrictName"),
-            polling_station.c.areaId.label("pollingStationId"),
-            polling_station.c.areaName.label("pollingStationName"),
-            counting_centre.c.areaId.label("countingCentreId"),
-            counting_centre.c.areaName.label("countingCentreName"),
-            Election.Model.voteType
-        ).filter(
-            country__electoral_district.parentAreaId == country.c.areaId,
-            country__electoral_district.childAreaId == electoral_district.c.areaId,
-
-            electoral_district__polling_division.parentAreaId == electoral_district.c.areaId,
-            electoral_district__polling_division.childAreaId == polling_division.c.areaId,
-
-            polling_division__polling_district.parentAreaId == polling_division.c.areaId,
-            polling_division__polling_district.childAreaId == polling_district.c.areaId,
-
-            polling_district__polling_station.parentAreaId == polling_district.c.areaId,
-            polling_district__polling_station.childAreaId == polling_station.c.areaId,
-
-            counting_centre__polling_station.parentAreaId == counting_centre.c.areaId,
-            counting_centre__polling_station.childAreaId == polling_station.c.areaId,
-
-            district_centre__counting_centre.parentAreaId == district_centre.c.areaId,
-            district_centre__counting_centre.childAreaId == counting_centre.c.areaId,
-
-            election_commission__district_centre.parentAreaId == election_commission.c.areaId,
-            election_commission__district_centre.childAreaId == district_centre.c.areaId,
-
-            Election.Model.electionId == counting_centre.c.electionId
-        )
-
-        return query
+        return AreaIndex.get_by_area(area=area).get_area_map(area_id=area.areaId, group_by=group_by)
@@ -75,10 +75,8 @@ def get_root_token(electionId):
     return encoded_jwt_token
 
 
-def update_dashboard_tables():
-    tally_sheets = TallySheet.Model.query.all()
-    for tally_sheet in tally_sheets:
-        tally_sheet.update_status_report()
+def update_dashboard_tables(electionId=None):
+    TallySheet.update_status_reports(electionId=electionId)
 
     db.session.commit()
 
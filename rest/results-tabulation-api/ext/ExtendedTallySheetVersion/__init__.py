@@ -1,7 +1,7 @@
 import pandas as pd
 from flask import render_template
 from constants.VOTE_TYPES import Postal, NonPostal
-from util import to_comma_seperated_num, to_percentage, convert_image_to_data_uri
+from util import to_comma_seperated_num, to_percentage
 
 
 def get_extended_tally_sheet_version_class(templateName):
@@ -22,6 +22,13 @@ class ExtendedTallySheetVersion:
         data = tallySheetVersion.content
         self.df = pd.DataFrame(data)
 
+        # Built lazily and shared by all the result methods.
+        self._numeric_df = None
+        self._template_row_types = None
+        self._vote_types = None
+        self._mask_cache = {}
+        self._result_cache = {}
+
     def html_letter(self, title="", total_registered_voters=None):
         tallySheetVersion = self.tallySheetVersion
         stamp = tallySheetVersion.stamp
@@ -85,8 +92,6 @@ class ExtendedTallySheetVersion:
             to_percentage(vote_count_result["numValue"].values[0] * 100 / total_registered_voters)
         ]
 
-        content["logo"] = convert_image_to_data_uri("static/Emblem_of_Sri_Lanka.png")
-
         html = render_template(
             'PRE_ALL_ISLAND_RESULTS.html',
             content=content
@@ -157,306 +162,194 @@ class ExtendedTallySheetVersion:
 
         return html
 
-    def get_candidate_and_area_wise_valid_non_postal_vote_count_result(self):
-        df = self.df.copy()
+    def _get_numeric_df(self):
+        if self._numeric_df is None:
+            self._numeric_df = self.df.copy()
+            self._numeric_df['numValue'] = self._numeric_df['numValue'].astype(float)
 
-        df = df.loc[df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE"]
-        df = df.loc[df['voteType'] == NonPostal]
+        return self._numeric_df
 
-        df = df.sort_values(
-            by=['partyId', 'candidateId', 'areaId'], ascending=True
-        ).reset_index()
+    def _get_mask(self, templateRowTypes=None, voteType=None):
+        key = (templateRowTypes, voteType)
+        if key not in self._mask_cache:
+            mask = None
 
-        return df
-
-    def get_party_and_area_wise_valid_non_postal_vote_count_result(self):
-        df = self.df.copy()
+            if templateRowTypes is not None:
+                if self._template_row_types is None:
+                    self._template_row_types = pd.Categorical(self.df['templateRowType'])
+                mask = self._template_row_types.isin(templateRowTypes)
 
-        df = df.loc[df['templateRowType'] == "PARTY_WISE_VOTE"]
-        df = df.loc[df['voteType'] == NonPostal]
+            if voteType is not None:
+                if self._vote_types is None:
+                    self._vote_types = pd.Categorical(self.df['voteType'])
+                vote_type_mask = self._vote_types.isin([voteType])
+                mask = vote_type_mask if mask is None else mask & vote_type_mask
 
-        df = df.sort_values(
-            by=['partyId', 'areaId'], ascending=True
-        ).reset_index()
+            self._mask_cache[key] = mask
 
-        return df
+        return self._mask_cache[key]
 
-    def get_candidate_wise_valid_non_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
+    def _get_filtered_df(self, df, templateRowTypes=None, voteType=None):
+        mask = self._get_mask(templateRowTypes=templateRowTypes, voteType=voteType)
+        if mask is None:
+            return df
 
-        df = df.loc[df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE"]
-        df = df.loc[df['voteType'] == NonPostal]
+        return df.loc[mask]
 
-        df = df.groupby(
-            ['partyId', 'partyName', 'partyAbbreviation', 'candidateId', 'candidateName']
-        ).agg(sum).sort_values(
-            by=['partyId', 'candidateId'], ascending=True
-        ).reset_index()
+    def _get_sorted_result(self, sort_by, templateRowTypes=None, voteType=None):
+        key = ("sorted", tuple(sort_by), templateRowTypes, voteType)
+        if key not in self._result_cache:
+            df = self._get_filtered_df(self.df, templateRowTypes=templateRowTypes, voteType=voteType)
 
-        return df
+            self._result_cache[key] = df.sort_values(by=sort_by, ascending=True).reset_index()
 
-    def get_candidate_wise_valid_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
+        # Callers are free to modify the returned frame.
+        return self._result_cache[key].copy()
 
-        df = df.loc[df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE"]
-        df = df.loc[df['voteType'] == Postal]
+    def _get_grouped_result(self, group_by=None, sort_by=None, templateRowTypes=None, voteType=None, skipna=True):
+        key = ("grouped", tuple(group_by or []), templateRowTypes, voteType, skipna)
+        if key not in self._result_cache:
+            df = self._get_filtered_df(self._get_numeric_df(), templateRowTypes=templateRowTypes, voteType=voteType)
 
-        df = df.groupby(
-            ['partyId', 'partyName', 'partyAbbreviation', 'candidateId', 'candidateName']
-        ).agg(sum).sort_values(
-            by=['partyId', 'candidateId'], ascending=True
-        ).reset_index()
+            if group_by is None:
+                df = df.groupby(lambda a: True).agg(sum)
+            else:
+                if skipna:
+                    agg = sum
+                else:
+                    agg = {'numValue': lambda x: x.sum(skipna=False)}
 
-        return df
+                df = df.groupby(group_by).agg(agg).sort_values(by=sort_by, ascending=True).reset_index()
 
-    def get_party_wise_valid_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
+            self._result_cache[key] = df
 
-        df = df.loc[df['templateRowType'] == "PARTY_WISE_VOTE"]
-        df = df.loc[df['voteType'] == Postal]
+        # Callers are free to modify the returned frame.
+        return self._result_cache[key].copy()
 
-        df = df.groupby(
-            ['partyId', 'partyName', 'partyAbbreviation']
-        ).agg({'numValue': lambda x: x.sum(skipna=False)}).sort_values(
-            by=['partyId'], ascending=True
-        ).reset_index()
+    def get_candidate_and_area_wise_valid_non_postal_vote_count_result(self):
+        return self._get_sorted_result(
+            sort_by=['partyId', 'candidateId', 'areaId'],
+            templateRowTypes=("CANDIDATE_FIRST_PREFERENCE",),
+            voteType=NonPostal
+        )
 
-        return df
+    def get_party_and_area_wise_valid_non_postal_vote_count_result(self):
+        return self._get_sorted_result(
+            sort_by=['partyId', 'areaId'],
+            templateRowTypes=("PARTY_WISE_VOTE",),
+            voteType=NonPostal
+        )
 
-    def get_candidate_wise_valid_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
+    def get_candidate_wise_valid_non_postal_vote_count_result(self):
+        return self._get_grouped_result(
+            group_by=['partyId', 'partyName', 'partyAbbreviation', 'candidateId', 'candidateName'],
+            sort_by=['partyId', 'candidateId'],
+            templateRowTypes=("CANDIDATE_FIRST_PREFERENCE",),
+            voteType=NonPostal
+        )
 
-        df = df.loc[df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE"]
+    def get_candidate_wise_valid_postal_vote_count_result(self):
+        return self._get_grouped_result(
+            group_by=['partyId', 'partyName', 'partyAbbreviation', 'candidateId', 'candidateName'],
+            sort_by=['partyId', 'candidateId'],
+            templateRowTypes=("CANDIDATE_FIRST_PREFERENCE",),
+            voteType=Postal
+        )
 
-        df = df.groupby(
-            ['partyId', 'partyName', 'partyAbbreviation', 'candidateId', 'candidateName']
-        ).agg(sum).sort_values(
-            by=['partyId', 'candidateId'], ascending=True
-        ).reset_index()
+    def get_party_wise_valid_postal_vote_count_result(self):
+        return self._get_grouped_result(
+            group_by=['partyId', 'partyName', 'partyAbbreviation'],
+            sort_by=['partyId'],
+            templateRowTypes=("PARTY_WISE_VOTE",),
+            voteType=Postal,
+            skipna=False
+        )
 
-        return df
+    def get_candidate_wise_valid_vote_count_result(self):
+        return self._get_grouped_result(
+            group_by=['partyId', 'partyName', 'partyAbbreviation', 'candidateId', 'candidateName'],
+            sort_by=['partyId', 'candidateId'],
+            templateRowTypes=("CANDIDATE_FIRST_PREFERENCE",)
+        )
 
     def get_area_wise_valid_non_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[(df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE") | (df['templateRowType'] == "PARTY_WISE_VOTE")]
-        df = df.loc[df['voteType'] == NonPostal]
-
-        df = df.groupby(
-            ['areaId', "areaName"]
-        ).agg(sum).sort_values(
-            by=['areaId'], ascending=True
-        ).reset_index()
-
-        return df
+        return self._get_grouped_result(
+            group_by=['areaId', "areaName"],
+            sort_by=['areaId'],
+            templateRowTypes=("CANDIDATE_FIRST_PREFERENCE", "PARTY_WISE_VOTE"),
+            voteType=NonPostal
+        )
 
     def get_area_wise_rejected_non_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "REJECTED_VOTE"]
-        df = df.loc[df['voteType'] == NonPostal]
-
-        df = df.groupby(
-            ['areaId', "areaName"]
-        ).agg(sum).sort_values(
-            by=['areaId'], ascending=True
-        ).reset_index()
-
-        return df
+        return self._get_grouped_result(
+            group_by=['areaId', "areaName"],
+            sort_by=['areaId'],
+            templateRowTypes=("REJECTED_VOTE",),
+            voteType=NonPostal
+        )
 
     def get_area_wise_non_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['voteType'] == NonPostal]
-
-        df = df.groupby(
-            ['areaId', "areaName"]
-        ).agg(sum).sort_values(
-            by=['areaId'], ascending=True
-        ).reset_index()
-
-        return df
+        return self._get_grouped_result(group_by=['areaId', "areaName"], sort_by=['areaId'], voteType=NonPostal)
 
     def get_non_postal_valid_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE"]
-        df = df.loc[df['voteType'] == NonPostal]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(templateRowTypes=("CANDIDATE_FIRST_PREFERENCE",), voteType=NonPostal)
 
     def get_non_postal_rejected_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "REJECTED_VOTE"]
-        df = df.loc[df['voteType'] == NonPostal]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(templateRowTypes=("REJECTED_VOTE",), voteType=NonPostal)
 
     def get_non_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-        df = df.loc[df['voteType'] == NonPostal]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(voteType=NonPostal)
 
     def get_postal_valid_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE"]
-        df = df.loc[df['voteType'] == Postal]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(templateRowTypes=("CANDIDATE_FIRST_PREFERENCE",), voteType=Postal)
 
     def get_party_wise_postal_valid_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "PARTY_WISE_VOTE"]
-        df = df.loc[df['voteType'] == Postal]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(templateRowTypes=("PARTY_WISE_VOTE",), voteType=Postal)
 
     def get_postal_rejected_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "REJECTED_VOTE"]
-        df = df.loc[df['voteType'] == Postal]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(templateRowTypes=("REJECTED_VOTE",), voteType=Postal)
 
     def get_postal_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-        df = df.loc[df['voteType'] == Postal]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(voteType=Postal)
 
     def get_valid_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[(df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE") | (df['templateRowType'] == "PARTY_WISE_VOTE")]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(templateRowTypes=("CANDIDATE_FIRST_PREFERENCE", "PARTY_WISE_VOTE"))
 
     def get_rejected_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "REJECTED_VOTE"]
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result(templateRowTypes=("REJECTED_VOTE",))
 
     def get_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.groupby(lambda a: True).agg(sum)
-
-        return df
+        return self._get_grouped_result()
 
     def get_candidate_and_area_wise_valid_vote_count_result(self):
-        df = self.df.copy()
-
-        df = df.loc[df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE"]
-
-        df = df.sort_values(
-            by=['partyId', 'candidateId', 'areaId'], ascending=True
-        ).reset_index()
-
-        return df
-
+        return self._get_sorted_result(
+            sort_by=['partyId', 'candidateId', 'areaId'],
+            templateRowTypes=("CANDIDATE_FIRST_PREFERENCE",)
+        )
 
     def get_party_and_area_wise_valid_vote_count_result(self):
-        df = self.df.copy()
-
-        df = df.loc[df['templateRowType'] == "PARTY_WISE_VOTE"]
-
-        df = df.sort_values(
-            by=['partyId', 'areaId'], ascending=True
-        ).reset_index()
-        return df
+        return self._get_sorted_result(sort_by=['partyId', 'areaId'], templateRowTypes=("PARTY_WISE_VOTE",))
 
     def get_area_wise_valid_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[(df['templateRowType'] == "CANDIDATE_FIRST_PREFERENCE") | (df['templateRowType'] == "PARTY_WISE_VOTE")]
-
-        df = df.groupby(
-            ['areaId', "areaName"]
-        ).agg(sum).sort_values(
-            by=['areaId'], ascending=True
-        ).reset_index()
-
-        return df
+        return self._get_grouped_result(
+            group_by=['areaId', "areaName"],
+            sort_by=['areaId'],
+            templateRowTypes=("CANDIDATE_FIRST_PREFERENCE", "PARTY_WISE_VOTE")
+        )
 
     def get_party_wise_valid_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "PARTY_WISE_VOTE"]
-
-        df = df.groupby(
-            ['partyId', 'partyName', 'partyAbbreviation']
-        ).agg(sum).sort_values(
-            by=['partyId'], ascending=True
-        ).reset_index()
-
-        return df
+        return self._get_grouped_result(
+            group_by=['partyId', 'partyName', 'partyAbbreviation'],
+            sort_by=['partyId'],
+            templateRowTypes=("PARTY_WISE_VOTE",)
+        )
 
     def get_area_wise_rejected_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.loc[df['templateRowType'] == "REJECTED_VOTE"]
-
-        df = df.groupby(
-            ['areaId', "areaName"]
-        ).agg(sum).sort_values(
-            by=['areaId'], ascending=True
-        ).reset_index()
-
-        return df
+        return self._get_grouped_result(
+            group_by=['areaId', "areaName"],
+            sort_by=['areaId'],
+            templateRowTypes=("REJECTED_VOTE",)
+        )
 
     def get_area_wise_vote_count_result(self):
-        df = self.df.copy()
-        df['numValue'] = df['numValue'].astype(float)
-
-        df = df.groupby(
-            ['areaId', "areaName"]
-        ).agg(sum).sort_values(
-            by=['areaId'], ascending=True
-        ).reset_index()
-
-        return df
+        return self._get_grouped_result(group_by=['areaId', "areaName"], sort_by=['areaId'])
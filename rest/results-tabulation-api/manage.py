@@ -26,6 +26,92 @@ def create_database():
 manager.add_command('db', MigrateCommand)
 
 
+@manager.command
+def dispatch_result_pushes():
+    """
+    Push the queued results to the result dissemination system, until interrupted.
+    """
+    from util import result_push_dispatcher
+    dispatcher_thread = result_push_dispatcher.start(flask_app)
+    dispatcher_thread.join()
+
+
+@manager.option("-t", "--template", dest="election_template_name", required=True)
+@manager.option("-n", "--name", dest="election_name", required=True)
+@manager.option("-d", "--dataset", dest="dataset_directory", required=True)
+@manager.option("--dry-run", dest="dry_run", action="store_true", default=False)
+@manager.option("-w", "--workers", dest="workers", type=int, default=None)
+def build_election(election_template_name, election_name, dataset_directory, dry_run=False, workers=None):
+    """
+    Build an election from a dataset directory. With --dry-run, nothing is committed, and the planned row counts are
+    reported by the templates which plan their rows. With --workers, the electoral districts are built in parallel.
+    """
+    import getpass
+    import os
+    from werkzeug.datastructures import FileStorage
+    from auth import USER_NAME
+    from orm.entities import Election
+
+    def _get_dataset_file(file_name):
+        file_path = os.path.join(dataset_directory, file_name)
+
+        return FileStorage(stream=open(file_path, "rb"), filename=file_name, content_type="text/csv")
+
+    with flask_app.test_request_context(environ_base={"REMOTE_ADDR": "127.0.0.1"}) as request_context:
+        request_context.connexion_context = {USER_NAME: getpass.getuser()}
+
+        Election.create(
+            electionTemplateName=election_template_name, electionName=election_name, isListed=True,
+            party_candidate_dataset_file=_get_dataset_file("party-candidate-dataset.csv"),
+            polling_station_dataset_file=_get_dataset_file("polling-stations-dataset.csv"),
+            postal_counting_centers_dataset_file=_get_dataset_file("postal-counting-centres-dataset.csv"),
+            invalid_vote_categories_dataset_file=_get_dataset_file("invalid-vote-categories-dataset.csv"),
+            dry_run=dry_run,
+            workers=workers
+        )
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+
+
+@manager.option("-s", "--seconds", dest="seconds", type=float, default=1.0)
+def benchmark_serializers(seconds=1.0):
+    """
+    Report the rows dumped per second with the schemas and with the compiled serializers of the hot endpoints.
+    """
+    from orm.entities import Election
+    from orm.entities.Submission import TallySheet
+    from orm.entities.SubmissionVersion import TallySheetVersion
+    from schemas import TallySheetSchema, TallySheetVersionSchema, ElectionSchema
+    from schemas.serializers import benchmark, TallySheetSerializer, TallySheetVersionSerializer, \
+        ElectionSerializer
+
+    with flask_app.test_request_context():
+        tally_sheets = TallySheet.Model.query.options(*TallySheet.get_list_query_options()).all()
+        TallySheet.load_area_map_lists(tally_sheets)
+        tally_sheet_versions = TallySheetVersion.Model.query.filter(
+            TallySheetVersion.Model.tallySheetVersionId.in_(
+                [tally_sheet.latestVersionId for tally_sheet in tally_sheets if tally_sheet.latestVersionId]
+            )
+        ).all()
+        elections = Election.Model.query.all()
+
+        for name, schema_class, serializer, objs in [
+            ("tally sheets", TallySheetSchema, TallySheetSerializer, tally_sheets),
+            ("tally sheet versions", TallySheetVersionSchema, TallySheetVersionSerializer, tally_sheet_versions),
+            ("elections", ElectionSchema, ElectionSerializer, elections)
+        ]:
+            if len(objs) == 0:
+                continue
+
+            schema_rows_per_second, serializer_rows_per_second = benchmark(schema_class, serializer, objs, seconds)
+            print("%s: %.0f rows/second with the schema, %.0f rows/second compiled (x%.1f)" % (
+                name, schema_rows_per_second, serializer_rows_per_second,
+                serializer_rows_per_second / schema_rows_per_second))
+
+
 # @manager.command
 # def build_database(dataset):
 #     """
@@ -0,0 +1,24 @@
+"""empty message
+
+Revision ID: 3b7e2f9d4c61
+Revises: c27e94b1d053
+Create Date: 2020-03-04 10:42:17.305128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7e2f9d4c61'
+down_revision = 'c27e94b1d053'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('election', sa.Column('metadataVersion', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('election', 'metadataVersion')
@@ -0,0 +1,44 @@
+"""empty message
+
+Revision ID: 3f286c402506
+Revises: 7bdab37d8bbf
+Create Date: 2020-02-24 10:12:41.318274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f286c402506'
+down_revision = '7bdab37d8bbf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tallySheetAggregateRow',
+    sa.Column('tallySheetAggregateRowId', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('tallySheetId', sa.Integer(), nullable=False),
+    sa.Column('templateRowId', sa.Integer(), nullable=False),
+    sa.Column('electionId', sa.Integer(), nullable=True),
+    sa.Column('areaId', sa.Integer(), nullable=True),
+    sa.Column('candidateId', sa.Integer(), nullable=True),
+    sa.Column('partyId', sa.Integer(), nullable=True),
+    sa.Column('numValue', sa.Integer(), nullable=True),
+    sa.Column('numValueCount', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['areaId'], ['area.areaId'], ),
+    sa.ForeignKeyConstraint(['candidateId'], ['candidate.candidateId'], ),
+    sa.ForeignKeyConstraint(['electionId'], ['election.electionId'], ),
+    sa.ForeignKeyConstraint(['partyId'], ['party.partyId'], ),
+    sa.ForeignKeyConstraint(['tallySheetId'], ['tallySheet.tallySheetId'], ),
+    sa.ForeignKeyConstraint(['templateRowId'], ['templateRow.templateRowId'], ),
+    sa.PrimaryKeyConstraint('tallySheetAggregateRowId')
+    )
+    op.create_index('ix_tallySheetAggregateRow_tallySheetId_templateRowId', 'tallySheetAggregateRow',
+                    ['tallySheetId', 'templateRowId'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_tallySheetAggregateRow_tallySheetId_templateRowId', table_name='tallySheetAggregateRow')
+    op.drop_table('tallySheetAggregateRow')
@@ -0,0 +1,24 @@
+"""empty message
+
+Revision ID: 6d0c4e8a1f37
+Revises: b52e1d7c9a04
+Create Date: 2020-02-26 11:27:05.418236
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d0c4e8a1f37'
+down_revision = 'b52e1d7c9a04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('election', sa.Column('hierarchyVersion', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('election', 'hierarchyVersion')
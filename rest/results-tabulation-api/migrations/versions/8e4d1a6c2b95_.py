@@ -0,0 +1,59 @@
+"""empty message
+
+Revision ID: 8e4d1a6c2b95
+Revises: 3b7e2f9d4c61
+Create Date: 2020-03-05 15:21:09.482716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d1a6c2b95'
+down_revision = '3b7e2f9d4c61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # TallySheet.get_all filters the submissions by the authorized areas and by the elections.
+    op.create_index('ix_submission_areaId_electionId', 'submission', ['areaId', 'electionId'], unique=False)
+    op.create_index('ix_submission_electionId_areaId', 'submission', ['electionId', 'areaId'], unique=False)
+    op.create_index('ix_template_templateName', 'template', ['templateName'], unique=False)
+
+    # Content of a version, and the rows of the locked versions of the children joined by the derived aggregation.
+    op.create_index('ix_tallySheetVersionRow_tallySheetVersionId_templateRowId', 'tallySheetVersionRow',
+                    ['tallySheetVersionId', 'templateRowId'], unique=False)
+
+    # Parents of a tally sheet, looked up when the aggregates of the parents are updated.
+    op.create_index('ix_tallySheet_tallySheet_childTallySheetId', 'tallySheet_tallySheet',
+                    ['childTallySheetId', 'parentTallySheetId'], unique=False)
+
+    # Areas of the elections of a root election, loaded by the area index.
+    op.create_index('ix_area_electionId_areaType', 'area', ['electionId', 'areaType'], unique=False)
+
+
+def _drop_index(index_name, table_name, foreign_key_column_name=None):
+    bind = op.get_bind()
+
+    # MySQL drops the index it created for a foreign key once another index leads with the same column, and then
+    # refuses to drop that other index. Hence a plain index is restored for the foreign key first, unless one exists.
+    if foreign_key_column_name is not None and bind.dialect.name == "mysql":
+        indexes = sa.inspect(bind).get_indexes(table_name)
+        if not any(index["name"] != index_name and index["column_names"][0] == foreign_key_column_name
+                   for index in indexes):
+            op.create_index("%s_%s_fk" % (table_name, foreign_key_column_name), table_name,
+                            [foreign_key_column_name], unique=False)
+
+    op.drop_index(index_name, table_name=table_name)
+
+
+def downgrade():
+    _drop_index('ix_area_electionId_areaType', 'area', 'electionId')
+    _drop_index('ix_tallySheet_tallySheet_childTallySheetId', 'tallySheet_tallySheet', 'childTallySheetId')
+    _drop_index('ix_tallySheetVersionRow_tallySheetVersionId_templateRowId', 'tallySheetVersionRow',
+                'tallySheetVersionId')
+    _drop_index('ix_template_templateName', 'template')
+    _drop_index('ix_submission_electionId_areaId', 'submission', 'electionId')
+    _drop_index('ix_submission_areaId_electionId', 'submission', 'areaId')
@@ -0,0 +1,41 @@
+"""empty message
+
+Revision ID: a7c3e91b5d24
+Revises: f5a29c3e8b17
+Create Date: 2020-03-09 11:42:17.308516
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e91b5d24'
+down_revision = 'f5a29c3e8b17'
+branch_labels = None
+depends_on = None
+
+# Tables of which the ids are taken in blocks, with their primary keys.
+ID_BLOCK_TABLES = [
+    ('barcode', 'barcodeId'),
+    ('stamp', 'stampId')
+]
+
+
+def upgrade():
+    op.create_table('idBlock',
+                    sa.Column('tableName', sa.String(length=100), nullable=False),
+                    sa.Column('nextId', sa.BigInteger(), nullable=False),
+                    sa.PrimaryKeyConstraint('tableName')
+                    )
+
+    print(" -- Reserving the ids of the audit tables.")
+    # Seeded up front, so that the worker processes don't race to insert the rows on their first reservation.
+    for table_name, primary_key_name in ID_BLOCK_TABLES:
+        op.execute(
+            "INSERT INTO idBlock (tableName, nextId) SELECT '%s', COALESCE(MAX(%s), 0) + 1 FROM %s" % (
+                table_name, primary_key_name, table_name)
+        )
+
+
+def downgrade():
+    op.drop_table('idBlock')
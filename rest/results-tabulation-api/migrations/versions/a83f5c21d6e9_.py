@@ -0,0 +1,47 @@
+"""empty message
+
+Revision ID: a83f5c21d6e9
+Revises: 6d0c4e8a1f37
+Create Date: 2020-02-27 16:42:18.903517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a83f5c21d6e9'
+down_revision = '6d0c4e8a1f37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resultPush',
+    sa.Column('resultPushId', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('idempotencyKey', sa.String(length=100), nullable=False),
+    sa.Column('tallySheetId', sa.Integer(), nullable=False),
+    sa.Column('tallySheetVersionId', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('params', sa.Text(), nullable=True),
+    sa.Column('jsonBody', sa.Text(), nullable=True),
+    sa.Column('fileId', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('Pending', 'InProgress', 'Dispatched', 'Failed', name='resultpushstatusenum'),
+              nullable=False),
+    sa.Column('attemptCount', sa.Integer(), nullable=False),
+    sa.Column('nextAttemptAt', sa.DateTime(), nullable=False),
+    sa.Column('lastError', sa.Text(), nullable=True),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.Column('dispatchedAt', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['fileId'], ['file.fileId'], ),
+    sa.ForeignKeyConstraint(['tallySheetId'], ['tallySheet.tallySheetId'], ),
+    sa.ForeignKeyConstraint(['tallySheetVersionId'], ['tallySheetVersion.tallySheetVersionId'], ),
+    sa.PrimaryKeyConstraint('resultPushId'),
+    sa.UniqueConstraint('idempotencyKey')
+    )
+    op.create_index('ix_resultPush_status_nextAttemptAt', 'resultPush', ['status', 'nextAttemptAt'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_resultPush_status_nextAttemptAt', table_name='resultPush')
+    op.drop_table('resultPush')
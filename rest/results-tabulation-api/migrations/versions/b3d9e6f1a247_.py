@@ -0,0 +1,24 @@
+"""empty message
+
+Revision ID: b3d9e6f1a247
+Revises: e4b71d6a2c58
+Create Date: 2020-03-13 09:41:27.518632
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b3d9e6f1a247'
+down_revision = 'e4b71d6a2c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The aggregates materialized so far are left without a hash, hence materialized again on next use.
+    op.add_column('tallySheetAggregateRow', sa.Column('childLockedVersionsHash', sa.String(length=40), nullable=True))
+
+
+def downgrade():
+    op.drop_column('tallySheetAggregateRow', 'childLockedVersionsHash')
@@ -0,0 +1,105 @@
+"""empty message
+
+Revision ID: b52e1d7c9a04
+Revises: 3f286c402506
+Create Date: 2020-02-25 14:03:12.671093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b52e1d7c9a04'
+down_revision = '3f286c402506'
+branch_labels = None
+depends_on = None
+
+area_type_enum = sa.Enum('Country', 'Province', 'AdministrativeDistrict', 'ElectoralDistrict', 'PollingDivision',
+                         'PollingDistrict', 'ElectionCommission', 'DistrictCentre', 'CountingCentre', 'PollingStation',
+                         'Electorate', 'Office', 'PostalVoteCountingCentre', name='areatypeenum')
+
+
+def upgrade():
+    area_closure_table = op.create_table('area_closure',
+    sa.Column('ancestorId', sa.Integer(), nullable=False),
+    sa.Column('descendantId', sa.Integer(), nullable=False),
+    sa.Column('voteType', sa.String(length=100), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.Column('ancestorType', area_type_enum, nullable=False),
+    sa.Column('descendantType', area_type_enum, nullable=False),
+    sa.ForeignKeyConstraint(['ancestorId'], ['area.areaId'], ),
+    sa.ForeignKeyConstraint(['descendantId'], ['area.areaId'], ),
+    sa.PrimaryKeyConstraint('ancestorId', 'descendantId', 'voteType')
+    )
+    op.create_index('ix_area_closure_descendantId_ancestorType', 'area_closure', ['descendantId', 'ancestorType'],
+                    unique=False)
+    op.create_index('ix_area_closure_ancestorType_descendantId', 'area_closure', ['ancestorType', 'descendantId'],
+                    unique=False)
+
+    # The same as AreaClosure.get_closure_rows at the time of this revision, kept here so that later changes to the
+    # model don't change the migration.
+    def _get_path_vote_type(path_vote_type, area_vote_type):
+        if area_vote_type not in ["Postal", "NonPostal"] or area_vote_type == path_vote_type:
+            return path_vote_type
+        elif path_vote_type is None:
+            return area_vote_type
+        else:
+            # A path can't cross both postal and non postal areas.
+            return False
+
+    def _get_closure_rows(areas, area_area_list):
+        area_type_map = {}
+        area_vote_type_map = {}
+        for area_id, area_type, vote_type in areas:
+            area_type_map[area_id] = area_type
+            area_vote_type_map[area_id] = vote_type
+
+        children_map = {}
+        for parent_area_id, child_area_id in area_area_list:
+            if parent_area_id in area_type_map and child_area_id in area_type_map:
+                children_map.setdefault(parent_area_id, []).append(child_area_id)
+
+        closure_map = {}
+        for ancestor_id in area_type_map:
+            stack = [(ancestor_id, 0, _get_path_vote_type(None, area_vote_type_map[ancestor_id]))]
+            while len(stack) > 0:
+                descendant_id, depth, path_vote_type = stack.pop()
+                if path_vote_type is False:
+                    continue
+
+                key = (ancestor_id, descendant_id, path_vote_type or "PostalAndNonPostal")
+                if key in closure_map and closure_map[key] <= depth:
+                    continue
+
+                closure_map[key] = depth
+
+                for child_area_id in children_map.get(descendant_id, []):
+                    stack.append((child_area_id, depth + 1,
+                                  _get_path_vote_type(path_vote_type, area_vote_type_map[child_area_id])))
+
+        return [
+            {
+                "ancestorId": ancestor_id,
+                "descendantId": descendant_id,
+                "voteType": vote_type,
+                "depth": depth,
+                "ancestorType": area_type_map[ancestor_id],
+                "descendantType": area_type_map[descendant_id]
+            } for (ancestor_id, descendant_id, vote_type), depth in closure_map.items()
+        ]
+
+    print(" -- Populating the area closure of existing areas.")
+    bind = op.get_bind()
+    areas = bind.execute(
+        "SELECT area.areaId, area.areaType, election.voteType FROM area "
+        "JOIN election ON election.electionId = area.electionId"
+    ).fetchall()
+    area_area_list = bind.execute("SELECT parentAreaId, childAreaId FROM area_area").fetchall()
+
+    op.bulk_insert(area_closure_table, _get_closure_rows(areas, area_area_list))
+
+
+def downgrade():
+    op.drop_index('ix_area_closure_ancestorType_descendantId', table_name='area_closure')
+    op.drop_index('ix_area_closure_descendantId_ancestorType', table_name='area_closure')
+    op.drop_table('area_closure')
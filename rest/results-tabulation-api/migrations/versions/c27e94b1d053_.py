@@ -0,0 +1,86 @@
+"""empty message
+
+Revision ID: c27e94b1d053
+Revises: a83f5c21d6e9
+Create Date: 2020-03-02 11:08:43.126905
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql import LONGBLOB
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.declarative import declarative_base
+
+# revision identifiers, used by Alembic.
+revision = 'c27e94b1d053'
+down_revision = 'a83f5c21d6e9'
+branch_labels = None
+depends_on = None
+
+Base = declarative_base()
+bind = op.get_bind()
+session = Session(bind=bind)
+
+
+class _File(Base):
+    __tablename__ = 'file'
+    fileId = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    fileContent = sa.Column(LONGBLOB, nullable=True)
+    fileBlobHash = sa.Column(sa.String(64), nullable=True)
+
+
+class _FileBlob(Base):
+    __tablename__ = 'fileBlob'
+    fileBlobHash = sa.Column(sa.String(64), primary_key=True)
+    fileBlobSize = sa.Column(sa.Integer, nullable=False)
+    fileBlobContent = sa.Column(LONGBLOB, nullable=False)
+
+
+def upgrade():
+    op.create_table('fileBlob',
+                    sa.Column('fileBlobHash', sa.String(length=64), nullable=False),
+                    sa.Column('fileBlobSize', sa.Integer(), nullable=False),
+                    sa.Column('fileBlobContent', mysql.LONGBLOB(), nullable=False),
+                    sa.PrimaryKeyConstraint('fileBlobHash')
+                    )
+    op.add_column('file', sa.Column('fileBlobHash', sa.String(length=64), nullable=True))
+    op.create_foreign_key('file_fileBlobHash_fk', 'file', 'fileBlob', ['fileBlobHash'], ['fileBlobHash'])
+
+    # Contents are moved one file at a time, so that all of them are never loaded in to the memory at once.
+    file_ids = [file_id for file_id, in session.query(_File.fileId).filter(_File.fileContent != None).all()]
+    for file_id in file_ids:
+        file = session.query(_File).filter(_File.fileId == file_id).one()
+        file_blob_hash = hashlib.sha256(file.fileContent).hexdigest()
+
+        if session.query(_FileBlob.fileBlobHash).filter(_FileBlob.fileBlobHash == file_blob_hash).count() == 0:
+            session.add(_FileBlob(fileBlobHash=file_blob_hash, fileBlobSize=len(file.fileContent),
+                                  fileBlobContent=file.fileContent))
+
+        file.fileBlobHash = file_blob_hash
+        session.flush()
+        session.expunge_all()
+
+    session.commit()
+
+    op.drop_column('file', 'fileContent')
+
+
+def downgrade():
+    op.add_column('file', sa.Column('fileContent', mysql.LONGBLOB(), nullable=True))
+
+    file_ids = [file_id for file_id, in session.query(_File.fileId).filter(_File.fileBlobHash != None).all()]
+    for file_id in file_ids:
+        file = session.query(_File).filter(_File.fileId == file_id).one()
+        file.fileContent = session.query(_FileBlob.fileBlobContent).filter(
+            _FileBlob.fileBlobHash == file.fileBlobHash).scalar()
+        session.flush()
+        session.expunge_all()
+
+    session.commit()
+
+    op.drop_constraint('file_fileBlobHash_fk', 'file', type_='foreignkey')
+    op.drop_column('file', 'fileBlobHash')
+    op.drop_table('fileBlob')
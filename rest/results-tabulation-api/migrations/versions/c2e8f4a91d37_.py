@@ -0,0 +1,43 @@
+"""empty message
+
+Revision ID: c2e8f4a91d37
+Revises: a7c3e91b5d24
+Create Date: 2020-03-11 14:27:52.914306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c2e8f4a91d37'
+down_revision = 'a7c3e91b5d24'
+branch_labels = None
+depends_on = None
+
+# Tables of which the ids are taken in blocks by the ORM helpers, with their primary keys.
+ID_BLOCK_TABLES = [
+    ('area', 'areaId'),
+    ('template', 'templateId'),
+    ('templateRow', 'templateRowId'),
+    ('templateRowColumn', 'templateRowColumnId'),
+    ('meta', 'metaId'),
+    ('metaData', 'metaDataId'),
+    ('folder', 'folderId'),
+    ('dashboard_status_report', 'statusReportId'),
+    ('tallySheetVersionRow', 'tallySheetVersionRowId')
+]
+
+
+def upgrade():
+    print(" -- Reserving the ids of the tables created through the unit of work.")
+    for table_name, primary_key_name in ID_BLOCK_TABLES:
+        op.execute(
+            "INSERT INTO idBlock (tableName, nextId) SELECT '%s', COALESCE(MAX(%s), 0) + 1 FROM %s "
+            "WHERE NOT EXISTS (SELECT 1 FROM idBlock WHERE tableName = '%s')" % (
+                table_name, primary_key_name, table_name, table_name)
+        )
+
+
+def downgrade():
+    op.execute("DELETE FROM idBlock WHERE tableName IN (%s)" % ", ".join(
+        ["'%s'" % table_name for table_name, primary_key_name in ID_BLOCK_TABLES]))
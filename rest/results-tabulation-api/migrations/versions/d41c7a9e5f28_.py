@@ -0,0 +1,30 @@
+"""empty message
+
+Revision ID: d41c7a9e5f28
+Revises: 8e4d1a6c2b95
+Create Date: 2020-03-06 09:36:52.117384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41c7a9e5f28'
+down_revision = '8e4d1a6c2b95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('proof', sa.Column('scannedFilesCount', sa.Integer(), server_default='0', nullable=False))
+
+    print(" -- Counting the scanned files of existing proofs.")
+    op.execute(
+        "UPDATE proof SET scannedFilesCount = ("
+        "SELECT COUNT(folder_file.fileId) FROM folder_file WHERE folder_file.folderId = proof.scannedFilesFolderId)"
+    )
+
+
+def downgrade():
+    op.drop_column('proof', 'scannedFilesCount')
@@ -0,0 +1,62 @@
+"""empty message
+
+Revision ID: d6c18a4f9e35
+Revises: b3d9e6f1a247
+Create Date: 2020-03-14 10:22:51.304718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'd6c18a4f9e35'
+down_revision = 'b3d9e6f1a247'
+branch_labels = None
+depends_on = None
+
+FILE_BLOB_CHUNK_SIZE = 1024 * 1024
+
+
+def upgrade():
+    op.create_table('fileBlobChunk',
+                    sa.Column('fileBlobHash', sa.String(length=64), nullable=False),
+                    sa.Column('fileBlobChunkIndex', sa.Integer(), autoincrement=False, nullable=False),
+                    sa.Column('fileBlobChunkContent', mysql.MEDIUMBLOB(), nullable=False),
+                    sa.ForeignKeyConstraint(['fileBlobHash'], ['fileBlob.fileBlobHash'], ),
+                    sa.PrimaryKeyConstraint('fileBlobHash', 'fileBlobChunkIndex')
+                    )
+
+    bind = op.get_bind()
+
+    # The contents are split a chunk index at a time, for all the blobs which are long enough to have it.
+    max_file_blob_size = bind.execute(sa.text('SELECT MAX(fileBlobSize) FROM fileBlob')).scalar() or 0
+    for chunk_index in range((max_file_blob_size + FILE_BLOB_CHUNK_SIZE - 1) // FILE_BLOB_CHUNK_SIZE):
+        bind.execute(sa.text(
+            'INSERT INTO fileBlobChunk (fileBlobHash, fileBlobChunkIndex, fileBlobChunkContent) '
+            'SELECT fileBlobHash, :chunk_index, SUBSTRING(fileBlobContent, :chunk_offset, :chunk_size) '
+            'FROM fileBlob WHERE fileBlobSize > :chunk_start'
+        ), chunk_index=chunk_index, chunk_offset=chunk_index * FILE_BLOB_CHUNK_SIZE + 1,
+            chunk_size=FILE_BLOB_CHUNK_SIZE, chunk_start=chunk_index * FILE_BLOB_CHUNK_SIZE)
+
+    op.drop_column('fileBlob', 'fileBlobContent')
+
+
+def downgrade():
+    op.add_column('fileBlob', sa.Column('fileBlobContent', mysql.LONGBLOB(), nullable=True))
+
+    bind = op.get_bind()
+
+    # Contents are assembled one blob at a time, so that all of them are never loaded in to the memory at once.
+    file_blob_hashes = [file_blob_hash for file_blob_hash, in bind.execute(
+        sa.text('SELECT fileBlobHash FROM fileBlob')).fetchall()]
+    for file_blob_hash in file_blob_hashes:
+        chunks = [chunk for chunk, in bind.execute(sa.text(
+            'SELECT fileBlobChunkContent FROM fileBlobChunk WHERE fileBlobHash = :file_blob_hash '
+            'ORDER BY fileBlobChunkIndex'
+        ), file_blob_hash=file_blob_hash).fetchall()]
+        bind.execute(sa.text('UPDATE fileBlob SET fileBlobContent = :content WHERE fileBlobHash = :file_blob_hash'),
+                     content=b"".join(chunks), file_blob_hash=file_blob_hash)
+
+    op.alter_column('fileBlob', 'fileBlobContent', existing_type=mysql.LONGBLOB(), nullable=False)
+    op.drop_table('fileBlobChunk')
@@ -0,0 +1,26 @@
+"""empty message
+
+Revision ID: e4b71d6a2c58
+Revises: c2e8f4a91d37
+Create Date: 2020-03-12 10:18:45.206391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e4b71d6a2c58'
+down_revision = 'c2e8f4a91d37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('resultPush', sa.Column('dependsOnResultPushId', sa.Integer(), nullable=True))
+    op.create_foreign_key('resultPush_dependsOnResultPushId_fk', 'resultPush', 'resultPush',
+                          ['dependsOnResultPushId'], ['resultPushId'])
+
+
+def downgrade():
+    op.drop_constraint('resultPush_dependsOnResultPushId_fk', 'resultPush', type_='foreignkey')
+    op.drop_column('resultPush', 'dependsOnResultPushId')
@@ -0,0 +1,70 @@
+"""empty message
+
+Revision ID: f5a29c3e8b17
+Revises: d41c7a9e5f28
+Create Date: 2020-03-06 16:08:24.650193
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f5a29c3e8b17'
+down_revision = 'd41c7a9e5f28'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+ballot_table = sa.table(
+    'ballot',
+    sa.column('stationaryItemId', sa.Integer),
+    sa.column('ballotId', sa.String),
+    sa.column('ballotSerial', sa.BigInteger)
+)
+
+
+def upgrade():
+    op.add_column('ballot', sa.Column('ballotSerial', sa.BigInteger(), server_default='0', nullable=False))
+
+    # The same as Ballot.get_ballot_serial at the time of this revision, kept here so that later changes to the model
+    # don't change the migration.
+    def _get_ballot_serial(ballot_id):
+        match = re.match(r"\s*(\d+)", ballot_id)
+        if match is None:
+            return 0
+
+        return int(match.group(1))
+
+    # Parsed here rather than cast in the database, since MySQL refuses to update with a truncated cast in the strict
+    # mode, e.g. for a ballot id with letters.
+    print(" -- Populating the serials of existing ballots.")
+    bind = op.get_bind()
+    ballots = bind.execute(sa.select([ballot_table.c.stationaryItemId, ballot_table.c.ballotId])).fetchall()
+    update = ballot_table.update().where(
+        ballot_table.c.stationaryItemId == sa.bindparam('_stationaryItemId')
+    ).values(ballotSerial=sa.bindparam('_ballotSerial'))
+    for batch_start in range(0, len(ballots), BATCH_SIZE):
+        bind.execute(update, [
+            {"_stationaryItemId": stationary_item_id, "_ballotSerial": _get_ballot_serial(ballot_id)}
+            for stationary_item_id, ballot_id in ballots[batch_start:batch_start + BATCH_SIZE]
+        ])
+
+    op.create_index('ix_ballot_electionId_ballotSerial', 'ballot', ['electionId', 'ballotSerial'], unique=False)
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    # MySQL might have dropped the index of the election foreign key in favour of the new index, and refuses to drop
+    # the new index unless another one serves the foreign key.
+    if bind.dialect.name == "mysql":
+        indexes = sa.inspect(bind).get_indexes('ballot')
+        if not any(index["name"] != 'ix_ballot_electionId_ballotSerial' and index["column_names"][0] == 'electionId'
+                   for index in indexes):
+            op.create_index('ballot_electionId_fk', 'ballot', ['electionId'], unique=False)
+
+    op.drop_index('ix_ballot_electionId_ballotSerial', table_name='ballot')
+    op.drop_column('ballot', 'ballotSerial')
@@ -0,0 +1,111 @@
+from app import db
+from constants.VOTE_TYPES import Postal, NonPostal, PostalAndNonPostal
+from orm.enums import AreaTypeEnum
+
+
+class AreaClosureModel(db.Model):
+    __tablename__ = 'area_closure'
+    ancestorId = db.Column(db.Integer, db.ForeignKey("area.areaId"), primary_key=True)
+    descendantId = db.Column(db.Integer, db.ForeignKey("area.areaId"), primary_key=True)
+    voteType = db.Column(db.String(100), primary_key=True)
+    depth = db.Column(db.Integer, nullable=False)
+    ancestorType = db.Column(db.Enum(AreaTypeEnum), nullable=False)
+    descendantType = db.Column(db.Enum(AreaTypeEnum), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_area_closure_descendantId_ancestorType', "descendantId", "ancestorType"),
+        db.Index('ix_area_closure_ancestorType_descendantId', "ancestorType", "descendantId")
+    )
+
+
+Model = AreaClosureModel
+
+
+def _get_path_vote_type(path_vote_type, area_vote_type):
+    if area_vote_type not in [Postal, NonPostal] or area_vote_type == path_vote_type:
+        return path_vote_type
+    elif path_vote_type is None:
+        return area_vote_type
+    else:
+        # A path can't cross both postal and non postal areas.
+        return False
+
+
+def get_closure_rows(areas, area_area_list):
+    """
+    Expands the area hierarchy into ancestor/descendant pairs, including a zero depth pair of each area to itself.
+
+    A pair is tagged with the vote type of the postal or non postal areas on the path between them, or
+    PostalAndNonPostal if there are none. A pair reachable through paths of different vote types has a row per vote
+    type.
+
+    :param areas: list of (areaId, areaType, voteType) tuples.
+    :param area_area_list: list of (parentAreaId, childAreaId) tuples.
+    :return: list of closure row dicts.
+    """
+    area_type_map = {}
+    area_vote_type_map = {}
+    for area_id, area_type, vote_type in areas:
+        area_type_map[area_id] = area_type
+        area_vote_type_map[area_id] = vote_type
+
+    children_map = {}
+    for parent_area_id, child_area_id in area_area_list:
+        if parent_area_id in area_type_map and child_area_id in area_type_map:
+            children_map.setdefault(parent_area_id, []).append(child_area_id)
+
+    closure_map = {}
+    for ancestor_id in area_type_map:
+        stack = [(ancestor_id, 0, _get_path_vote_type(None, area_vote_type_map[ancestor_id]))]
+        while len(stack) > 0:
+            descendant_id, depth, path_vote_type = stack.pop()
+            if path_vote_type is False:
+                continue
+
+            key = (ancestor_id, descendant_id, path_vote_type or PostalAndNonPostal)
+            if key in closure_map and closure_map[key] <= depth:
+                continue
+
+            closure_map[key] = depth
+
+            for child_area_id in children_map.get(descendant_id, []):
+                stack.append((child_area_id, depth + 1,
+                              _get_path_vote_type(path_vote_type, area_vote_type_map[child_area_id])))
+
+    return [
+        {
+            "ancestorId": ancestor_id,
+            "descendantId": descendant_id,
+            "voteType": vote_type,
+            "depth": depth,
+            "ancestorType": area_type_map[ancestor_id],
+            "descendantType": area_type_map[descendant_id]
+        } for (ancestor_id, descendant_id, vote_type), depth in closure_map.items()
+    ]
+
+
+def build(election):
+    from orm.entities import Area, Election
+    from orm.entities.Area import AreaIndex
+
+    election_ids = election.get_this_and_below_election_ids()
+
+    areas = db.session.query(
+        Area.Model.areaId, Area.Model.areaType, Election.Model.voteType
+    ).filter(
+        Election.Model.electionId == Area.Model.electionId,
+        Area.Model.electionId.in_(election_ids)
+    ).all()
+    area_ids = [area.areaId for area in areas]
+
+    area_area_list = db.session.query(
+        Area.AreaAreaModel.parentAreaId, Area.AreaAreaModel.childAreaId
+    ).filter(
+        Area.AreaAreaModel.parentAreaId.in_(area_ids)
+    ).all()
+
+    Model.query.filter(Model.ancestorId.in_(area_ids)).delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(Model, get_closure_rows(areas, area_area_list))
+    db.session.flush()
+
+    AreaIndex.invalidate(rootElectionId=election.rootElectionId)
@@ -0,0 +1,227 @@
+from collections import namedtuple
+from itertools import product
+
+from flask import g, has_app_context
+
+from app import db
+from constants.VOTE_TYPES import PostalAndNonPostal
+from orm.enums import AreaTypeEnum
+
+AREA_MAP_COLUMN_NAME_PREFIX_MAP = {
+    AreaTypeEnum.PollingStation: "pollingStation",
+    AreaTypeEnum.PollingDistrict: "pollingDistrict",
+    AreaTypeEnum.CountingCentre: "countingCentre",
+    AreaTypeEnum.PollingDivision: "pollingDivision",
+    AreaTypeEnum.ElectoralDistrict: "electoralDistrict",
+    AreaTypeEnum.Country: "country"
+}
+
+AreaMapRow = namedtuple("AreaMapRow", [
+    "pollingStationId", "pollingStationName",
+    "pollingDistrictId", "pollingDistrictName",
+    "countingCentreId", "countingCentreName",
+    "pollingDivisionId", "pollingDivisionName",
+    "electoralDistrictId", "electoralDistrictName",
+    "countryId", "countryName"
+])
+
+AREA_MAP_ROW_SORT_COLUMN_NAMES = [column_name for column_name in AreaMapRow._fields if column_name.endswith("Id")] + \
+                                 [column_name for column_name in AreaMapRow._fields if column_name.endswith("Name")]
+
+# Loaded per worker process and keyed by the root election id.
+_area_index_map = {}
+
+
+def _is_compatible_vote_type(vote_type, other_vote_type):
+    return vote_type == other_vote_type or PostalAndNonPostal in [vote_type, other_vote_type]
+
+
+class AreaIndex:
+    def __init__(self, rootElectionId, hierarchyVersion):
+        from orm.entities import Area, Election
+        from orm.entities.Area import AreaClosure
+
+        self.rootElectionId = rootElectionId
+        self.hierarchyVersion = hierarchyVersion
+
+        self.area_map = {}
+        self.area_type_area_ids = {}
+        self.parent_area_ids = {}
+        self.child_area_ids = {}
+        self.descendants = {}
+        self.ancestors = {}
+        self._registered_voters_count_map = {}
+
+        areas = db.session.query(
+            Area.Model.areaId, Area.Model.areaName, Area.Model.areaType, Area.Model.electionId,
+            Area.Model._registeredVotersCount, Area.Model._registeredPostalVotersCount
+        ).filter(
+            Election.Model.electionId == Area.Model.electionId,
+            Election.Model.rootElectionId == rootElectionId
+        ).all()
+        for area in areas:
+            self.area_map[area.areaId] = area
+            self.area_type_area_ids.setdefault(area.areaType, []).append(area.areaId)
+
+        area_area_list = db.session.query(
+            Area.AreaAreaModel.parentAreaId, Area.AreaAreaModel.childAreaId
+        ).filter(
+            Area.AreaAreaModel.parentAreaId == Area.Model.areaId,
+            Election.Model.electionId == Area.Model.electionId,
+            Election.Model.rootElectionId == rootElectionId
+        ).all()
+        for parent_area_id, child_area_id in area_area_list:
+            self.child_area_ids.setdefault(parent_area_id, []).append(child_area_id)
+            self.parent_area_ids.setdefault(child_area_id, []).append(parent_area_id)
+
+        area_closure_list = db.session.query(
+            AreaClosure.Model.ancestorId, AreaClosure.Model.descendantId, AreaClosure.Model.voteType
+        ).filter(
+            AreaClosure.Model.ancestorId == Area.Model.areaId,
+            Election.Model.electionId == Area.Model.electionId,
+            Election.Model.rootElectionId == rootElectionId
+        ).all()
+        for ancestor_id, descendant_id, vote_type in area_closure_list:
+            if ancestor_id not in self.area_map or descendant_id not in self.area_map:
+                continue
+
+            ancestor_type = self.area_map[ancestor_id].areaType
+            self.descendants.setdefault(ancestor_id, []).append((descendant_id, vote_type))
+            self.ancestors.setdefault(descendant_id, {}).setdefault(ancestor_type, []).append(
+                (ancestor_id, vote_type))
+
+    def get_associated_area_ids(self, area_ids, areaType, election_ids=None):
+        area_type_to_query_area_ids = {}
+        for area_id in area_ids:
+            area_type_to_query_area_ids.setdefault(self.area_map[area_id].areaType, []).append(area_id)
+
+        associated_area_ids = set()
+        if len(area_type_to_query_area_ids) == 0:
+            associated_area_ids.update(self.area_type_area_ids.get(areaType, []))
+        else:
+            # Vote types through which each descendant is reached from the given areas of each area type.
+            descendant_vote_types = {}
+            for area_type, query_area_ids in area_type_to_query_area_ids.items():
+                for area_id in query_area_ids:
+                    for descendant_id, vote_type in self.descendants.get(area_id, []):
+                        descendant_vote_types.setdefault(descendant_id, {}).setdefault(area_type, set()).add(
+                            vote_type)
+
+            for descendant_id, area_type_vote_types in descendant_vote_types.items():
+                if len(area_type_vote_types) != len(area_type_to_query_area_ids):
+                    continue
+
+                for ancestor_id, vote_type in self.ancestors.get(descendant_id, {}).get(areaType, []):
+                    if ancestor_id in associated_area_ids:
+                        continue
+
+                    if all(any(_is_compatible_vote_type(vote_type, other_vote_type) for other_vote_type in vote_types)
+                           for vote_types in area_type_vote_types.values()):
+                        associated_area_ids.add(ancestor_id)
+
+        if election_ids is not None:
+            associated_area_ids = {area_id for area_id in associated_area_ids if
+                                   self.area_map[area_id].electionId in election_ids}
+
+        return sorted(associated_area_ids)
+
+    def get_registered_voters_count(self, area_id):
+        if area_id not in self._registered_voters_count_map:
+            registered_voters_count = None
+            registered_postal_voters_count = None
+            for polling_station_id in self.get_associated_area_ids([area_id], AreaTypeEnum.PollingStation):
+                polling_station = self.area_map[polling_station_id]
+                if polling_station._registeredVotersCount is not None:
+                    registered_voters_count = (registered_voters_count or 0) + polling_station._registeredVotersCount
+                if polling_station._registeredPostalVotersCount is not None:
+                    registered_postal_voters_count = (registered_postal_voters_count or 0) + \
+                                                     polling_station._registeredPostalVotersCount
+
+            self._registered_voters_count_map[area_id] = (registered_voters_count, registered_postal_voters_count)
+
+        return self._registered_voters_count_map[area_id]
+
+    def get_area_map(self, area_id, group_by):
+        area_type = self.area_map[area_id].areaType
+
+        area_types = [_area_type for _area_type, column_name_prefix in AREA_MAP_COLUMN_NAME_PREFIX_MAP.items()
+                      if _area_type == area_type or "%sId" % column_name_prefix in group_by or
+                      "%sName" % column_name_prefix in group_by]
+
+        area_map = set()
+        leaf_area_ids = {descendant_id for descendant_id, vote_type in self.descendants.get(area_id, [])
+                         if descendant_id not in self.child_area_ids}
+        for leaf_area_id in leaf_area_ids:
+            leaf_area_ancestors = self.ancestors.get(leaf_area_id, {})
+
+            ancestor_ids_list = []
+            for _area_type in area_types:
+                if _area_type == area_type:
+                    ancestor_ids_list.append([area_id])
+                else:
+                    ancestor_ids = {ancestor_id for ancestor_id, vote_type in leaf_area_ancestors.get(_area_type, [])}
+                    ancestor_ids_list.append(ancestor_ids or [None])
+
+            for ancestor_ids in product(*ancestor_ids_list):
+                area_map_row = {column_name: None for column_name in AreaMapRow._fields}
+                for _area_type, ancestor_id in zip(area_types, ancestor_ids):
+                    column_name_prefix = AREA_MAP_COLUMN_NAME_PREFIX_MAP[_area_type]
+                    for column_name, value in [
+                        ("%sId" % column_name_prefix, ancestor_id),
+                        ("%sName" % column_name_prefix,
+                         self.area_map[ancestor_id].areaName if ancestor_id is not None else None)
+                    ]:
+                        if column_name in group_by:
+                            area_map_row[column_name] = value
+
+                area_map.add(AreaMapRow(**area_map_row))
+
+        # Sorted, so that the area map is in the same order in every process and the derived results are stable.
+        return sorted(area_map, key=_get_area_map_row_sort_key)
+
+
+def _get_area_map_row_sort_key(area_map_row):
+    # By the ids, then by the names for the rows grouped by the names only. The missing values are sorted first, and are
+    # never compared with the values, since the flags before them differ.
+    return tuple((getattr(area_map_row, column_name) is not None, getattr(area_map_row, column_name))
+                 for column_name in AREA_MAP_ROW_SORT_COLUMN_NAMES)
+
+
+def get_hierarchy_version(rootElectionId):
+    from orm.entities import Election
+
+    # The version is read once per request at most.
+    hierarchy_versions = g.setdefault("area_hierarchy_versions", {}) if has_app_context() else {}
+    if rootElectionId not in hierarchy_versions:
+        hierarchy_versions[rootElectionId] = db.session.query(Election.Model.hierarchyVersion).filter(
+            Election.Model.electionId == rootElectionId
+        ).scalar()
+
+    return hierarchy_versions[rootElectionId]
+
+
+def get(rootElectionId):
+    hierarchy_version = get_hierarchy_version(rootElectionId)
+
+    area_index = _area_index_map.get(rootElectionId)
+    if area_index is None or area_index.hierarchyVersion != hierarchy_version:
+        area_index = AreaIndex(rootElectionId=rootElectionId, hierarchyVersion=hierarchy_version)
+        _area_index_map[rootElectionId] = area_index
+
+    return area_index
+
+
+def get_by_area(area):
+    return get(rootElectionId=area.election.rootElectionId)
+
+
+def invalidate(rootElectionId):
+    from orm.entities import Election
+
+    Election.Model.query.filter(Election.Model.electionId == rootElectionId).update(
+        {Election.Model.hierarchyVersion: Election.Model.hierarchyVersion + 1}, synchronize_session=False
+    )
+
+    _area_index_map.pop(rootElectionId, None)
+    if has_app_context():
+        g.setdefault("area_hierarchy_versions", {}).pop(rootElectionId, None)
@@ -1,8 +1,10 @@
 from app import db
-from sqlalchemy.orm import relationship
-from sqlalchemy import func
+from util import unit_of_work
+from sqlalchemy.orm import relationship, aliased
+from sqlalchemy import func, or_
 
-from orm.entities.Area import AreaMap
+from constants.VOTE_TYPES import PostalAndNonPostal
+from orm.entities.Area import AreaMap, AreaClosure, AreaIndex
 from orm.enums import AreaTypeEnum
 from orm.entities import Election
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -19,6 +21,10 @@ class AreaModel(db.Model):
     _registeredVotersCount = db.Column(db.Integer(), nullable=True)
     _registeredPostalVotersCount = db.Column(db.Integer(), nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_area_electionId_areaType', "electionId", "areaType"),
+    )
+
     election = relationship(Election.Model, foreign_keys=[electionId])
     # parentArea = relationship("AreaModel", remote_side=[areaId])
     # childAreas = relationship("AreaModel", foreign_keys=[parentAreaId])
@@ -35,8 +41,7 @@ class AreaModel(db.Model):
             areaName=areaName,
             electionId=electionId
         )
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def add_parent(self, parentId):
         parentArea = get_by_id(areaId=parentId)
@@ -52,8 +57,7 @@ class AreaModel(db.Model):
 
         if existing_mapping is None:
             areaParent = AreaAreaModel(parentAreaId=self.areaId, childAreaId=childId)
-            db.session.add(areaParent)
-            db.session.flush()
+            unit_of_work.add(areaParent)
 
         return self
 
@@ -61,7 +65,7 @@ class AreaModel(db.Model):
         return get_associated_areas_query(areas=[self], areaType=areaType, electionId=electionId)
 
     def get_associated_areas(self, areaType, electionId=None):
-        return self.get_associated_areas_query(areaType, electionId).all()
+        return get_associated_areas(area=self, areaType=areaType, electionId=electionId)
 
     def get_submissions(self, submissionType):
         return [submission for submission in self.submissions if submission.submissionType is submissionType]
@@ -74,25 +78,17 @@ class AreaModel(db.Model):
 
     @hybrid_property
     def registeredVotersCount(self):
-        polling_stations_subquery = get_associated_areas_query(areas=[self],
-                                                               areaType=AreaTypeEnum.PollingStation).subquery()
+        registered_voters_count, registered_postal_voters_count = AreaIndex.get_by_area(
+            area=self).get_registered_voters_count(self.areaId)
 
-        total_registered_voters_count = db.session.query(
-            func.sum(polling_stations_subquery.c._registeredVotersCount)
-        ).scalar()
-
-        return total_registered_voters_count
+        return registered_voters_count
 
     @hybrid_property
     def registeredPostalVotersCount(self):
-        polling_stations_subquery = get_associated_areas_query(areas=[self],
-                                                               areaType=AreaTypeEnum.PollingStation).subquery()
-
-        total_registered_postal_voters_count = db.session.query(
-            func.sum(polling_stations_subquery.c._registeredPostalVotersCount)
-        ).scalar()
+        registered_voters_count, registered_postal_voters_count = AreaIndex.get_by_area(
+            area=self).get_registered_voters_count(self.areaId)
 
-        return total_registered_postal_voters_count
+        return registered_postal_voters_count
 
     __mapper_args__ = {
         'polymorphic_on': areaType
@@ -108,29 +104,10 @@ class AreaAreaModel(db.Model):
 Model = AreaModel
 
 
-def get_presidential_area_map_query():
-    return db.session.query(
-        AreaMap.Model
-    )
-
-
 def get_associated_areas_query(areas, areaType, electionId=None):
-    presidential_area_map_sub_query = get_presidential_area_map_query().subquery()
-
-    area_types = [AreaTypeEnum.Country, AreaTypeEnum.ElectoralDistrict, AreaTypeEnum.PollingDivision,
-                  AreaTypeEnum.PollingDistrict, AreaTypeEnum.PollingStation, AreaTypeEnum.CountingCentre,
-                  AreaTypeEnum.DistrictCentre, AreaTypeEnum.ElectionCommission]
-
-    area_type_to_column_map = {
-        AreaTypeEnum.Country: presidential_area_map_sub_query.c.countryId,
-        AreaTypeEnum.ElectoralDistrict: presidential_area_map_sub_query.c.electoralDistrictId,
-        AreaTypeEnum.PollingDivision: presidential_area_map_sub_query.c.pollingDivisionId,
-        AreaTypeEnum.PollingDistrict: presidential_area_map_sub_query.c.pollingDistrictId,
-        AreaTypeEnum.PollingStation: presidential_area_map_sub_query.c.pollingStationId,
-        AreaTypeEnum.CountingCentre: presidential_area_map_sub_query.c.countingCentreId,
-        AreaTypeEnum.DistrictCentre: presidential_area_map_sub_query.c.districtCentreId,
-        AreaTypeEnum.ElectionCommission: presidential_area_map_sub_query.c.electionCommissionId
-    }
+    # Two areas are associated when they share a common descendant (or one is the other's ancestor) through paths
+    # with compatible vote types.
+    associated_area_closure = aliased(AreaClosure.Model)
 
     area_type_to_query_area_ids = {}
 
@@ -142,24 +119,49 @@ def get_associated_areas_query(areas, areaType, electionId=None):
 
     query_args = [AreaModel]
     query_filters = [
-        area_type_to_column_map[areaType] == AreaModel.areaId
+        associated_area_closure.ancestorId == AreaModel.areaId,
+        associated_area_closure.ancestorType == areaType
     ]
     query_group_by = [AreaModel.areaId]
 
+    if electionId is not None:
+        query_filters.append(or_(
+            AreaModel.electionId.in_(Election.get_this_and_above_election_ids_query(electionId=electionId)),
+            AreaModel.electionId.in_(Election.get_this_and_below_election_ids_query(electionId=electionId))
+        ))
+
+    for area_type in area_type_to_query_area_ids:
+        area_closure = aliased(AreaClosure.Model)
+        query_filters += [
+            area_closure.descendantId == associated_area_closure.descendantId,
+            area_closure.ancestorType == area_type,
+            area_closure.ancestorId.in_(area_type_to_query_area_ids[area_type]),
+            or_(
+                area_closure.voteType == associated_area_closure.voteType,
+                area_closure.voteType == PostalAndNonPostal,
+                associated_area_closure.voteType == PostalAndNonPostal
+            )
+        ]
+
+    return db.session.query(*query_args).filter(*query_filters).group_by(*query_group_by)
+
+
+def get_associated_area_ids(area, areaType, electionId=None):
+    election_ids = None
     if electionId is not None:
         election = db.session.query(Election.Model).filter(Election.Model.electionId == electionId).one_or_none()
         election_ids = election.get_this_and_above_election_ids() + election.get_this_and_below_election_ids()
-        query_filters.append(AreaModel.electionId.in_(election_ids))
-
-    for area_type in area_types:
-        if area_type in area_type_to_query_area_ids:
-            query_filters.append(area_type_to_column_map[area_type].in_(area_type_to_query_area_ids[area_type]))
 
-    return db.session.query(*query_args).filter(*query_filters).group_by(*query_group_by)
+    return AreaIndex.get_by_area(area=area).get_associated_area_ids(
+        area_ids=[area.areaId], areaType=areaType, election_ids=election_ids)
 
 
 def get_associated_areas(area, areaType, electionId=None):
-    result = get_associated_areas_query(areas=[area], areaType=areaType, electionId=electionId).all()
+    associated_area_ids = get_associated_area_ids(area=area, areaType=areaType, electionId=electionId)
+    if len(associated_area_ids) == 0:
+        return []
+
+    result = Model.query.filter(Model.areaId.in_(associated_area_ids)).order_by(Model.areaId).all()
 
     return result
 
@@ -187,7 +189,9 @@ def get_all(election_id=None, area_name=None, associated_area_id=None, area_type
 
     if associated_area_id is not None and area_type is not None:
         associated_area = get_by_id(areaId=associated_area_id)
-        query = get_associated_areas_query(areas=[associated_area], areaType=area_type, electionId=election_id)
+        associated_area_ids = get_associated_area_ids(area=associated_area, areaType=area_type,
+                                                      electionId=election_id)
+        query = Model.query.filter(Model.areaId.in_(associated_area_ids))
     else:
         query = Model.query
 
@@ -1,4 +1,5 @@
 from app import db
+from util.id_allocation import take_id
 
 BARCODE_LENGTH = 13
 
@@ -20,11 +21,12 @@ def _get_barcode_string(num):
 
 
 def create():
-    barcode = BarcodeModel()
+    # The id is taken up front, so that the barcode string is inserted along with it.
+    barcode_id = take_id(BarcodeModel)
+    barcode = BarcodeModel(
+        barcodeId=barcode_id,
+        barcodeString=_get_barcode_string(barcode_id)
+    )
     db.session.add(barcode)
-    db.session.flush()
-
-    barcode.barcodeString = _get_barcode_string(barcode.barcodeId)
-    db.session.flush()
 
     return barcode
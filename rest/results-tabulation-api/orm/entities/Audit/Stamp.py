@@ -6,6 +6,7 @@ from sqlalchemy.orm import relationship
 from app import db
 from auth import get_user_name, get_ip
 from orm.entities.Audit import Barcode
+from util.id_allocation import take_id
 
 
 class Stamp(db.Model):
@@ -27,10 +28,14 @@ Model = Stamp
 def create():
     barcode = Barcode.create()
     result = Stamp(
+        stampId=take_id(Stamp),
+        ip=get_ip(),
+        createdBy=get_user_name(),
+        createdAt=datetime.now(),
         barcodeId=barcode.barcodeId
     )
 
+    # Not flushed, so that the stamps and barcodes of a request are inserted together with the rows referring them.
     db.session.add(result)
-    db.session.flush()
 
     return result
@@ -1,11 +1,18 @@
+import re
+
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy import and_, cast, Integer
+from sqlalchemy import and_
 
+from exception import BadRequestException
+from exception.messages import MESSAGE_CODE_BALLOT_AMBIGUOUS_SERIAL
 from orm.entities.Invoice import InvoiceStationaryItem
 from app import db
 from sqlalchemy.orm import relationship
 from orm.enums import StationaryItemTypeEnum, BallotTypeEnum
 from orm.entities import StationaryItem, Election, Invoice
+from util.id_allocation import allocate_ids
+
+BALLOT_BATCH_SIZE = 1000
 
 
 class BallotModel(db.Model):
@@ -15,15 +22,28 @@ class BallotModel(db.Model):
     ballotId = db.Column(db.String(20), nullable=False, primary_key=True)
     electionId = db.Column(db.Integer, db.ForeignKey(Election.Model.__table__.c.electionId), nullable=False)
     ballotType = db.Column(db.Enum(BallotTypeEnum), nullable=False, default=BallotTypeEnum.Ordinary)
+    # Numeric value of the ballot id, so that the ranges of ballots are looked up through an index.
+    ballotSerial = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
 
     stationaryItem = relationship(StationaryItem.Model, foreign_keys=[stationaryItemId])
     election = relationship(Election.Model, foreign_keys=[electionId])
 
     __table_args__ = (
         db.UniqueConstraint('ballotId', 'electionId', name='BallotPerElection'),
+        db.Index('ix_ballot_electionId_ballotSerial', "electionId", "ballotSerial")
     )
 
     def __init__(self, ballotId, electionId, ballotType=BallotTypeEnum.Ordinary):
+        # The ballot books refer their ballots by the serial, hence no two ballots of an election can share one.
+        ambiguous_ballot = get_by_ballot_serial(electionId=electionId, ballotSerial=get_ballot_serial(ballotId)) \
+            if has_ballot_serial(ballotId) else None
+        if ambiguous_ballot is not None:
+            raise BadRequestException(
+                message="Ballot has the same serial as another ballot of the election (ballotId=%s, %s)" % (
+                    ballotId, ambiguous_ballot.ballotId),
+                code=MESSAGE_CODE_BALLOT_AMBIGUOUS_SERIAL
+            )
+
         stationary_item = StationaryItem.create(
             electionId=electionId,
             stationaryItemType=StationaryItemTypeEnum.Ballot
@@ -31,6 +51,7 @@ class BallotModel(db.Model):
 
         super(BallotModel, self).__init__(
             ballotId=ballotId,
+            ballotSerial=get_ballot_serial(ballotId),
             electionId=electionId,
             stationaryItemId=stationary_item.stationaryItemId,
             ballotType=ballotType
@@ -58,6 +79,45 @@ class BallotModel(db.Model):
 Model = BallotModel
 
 
+def get_ballot_serial(ballotId):
+    """
+    Numeric value of the leading digits of the ballot id, 0 if there's none, the same as casting it to an integer.
+    """
+    match = re.match(r"\s*(\d+)", ballotId)
+    if match is None:
+        return 0
+
+    return int(match.group(1))
+
+
+def has_ballot_serial(ballotId):
+    return re.match(r"\s*\d", ballotId) is not None
+
+
+def get_by_ballot_serial(electionId, ballotSerial):
+    """
+    The ballot of the election with the serial, among the ballots whose ids start with digits.
+
+    :return: None if there's none. BadRequestException is raised if there are many, such as "01" and "1" created
+    before the serials were checked.
+    """
+    ballots = [ballot for ballot in Model.query.filter(
+        Model.electionId == electionId,
+        Model.ballotSerial == ballotSerial
+    ).order_by(
+        Model.ballotId
+    ).all() if has_ballot_serial(ballot.ballotId)]
+
+    if len(ballots) > 1:
+        raise BadRequestException(
+            message="Ballot serial is shared by many ballots of the election (ballotSerial=%d, ballotIds=%s)" % (
+                ballotSerial, ", ".join([ballot.ballotId for ballot in ballots])),
+            code=MESSAGE_CODE_BALLOT_AMBIGUOUS_SERIAL
+        )
+
+    return ballots[0] if len(ballots) > 0 else None
+
+
 def get_by_id(stationaryItemId):
     result = Model.query.filter(
         Model.stationaryItemId == stationaryItemId
@@ -88,7 +148,7 @@ def get_all(ballotId=None, stationaryItemId=None, electionId=None, ballotType=No
             Model.electionId == electionId
         )
 
-    query = query.order_by(cast(Model.ballotId, Integer))
+    query = query.order_by(Model.ballotSerial, Model.ballotId)
 
     return query
 
@@ -104,3 +164,41 @@ def create(ballotId, electionId, ballotType=None):
     db.session.flush()
 
     return result
+
+
+def create_range(electionId, fromBallotId, toBallotId, ballotType=BallotTypeEnum.Ordinary):
+    """
+    Creates the ballots of the range which are not created yet, with bulk inserts. The ids of the new ballots are
+    padded with zeros to the length of the first ballot id.
+    """
+    from_ballot_serial = get_ballot_serial(fromBallotId)
+    to_ballot_serial = get_ballot_serial(toBallotId)
+
+    existing_ballot_serials = {ballot_serial for ballot_serial, ballot_id in db.session.query(
+        Model.ballotSerial, Model.ballotId
+    ).filter(
+        Model.electionId == electionId,
+        Model.ballotSerial.between(from_ballot_serial, to_ballot_serial)
+    ).all() if has_ballot_serial(ballot_id)}
+
+    ballot_serials = [ballot_serial for ballot_serial in range(from_ballot_serial, to_ballot_serial + 1)
+                      if ballot_serial not in existing_ballot_serials]
+
+    for batch_start in range(0, len(ballot_serials), BALLOT_BATCH_SIZE):
+        batch_ballot_serials = ballot_serials[batch_start:batch_start + BALLOT_BATCH_SIZE]
+        stationary_item_ids = allocate_ids(StationaryItem.Model, len(batch_ballot_serials))
+
+        db.session.bulk_insert_mappings(StationaryItem.Model, [{
+            "stationaryItemId": stationary_item_id,
+            "stationaryItemType": StationaryItemTypeEnum.Ballot,
+            "electionId": electionId
+        } for stationary_item_id in stationary_item_ids])
+        db.session.bulk_insert_mappings(Model, [{
+            "stationaryItemId": stationary_item_id,
+            "ballotId": str(ballot_serial).zfill(len(fromBallotId)),
+            "ballotSerial": ballot_serial,
+            "electionId": electionId,
+            "ballotType": ballotType
+        } for stationary_item_id, ballot_serial in zip(stationary_item_ids, batch_ballot_serials)])
+
+    return len(ballot_serials)
@@ -1,15 +1,19 @@
+from flask import current_app
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy import and_, Integer
-from sqlalchemy.sql.expression import cast
+from sqlalchemy import or_
 
-from exception import NotFoundException
+from exception import BadRequestException
+from exception.messages import MESSAGE_CODE_BALLOT_BOOK_INVALID_RANGE
 from orm.entities.Invoice import InvoiceStationaryItem
 from app import db
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, aliased
 from sqlalchemy.ext.associationproxy import association_proxy
 from orm.enums import StationaryItemTypeEnum
 from orm.entities import StationaryItem, Ballot, Invoice
 
+# The missing ballots of a book are registered along with it, hence the books are limited in size.
+DEFAULT_BALLOT_BOOK_MAX_SIZE = 1000
+
 
 class BallotBookModel(db.Model):
     __tablename__ = 'ballotBook'
@@ -28,55 +32,43 @@ class BallotBookModel(db.Model):
     election = association_proxy("stationaryItem", "election")
     fromBallotId = association_proxy("fromBallot", "ballotId")
     toBallotId = association_proxy("toBallot", "ballotId")
+    fromBallotSerial = association_proxy("fromBallot", "ballotSerial")
+    toBallotSerial = association_proxy("toBallot", "ballotSerial")
 
     @hybrid_property
     def ballots(self):
         return Ballot.Model.query.filter(
-            and_(
-                cast(Ballot.Model.ballotId, Integer) >= cast(self.fromBallotId, Integer),
-                cast(Ballot.Model.ballotId, Integer) <= cast(self.toBallotId, Integer)
-            )
-        ).filter(
-            Ballot.Model.electionId == self.electionId
+            Ballot.Model.electionId == self.electionId,
+            Ballot.Model.ballotSerial.between(self.fromBallotSerial, self.toBallotSerial)
+        ).order_by(
+            Ballot.Model.ballotSerial, Ballot.Model.ballotId
         ).all()
 
     @hybrid_property
     def available(self):
-        locked_invoices = db.session.query(
-            Invoice.Model.invoiceId
-        ).join(
-            InvoiceStationaryItem.Model,
-            and_(
-                InvoiceStationaryItem.Model.invoiceId == Invoice.Model.invoiceId
-            )
-        ).join(
-            Ballot.Model,
-            and_(
-                Ballot.Model.stationaryItemId == InvoiceStationaryItem.Model.stationaryItemId,
-                cast(Ballot.Model.ballotId, Integer) >= cast(self.fromBallotId, Integer),
-                cast(Ballot.Model.ballotId, Integer) <= cast(self.toBallotId, Integer)
-            )
-        ).filter(
-            Invoice.Model.delete == False
-        ).group_by(
-            Invoice.Model.invoiceId
-        ).all()
-
-        return len(locked_invoices) == 0
+        return not is_invoiced(electionId=self.electionId, fromBallotSerial=self.fromBallotSerial,
+                               toBallotSerial=self.toBallotSerial)
 
     def __init__(self, electionId, fromBallotId, toBallotId):
-        fromBallot = Ballot.get_all(ballotId=fromBallotId, electionId=electionId)
-        toBallot = Ballot.get_all(ballotId=toBallotId, electionId=electionId)
+        if not fromBallotId.isdigit() or not toBallotId.isdigit() or int(fromBallotId) > int(toBallotId):
+            raise BadRequestException(
+                message="Invalid ballot range (fromBallotId=%s, toBallotId=%s)" % (fromBallotId, toBallotId),
+                code=MESSAGE_CODE_BALLOT_BOOK_INVALID_RANGE
+            )
 
-        if len(fromBallot) is 0:
-            raise NotFoundException("Ballot not found (ballotId=%s)" % fromBallotId)
-        else:
-            fromBallot = fromBallot[0]
+        ballot_book_max_size = current_app.config.get("BALLOT_BOOK_MAX_SIZE", DEFAULT_BALLOT_BOOK_MAX_SIZE)
+        if int(toBallotId) - int(fromBallotId) + 1 > ballot_book_max_size:
+            raise BadRequestException(
+                message="Ballot range is larger than a ballot book of %d ballots (fromBallotId=%s, toBallotId=%s)" % (
+                    ballot_book_max_size, fromBallotId, toBallotId),
+                code=MESSAGE_CODE_BALLOT_BOOK_INVALID_RANGE
+            )
 
-        if len(toBallot) is 0:
-            raise NotFoundException("Ballot not found (ballotId=%s)" % toBallotId)
-        else:
-            toBallot = toBallot[0]
+        Ballot.create_range(electionId=electionId, fromBallotId=fromBallotId, toBallotId=toBallotId)
+
+        fromBallot = Ballot.get_by_ballot_serial(electionId=electionId,
+                                                 ballotSerial=Ballot.get_ballot_serial(fromBallotId))
+        toBallot = Ballot.get_by_ballot_serial(electionId=electionId, ballotSerial=Ballot.get_ballot_serial(toBallotId))
 
         stationary_item = StationaryItem.create(
             electionId=electionId,
@@ -96,6 +88,52 @@ class BallotBookModel(db.Model):
 Model = BallotBookModel
 
 
+def is_invoiced(electionId, fromBallotSerial, toBallotSerial):
+    """
+    Whether any ballot of the range is on an invoice which is not deleted, either by itself or in a ballot book whose
+    range overlaps the given range. Both are looked up by the ballot serials, through the index of the election and
+    the serial.
+    """
+    invoiced_ballots = db.session.query(
+        Ballot.Model.stationaryItemId
+    ).join(
+        InvoiceStationaryItem.Model,
+        InvoiceStationaryItem.Model.stationaryItemId == Ballot.Model.stationaryItemId
+    ).join(
+        Invoice.Model,
+        Invoice.Model.invoiceId == InvoiceStationaryItem.Model.invoiceId
+    ).filter(
+        Ballot.Model.electionId == electionId,
+        Ballot.Model.ballotSerial.between(fromBallotSerial, toBallotSerial),
+        Invoice.Model.delete == False
+    )
+
+    from_ballot = aliased(Ballot.Model)
+    to_ballot = aliased(Ballot.Model)
+    invoiced_ballot_books = db.session.query(
+        Model.stationaryItemId
+    ).join(
+        InvoiceStationaryItem.Model,
+        InvoiceStationaryItem.Model.stationaryItemId == Model.stationaryItemId
+    ).join(
+        Invoice.Model,
+        Invoice.Model.invoiceId == InvoiceStationaryItem.Model.invoiceId
+    ).join(
+        from_ballot,
+        from_ballot.stationaryItemId == Model.fromBallotStationaryItemId
+    ).join(
+        to_ballot,
+        to_ballot.stationaryItemId == Model.toBallotStationaryItemId
+    ).filter(
+        from_ballot.electionId == electionId,
+        from_ballot.ballotSerial <= toBallotSerial,
+        to_ballot.ballotSerial >= fromBallotSerial,
+        Invoice.Model.delete == False
+    )
+
+    return db.session.query(or_(invoiced_ballots.exists(), invoiced_ballot_books.exists())).scalar()
+
+
 def get_by_id(stationaryItemId):
     result = Model.query.filter(
         Model.stationaryItemId == stationaryItemId
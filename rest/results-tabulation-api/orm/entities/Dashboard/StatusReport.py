@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from app import db
+from util import unit_of_work
 from orm.entities import Election
 
 
@@ -25,12 +26,11 @@ class StatusReportModel(db.Model):
             createdAt=datetime.now()
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def update_status(self, status):
         self.status = status
-        db.session.flush()
+        unit_of_work.flush()
 
 
 Model = StatusReportModel
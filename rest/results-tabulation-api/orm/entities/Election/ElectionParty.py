@@ -4,7 +4,7 @@ from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
 from sqlalchemy.orm import relationship
 from orm.entities import Party
-from orm.entities.Election import ElectionCandidate
+from orm.entities.Election import ElectionCandidate, ElectionSnapshot
 
 
 class ElectionPartyModel(db.Model):
@@ -45,11 +45,14 @@ class ElectionPartyModel(db.Model):
         db.session.flush()
 
     def add_candidate(self, candidateId):
-        return ElectionCandidate.create(
+        election_candidate = ElectionCandidate.create(
             electionId=self.electionId,
             partyId=self.partyId,
             candidateId=candidateId
         )
+        ElectionSnapshot.invalidate(rootElectionId=self.election.rootElectionId)
+
+        return election_candidate
 
 
 Model = ElectionPartyModel
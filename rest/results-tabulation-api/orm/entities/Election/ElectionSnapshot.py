@@ -0,0 +1,303 @@
+from collections import namedtuple
+
+from flask import g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+
+# Loaded per worker process and keyed by the root election id.
+_election_snapshot_map = {}
+
+# The snapshots of the elections invalidated in the transaction of a session are kept in the session under this key, and
+# shared with the other requests only once committed.
+UNCOMMITTED_ELECTION_SNAPSHOT_MAP_KEY = "uncommitted_election_snapshot_map"
+
+_is_listening = False
+
+CandidateSnapshot = namedtuple("CandidateSnapshot", [
+    "candidateId", "candidateName", "partyId", "electionId", "qualifiedForPreferences"
+])
+
+PartySnapshot = namedtuple("PartySnapshot", [
+    "partyId", "partyName", "partySymbol", "partySymbolFileId", "partySymbolFile", "partyAbbreviation", "electionId",
+    "candidates"
+])
+
+InvalidVoteCategorySnapshot = namedtuple("InvalidVoteCategorySnapshot", [
+    "invalidVoteCategoryId", "categoryDescription", "electionId"
+])
+
+
+class FileSnapshot(namedtuple("FileSnapshot", [
+    "fileId", "fileName", "fileMimeType", "fileContentLength", "fileCreatedBy", "fileCreatedAt"
+])):
+    # The urls are built for the host of each request, hence not kept in the snapshot.
+
+    @property
+    def urlInline(self):
+        return "%sfile/%d/inline" % (request.host_url, self.fileId)
+
+    @property
+    def urlDownload(self):
+        return "%sfile/%d/download" % (request.host_url, self.fileId)
+
+
+class ElectionSnapshotNode:
+    """
+    Read only copy of an election, with the same attributes ElectionSchema dumps from an election.
+    """
+
+    def __init__(self, election):
+        self.electionId = election.electionId
+        self.electionName = election.electionName
+        self.electionTemplateName = election.electionTemplateName
+        self.voteType = election.voteType
+        self.isListed = election.isListed
+        self.rootElectionId = election.rootElectionId
+        self.parentElectionId = election.parentElectionId
+
+        # Linked once all the elections of the snapshot are loaded.
+        self.rootElection = None
+        self.parentElection = None
+        self.subElections = ()
+        self.parties = ()
+        self.invalidVoteCategories = ()
+        self.officialName = None
+
+        self._frozen = False
+
+    def __setattr__(self, key, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Election snapshot is read only (electionId=%d)" % self.electionId)
+
+        super(ElectionSnapshotNode, self).__setattr__(key, value)
+
+    def get_official_name(self):
+        return self.officialName
+
+
+class ElectionSnapshot:
+    def __init__(self, rootElectionId, metadataVersion):
+        from orm.entities import Election, Party, Candidate
+        from orm.entities.Audit import Stamp
+        from orm.entities.Election import ElectionParty, ElectionCandidate, InvalidVoteCategory
+        from orm.entities.IO import File
+
+        self.rootElectionId = rootElectionId
+        self.metadataVersion = metadataVersion
+
+        self.elections = {}
+        self._this_and_above_election_ids = {}
+        self._this_and_below_election_ids = {}
+
+        elections = db.session.query(
+            Election.Model.electionId, Election.Model.electionName, Election.Model.electionTemplateName,
+            Election.Model.voteType, Election.Model.isListed, Election.Model.rootElectionId,
+            Election.Model.parentElectionId
+        ).filter(
+            Election.Model.rootElectionId == rootElectionId
+        ).order_by(
+            Election.Model.electionId
+        ).all()
+        for election in elections:
+            self.elections[election.electionId] = ElectionSnapshotNode(election)
+
+        candidates = db.session.query(
+            ElectionCandidate.Model.candidateId, Candidate.Model.candidateName, ElectionCandidate.Model.partyId,
+            ElectionCandidate.Model.electionId, ElectionCandidate.Model.qualifiedForPreferences
+        ).filter(
+            Candidate.Model.candidateId == ElectionCandidate.Model.candidateId,
+            Election.Model.electionId == ElectionCandidate.Model.electionId,
+            Election.Model.rootElectionId == rootElectionId
+        ).order_by(
+            ElectionCandidate.Model.electionCandidateId
+        ).all()
+        party_candidates = {}
+        for candidate in candidates:
+            party_candidates.setdefault((candidate.electionId, candidate.partyId), []).append(
+                CandidateSnapshot(*candidate))
+
+        parties = db.session.query(
+            ElectionParty.Model.electionId, Party.Model.partyId, Party.Model.partyName, Party.Model.partySymbol,
+            Party.Model.partySymbolFileId, Party.Model.partyAbbreviation
+        ).filter(
+            Party.Model.partyId == ElectionParty.Model.partyId,
+            Election.Model.electionId == ElectionParty.Model.electionId,
+            Election.Model.rootElectionId == rootElectionId
+        ).order_by(
+            ElectionParty.Model.electionPartyId
+        ).all()
+
+        party_symbol_file_map = {}
+        party_symbol_file_ids = {party.partySymbolFileId for party in parties if party.partySymbolFileId is not None}
+        if len(party_symbol_file_ids) > 0:
+            party_symbol_files = db.session.query(
+                File.Model.fileId, File.Model.fileName, File.Model.fileMimeType, File.Model.fileContentLength,
+                Stamp.Model.createdBy, Stamp.Model.createdAt
+            ).filter(
+                Stamp.Model.stampId == File.Model.fileStampId,
+                File.Model.fileId.in_(party_symbol_file_ids)
+            ).all()
+            for party_symbol_file in party_symbol_files:
+                party_symbol_file_map[party_symbol_file.fileId] = FileSnapshot(*party_symbol_file)
+
+        election_parties = {}
+        for party in parties:
+            election_parties.setdefault(party.electionId, []).append(PartySnapshot(
+                partyId=party.partyId,
+                partyName=party.partyName,
+                partySymbol=party.partySymbol,
+                partySymbolFileId=party.partySymbolFileId,
+                partySymbolFile=party_symbol_file_map.get(party.partySymbolFileId),
+                partyAbbreviation=party.partyAbbreviation,
+                electionId=party.electionId,
+                candidates=tuple(party_candidates.get((party.electionId, party.partyId), []))
+            ))
+
+        invalid_vote_categories = db.session.query(
+            InvalidVoteCategory.Model.invalidVoteCategoryId, InvalidVoteCategory.Model.categoryDescription,
+            InvalidVoteCategory.Model.electionId
+        ).filter(
+            Election.Model.electionId == InvalidVoteCategory.Model.electionId,
+            Election.Model.rootElectionId == rootElectionId
+        ).order_by(
+            InvalidVoteCategory.Model.invalidVoteCategoryId
+        ).all()
+        election_invalid_vote_categories = {}
+        for invalid_vote_category in invalid_vote_categories:
+            election_invalid_vote_categories.setdefault(invalid_vote_category.electionId, []).append(
+                InvalidVoteCategorySnapshot(*invalid_vote_category))
+
+        sub_elections = {}
+        for election in self.elections.values():
+            if election.parentElectionId is not None:
+                sub_elections.setdefault(election.parentElectionId, []).append(election)
+
+        for election in self.elections.values():
+            election.rootElection = self.elections.get(election.rootElectionId)
+            election.parentElection = self.elections.get(election.parentElectionId)
+            election.subElections = tuple(sub_elections.get(election.electionId, []))
+            election.parties = tuple(election_parties.get(election.electionId, []))
+
+        for election in self.elections.values():
+            # The official name and the invalid vote categories are those of the topmost election.
+            this_and_above_elections = [election]
+            while this_and_above_elections[-1].parentElection is not None:
+                this_and_above_elections.append(this_and_above_elections[-1].parentElection)
+
+            topmost_election = this_and_above_elections[-1]
+            election.officialName = topmost_election.electionName
+            election.invalidVoteCategories = tuple(
+                election_invalid_vote_categories.get(topmost_election.electionId, []))
+
+            self._this_and_above_election_ids[election.electionId] = tuple(
+                [_election.electionId for _election in this_and_above_elections])
+
+        for election in self.elections.values():
+            self._this_and_below_election_ids[election.electionId] = tuple(self._get_this_and_below_election_ids(
+                election))
+
+            election._frozen = True
+
+    def _get_this_and_below_election_ids(self, election):
+        this_and_below_election_ids = [election.electionId]
+        for sub_election in election.subElections:
+            this_and_below_election_ids += self._get_this_and_below_election_ids(sub_election)
+
+        return this_and_below_election_ids
+
+    def get_election(self, electionId):
+        return self.elections.get(electionId)
+
+    def get_this_and_above_election_ids(self, electionId):
+        return list(self._this_and_above_election_ids.get(electionId, ()))
+
+    def get_this_and_below_election_ids(self, electionId):
+        return list(self._this_and_below_election_ids.get(electionId, ()))
+
+
+def _get_metadata_version(rootElectionId):
+    from orm.entities import Election
+
+    # The version is read once per request at most.
+    metadata_versions = g.setdefault("election_metadata_versions", {}) if has_app_context() else {}
+    if rootElectionId not in metadata_versions:
+        metadata_versions[rootElectionId] = db.session.query(Election.Model.metadataVersion).filter(
+            Election.Model.electionId == rootElectionId
+        ).scalar()
+
+    return metadata_versions[rootElectionId]
+
+
+def get(rootElectionId):
+    metadata_version = _get_metadata_version(rootElectionId)
+
+    uncommitted_election_snapshot_map = db.session.info.get(UNCOMMITTED_ELECTION_SNAPSHOT_MAP_KEY, {})
+    if rootElectionId in uncommitted_election_snapshot_map:
+        election_snapshot_map = uncommitted_election_snapshot_map
+    else:
+        election_snapshot_map = _election_snapshot_map
+
+    election_snapshot = election_snapshot_map.get(rootElectionId)
+    if election_snapshot is None or election_snapshot.metadataVersion != metadata_version:
+        election_snapshot = ElectionSnapshot(rootElectionId=rootElectionId, metadataVersion=metadata_version)
+        election_snapshot_map[rootElectionId] = election_snapshot
+
+    return election_snapshot
+
+
+def get_by_election(election):
+    return get(rootElectionId=election.rootElectionId)
+
+
+def get_election(election):
+    return get_by_election(election=election).get_election(electionId=election.electionId)
+
+
+def invalidate(rootElectionId):
+    from orm.entities import Election
+
+    Election.Model.query.filter(Election.Model.electionId == rootElectionId).update(
+        {Election.Model.metadataVersion: Election.Model.metadataVersion + 1}, synchronize_session=False
+    )
+
+    # The version is bumped in the open transaction, hence the snapshot is rebuilt from the uncommitted changes within the
+    # session until the transaction is over.
+    db.session.info.setdefault(UNCOMMITTED_ELECTION_SNAPSHOT_MAP_KEY, {})[rootElectionId] = None
+
+    _election_snapshot_map.pop(rootElectionId, None)
+    if has_app_context():
+        g.setdefault("election_metadata_versions", {}).pop(rootElectionId, None)
+
+
+def _after_commit(session):
+    # Fired on releasing the savepoints too.
+    if session.transaction.parent is not None:
+        return
+
+    uncommitted_election_snapshot_map = session.info.pop(UNCOMMITTED_ELECTION_SNAPSHOT_MAP_KEY, {})
+    for rootElectionId, election_snapshot in uncommitted_election_snapshot_map.items():
+        if election_snapshot is not None:
+            _election_snapshot_map[rootElectionId] = election_snapshot
+
+
+def _after_transaction_end(session, transaction):
+    if transaction.parent is not None:
+        return
+
+    # Left over only if rolled back, in which case the versions bumped in the transaction are read again.
+    uncommitted_election_snapshot_map = session.info.pop(UNCOMMITTED_ELECTION_SNAPSHOT_MAP_KEY, {})
+    if has_app_context():
+        metadata_versions = g.get("election_metadata_versions", {})
+        for rootElectionId in uncommitted_election_snapshot_map:
+            metadata_versions.pop(rootElectionId, None)
+
+
+def init_app(app):
+    global _is_listening
+
+    if not _is_listening:
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_transaction_end", _after_transaction_end)
+        _is_listening = True
@@ -1,10 +1,10 @@
 from typing import Set
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, aliased
 from app import db
 from auth import get_user_access_area_ids
 from ext.ExtendedElection import get_extended_election
-from orm.entities.Election import ElectionParty, ElectionCandidate, InvalidVoteCategory
+from orm.entities.Election import ElectionParty, ElectionCandidate, InvalidVoteCategory, ElectionSnapshot
 from orm.entities.IO import File
 
 
@@ -18,6 +18,8 @@ class ElectionModel(db.Model):
     voteType = db.Column(db.String(100), nullable=False)
     electionTemplateName = db.Column(db.String(100), nullable=False)
     isListed = db.Column(db.Boolean, nullable=False, default=False)
+    hierarchyVersion = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    metadataVersion = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     parties = relationship("ElectionPartyModel")
     _invalidVoteCategories = relationship("InvalidVoteCategoryModel")
@@ -38,7 +40,7 @@ class ElectionModel(db.Model):
     def __init__(self, electionTemplateName, electionName, parentElection, voteType, isListed,
                  party_candidate_dataset_file=None,
                  polling_station_dataset_file=None, postal_counting_centers_dataset_file=None,
-                 invalid_vote_categories_dataset_file=None):
+                 invalid_vote_categories_dataset_file=None, dry_run=False, workers=None):
         super(ElectionModel, self).__init__(
             electionTemplateName=electionTemplateName,
             electionName=electionName,
@@ -52,6 +54,8 @@ class ElectionModel(db.Model):
         if parentElection is not None:
             self.parentElectionId = parentElection.electionId
             self.rootElectionId = parentElection.rootElectionId
+
+            ElectionSnapshot.invalidate(rootElectionId=self.rootElectionId)
         else:
             self.parentElectionId = None
             self.rootElectionId = self.electionId
@@ -67,24 +71,23 @@ class ElectionModel(db.Model):
             extended_election = self.get_extended_election()
 
             if extended_election is not None:
-                extended_election.build_election()
+                extended_election.build_election(dry_run=dry_run, workers=workers)
+
+            # Sub elections, parties and candidates built in bulk are not invalidated one by one.
+            ElectionSnapshot.invalidate(rootElectionId=self.electionId)
 
     def get_extended_election(self):
         extended_election = get_extended_election(election=self)
         return extended_election
 
+    def get_snapshot(self):
+        return ElectionSnapshot.get_election(election=self)
+
     def get_this_and_above_election_ids(self):
-        if self.parentElectionId is None:
-            return [self.electionId]
-        else:
-            return [self.electionId] + self.parentElection.get_this_and_above_election_ids()
+        return ElectionSnapshot.get_by_election(election=self).get_this_and_above_election_ids(self.electionId)
 
     def get_this_and_below_election_ids(self):
-        _this_and_below_election_ids = [self.electionId]
-        for subElection in self.subElections:
-            _this_and_below_election_ids += subElection.get_this_and_below_election_ids()
-
-        return _this_and_below_election_ids
+        return ElectionSnapshot.get_by_election(election=self).get_this_and_below_election_ids(self.electionId)
 
     @hybrid_property
     def mappedElectionIds(self):
@@ -98,10 +101,7 @@ class ElectionModel(db.Model):
 
     @hybrid_property
     def invalidVoteCategories(self):
-        if self.parentElectionId is None:
-            return self._invalidVoteCategories
-        else:
-            return self.parentElection.invalidVoteCategories
+        return self.get_snapshot().invalidVoteCategories
 
     def add_sub_election(self, electionName, voteType, isListed=False):
         return create(
@@ -113,7 +113,7 @@ class ElectionModel(db.Model):
         )
 
     def add_invalid_vote_category(self, categoryDescription):
-        invalid_vote_category = db.session.query(InvalidVoteCategory).filter(
+        invalid_vote_category = db.session.query(InvalidVoteCategory.Model).filter(
             InvalidVoteCategory.Model.electionId == self.electionId,
             InvalidVoteCategory.Model.categoryDescription == categoryDescription
         ).one_or_none()
@@ -123,6 +123,7 @@ class ElectionModel(db.Model):
                 electionId=self.electionId,
                 categoryDescription=categoryDescription
             )
+            ElectionSnapshot.invalidate(rootElectionId=self.rootElectionId)
 
         return invalid_vote_category
 
@@ -137,6 +138,7 @@ class ElectionModel(db.Model):
                 electionId=self.electionId,
                 partyId=partyId
             )
+            ElectionSnapshot.invalidate(rootElectionId=self.rootElectionId)
 
         return election_party
 
@@ -154,6 +156,7 @@ class ElectionModel(db.Model):
                 partyId=partyId,
                 candidateId=candidateId
             )
+            ElectionSnapshot.invalidate(rootElectionId=self.rootElectionId)
 
         return election_candidate
 
@@ -177,10 +180,7 @@ class ElectionModel(db.Model):
         return self.rootElection
 
     def get_official_name(self):
-        if self.parentElectionId is None:
-            return self.electionName
-        else:
-            return self.parentElection.get_official_name()
+        return self.get_snapshot().get_official_name()
 
 
 Model = ElectionModel
@@ -191,7 +191,7 @@ PostalAndNonPostal = "PostalAndNonPostal"
 def create(electionTemplateName, electionName, parentElection=None, voteType=PostalAndNonPostal, isListed=False,
            party_candidate_dataset_file=None,
            polling_station_dataset_file=None, postal_counting_centers_dataset_file=None,
-           invalid_vote_categories_dataset_file=None):
+           invalid_vote_categories_dataset_file=None, dry_run=False, workers=None):
     election = Model(
         electionTemplateName=electionTemplateName,
         electionName=electionName,
@@ -201,7 +201,9 @@ def create(electionTemplateName, electionName, parentElection=None, voteType=Pos
         party_candidate_dataset_file=party_candidate_dataset_file,
         polling_station_dataset_file=polling_station_dataset_file,
         postal_counting_centers_dataset_file=postal_counting_centers_dataset_file,
-        invalid_vote_categories_dataset_file=invalid_vote_categories_dataset_file
+        invalid_vote_categories_dataset_file=invalid_vote_categories_dataset_file,
+        dry_run=dry_run,
+        workers=workers
     )
 
     return election
@@ -213,7 +215,7 @@ def get_authorized_election_ids():
     user_access_area_ids: Set[int] = get_user_access_area_ids()
 
     authorized_elections = db.session.query(
-        ElectionModel
+        ElectionModel.electionId, ElectionModel.rootElectionId
     ).filter(
         ElectionModel.electionId == Area.Model.electionId,
         Area.Model.areaId.in_(user_access_area_ids)
@@ -223,12 +225,55 @@ def get_authorized_election_ids():
 
     authorized_election_ids = []
     for authorized_election in authorized_elections:
-        authorized_election_ids.extend(authorized_election.get_this_and_above_election_ids())
-        authorized_election_ids.extend(authorized_election.get_this_and_below_election_ids())
+        election_snapshot = ElectionSnapshot.get_by_election(election=authorized_election)
+        election_id = authorized_election.electionId
+        authorized_election_ids.extend(election_snapshot.get_this_and_above_election_ids(electionId=election_id))
+        authorized_election_ids.extend(election_snapshot.get_this_and_below_election_ids(electionId=election_id))
 
     return authorized_election_ids
 
 
+def get_this_and_below_election_ids_query(electionId):
+    """
+    Election ids of the election and all the elections below it, looked up with a recursive CTE in the same round trip
+    as the query it's used in, e.g. Model.electionId.in_(get_this_and_below_election_ids_query(electionId)).
+    """
+    this_and_below_elections = db.session.query(
+        Model.electionId.label("electionId")
+    ).filter(
+        Model.electionId == electionId
+    ).cte(name="this_and_below_election", recursive=True)
+
+    sub_election = aliased(Model)
+    this_and_below_elections = this_and_below_elections.union_all(
+        db.session.query(sub_election.electionId).filter(
+            sub_election.parentElectionId == this_and_below_elections.c.electionId
+        )
+    )
+
+    return db.session.query(this_and_below_elections.c.electionId)
+
+
+def get_this_and_above_election_ids_query(electionId):
+    """
+    Election ids of the election and all the elections above it, looked up with a recursive CTE.
+    """
+    this_and_above_elections = db.session.query(
+        Model.electionId.label("electionId"), Model.parentElectionId.label("parentElectionId")
+    ).filter(
+        Model.electionId == electionId
+    ).cte(name="this_and_above_election", recursive=True)
+
+    parent_election = aliased(Model)
+    this_and_above_elections = this_and_above_elections.union_all(
+        db.session.query(parent_election.electionId, parent_election.parentElectionId).filter(
+            parent_election.electionId == this_and_above_elections.c.parentElectionId
+        )
+    )
+
+    return db.session.query(this_and_above_elections.c.electionId)
+
+
 def get_all():
     authorized_election_ids = get_authorized_election_ids()
 
@@ -24,6 +24,8 @@ class HistoryVersionModel(db.Model):
             historyStampId=history_stamp.stampId
         )
 
+        # Generated by the database rather than taken from a block, so that the version ids, which are the history
+        # version ids, are in the order of creation, as the latest version is found by them.
         db.session.add(self)
         db.session.flush()
 
@@ -11,6 +11,8 @@ class HistoryModel(db.Model):
     def __init__(self):
         super(HistoryModel, self).__init__()
 
+        # Generated by the database rather than taken from a block, so that the submission ids, which are the history
+        # ids, are in the order of creation.
         db.session.add(self)
         db.session.flush()
 
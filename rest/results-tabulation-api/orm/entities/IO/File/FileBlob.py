@@ -0,0 +1,112 @@
+import hashlib
+import tempfile
+
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+
+FILE_BLOB_CHUNK_SIZE = 1024 * 1024
+
+
+class FileBlobModel(db.Model):
+    __tablename__ = 'fileBlob'
+    fileBlobHash = db.Column(db.String(64), primary_key=True)
+    fileBlobSize = db.Column(db.Integer, nullable=False)
+
+    @property
+    def fileBlobContent(self):
+        return b"".join(iter_content(fileBlobHash=self.fileBlobHash, start=0, stop=self.fileBlobSize))
+
+
+Model = FileBlobModel
+
+
+class FileBlobChunkModel(db.Model):
+    """
+    A chunk of the content of a blob. Every chunk but the last one is FILE_BLOB_CHUNK_SIZE bytes long, hence the chunk
+    of an offset is found without reading the others.
+    """
+    __tablename__ = 'fileBlobChunk'
+    fileBlobHash = db.Column(db.String(64), db.ForeignKey(Model.__table__.c.fileBlobHash), primary_key=True)
+    fileBlobChunkIndex = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    fileBlobChunkContent = db.Column(db.LargeBinary().with_variant(MEDIUMBLOB(), "mysql"), nullable=False)
+
+
+def get_by_hash(fileBlobHash):
+    result = Model.query.filter(
+        Model.fileBlobHash == fileBlobHash
+    ).one_or_none()
+
+    return result
+
+
+def create_from_stream(stream):
+    """
+    Stores the content of a stream, unless the same content has been stored already.
+
+    The stream is read in chunks to find the hash of the content, and the content is inserted a chunk per row, so that
+    an upload is never loaded in to the memory as a whole, nor rewritten in the database as it grows.
+
+    :return: FileBlobModel
+    """
+    try:
+        stream.seek(0)
+    except (AttributeError, OSError):
+        # Not seekable, hence spooled to be read twice.
+        spooled_stream = tempfile.SpooledTemporaryFile(max_size=FILE_BLOB_CHUNK_SIZE)
+        for chunk in iter(lambda: stream.read(FILE_BLOB_CHUNK_SIZE), b""):
+            spooled_stream.write(chunk)
+        stream = spooled_stream
+        stream.seek(0)
+
+    file_blob_hash = hashlib.sha256()
+    file_blob_size = 0
+    for chunk in iter(lambda: stream.read(FILE_BLOB_CHUNK_SIZE), b""):
+        file_blob_hash.update(chunk)
+        file_blob_size += len(chunk)
+    file_blob_hash = file_blob_hash.hexdigest()
+
+    result = get_by_hash(fileBlobHash=file_blob_hash)
+    if result is None:
+        stream.seek(0)
+        result = Model(fileBlobHash=file_blob_hash, fileBlobSize=file_blob_size)
+
+        # The same content might be uploaded concurrently.
+        try:
+            with db.session.begin_nested():
+                db.session.add(result)
+                db.session.flush()
+
+                for chunk_index, chunk in enumerate(iter(lambda: stream.read(FILE_BLOB_CHUNK_SIZE), b"")):
+                    db.session.execute(FileBlobChunkModel.__table__.insert(), {
+                        "fileBlobHash": file_blob_hash,
+                        "fileBlobChunkIndex": chunk_index,
+                        "fileBlobChunkContent": chunk
+                    })
+        except IntegrityError:
+            result = get_by_hash(fileBlobHash=file_blob_hash)
+
+    return result
+
+
+def iter_content(fileBlobHash, start, stop):
+    """
+    Yields the content between the start and stop offsets, reading only the needed part of a chunk at a time from
+    the database.
+    """
+    offset = start
+    while offset < stop:
+        chunk_index, chunk_offset = divmod(offset, FILE_BLOB_CHUNK_SIZE)
+        length = min(FILE_BLOB_CHUNK_SIZE - chunk_offset, stop - offset)
+
+        # SUBSTR offsets are one based.
+        yield db.session.query(
+            func.substr(FileBlobChunkModel.fileBlobChunkContent, chunk_offset + 1, length)
+        ).filter(
+            FileBlobChunkModel.fileBlobHash == fileBlobHash,
+            FileBlobChunkModel.fileBlobChunkIndex == chunk_index
+        ).scalar()
+
+        offset += length
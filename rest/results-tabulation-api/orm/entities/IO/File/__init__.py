@@ -2,10 +2,10 @@ from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 from app import db
 from orm.entities.Audit import Stamp
+from orm.entities.IO.File import FileBlob
 from orm.enums import FileTypeEnum
 from sqlalchemy.ext.hybrid import hybrid_property
 from flask import request
-from sqlalchemy.dialects.mysql import LONGBLOB
 
 
 class FileModel(db.Model):
@@ -16,13 +16,22 @@ class FileModel(db.Model):
     fileMimeType = db.Column(db.String(100), nullable=False)
     fileContentLength = db.Column(db.String(100), nullable=False)
     fileContentType = db.Column(db.String(100), nullable=False)
-    fileContent = db.Column(LONGBLOB, nullable=True)
+    fileBlobHash = db.Column(db.String(64), db.ForeignKey(FileBlob.Model.__table__.c.fileBlobHash), nullable=True)
     fileStampId = db.Column(db.Integer, db.ForeignKey(Stamp.Model.__table__.c.stampId), nullable=False)
 
+    fileBlob = relationship(FileBlob.Model, foreign_keys=[fileBlobHash])
     fileStamp = relationship(Stamp.Model, foreign_keys=[fileStampId])
+    fileSize = association_proxy("fileBlob", "fileBlobSize")
     fileCreatedBy = association_proxy("fileStamp", "createdBy")
     fileCreatedAt = association_proxy("fileStamp", "createdAt")
 
+    @property
+    def fileContent(self):
+        if self.fileBlob is None:
+            return None
+
+        return self.fileBlob.fileBlobContent
+
     @hybrid_property
     def urlInline(self):
         return "%sfile/%d/inline" % (request.host_url, self.fileId)
@@ -55,6 +64,7 @@ def createFromFileSource(fileSource, fileType=FileTypeEnum.Any):
     #         etc.
 
     file_stamp = Stamp.create()
+    file_blob = FileBlob.create_from_stream(stream=fileSource.stream)
 
     if fileType is None:
         fileType = FileTypeEnum.Any
@@ -64,7 +74,7 @@ def createFromFileSource(fileSource, fileType=FileTypeEnum.Any):
         fileMimeType=fileSource.mimetype,
         fileContentLength=fileSource.content_length,
         fileContentType=fileSource.content_type,
-        fileContent=fileSource.stream.read(),
+        fileBlobHash=file_blob.fileBlobHash,
         fileName=fileSource.filename,
         fileStampId=file_stamp.stampId
     )
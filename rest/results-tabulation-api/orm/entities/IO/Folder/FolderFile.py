@@ -1,4 +1,5 @@
 from app import db
+from util import unit_of_work
 from sqlalchemy.orm import relationship
 from orm.entities.IO import File, Folder
 
@@ -29,7 +30,6 @@ def create(folderId, fileId):
         fileId=fileId,
         folderId=folderId
     )
-    db.session.add(result)
-    db.session.flush()
+    unit_of_work.add(result)
 
     return result
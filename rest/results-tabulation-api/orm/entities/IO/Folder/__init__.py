@@ -1,4 +1,5 @@
 from app import db
+from util import unit_of_work
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.associationproxy import association_proxy
 
@@ -25,7 +26,6 @@ def get_by_id(folderId):
 
 def create():
     result = Model()
-    db.session.add(result)
-    db.session.flush()
+    unit_of_work.add(result)
 
     return result
@@ -0,0 +1,10 @@
+from app import db
+
+
+class IdBlockModel(db.Model):
+    __tablename__ = 'idBlock'
+    tableName = db.Column(db.String(100), primary_key=True)
+    nextId = db.Column(db.BigInteger, nullable=False)
+
+
+Model = IdBlockModel
@@ -1,4 +1,5 @@
 from app import db
+from util import unit_of_work
 from orm.entities import Meta
 
 
@@ -20,8 +21,7 @@ class MetaDataModel(db.Model):
 
     def __init__(self, metaId, metaDataKey, metaDataValue):
         super(MetaDataModel, self).__init__(metaId=metaId, metaDataKey=metaDataKey, metaDataValue=metaDataValue)
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 Model = MetaDataModel
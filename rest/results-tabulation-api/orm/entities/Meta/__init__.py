@@ -1,4 +1,5 @@
 from app import db
+from util import unit_of_work
 from orm.entities.Meta import MetaData
 from sqlalchemy.orm import relationship
 
@@ -20,8 +21,7 @@ class MetaModel(db.Model):
         return meta
 
     def __init__(self):
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 Model = MetaModel
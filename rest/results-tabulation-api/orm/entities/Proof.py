@@ -18,6 +18,8 @@ class ProofModel(db.Model):
     proofStampId = db.Column(db.Integer, db.ForeignKey(Stamp.Model.__table__.c.stampId), nullable=False)
     scannedFilesFolderId = db.Column(db.Integer, db.ForeignKey(Folder.Model.__table__.c.folderId), nullable=False)
     finished = db.Column(db.Boolean, default=False)
+    # Kept by upload_file, so that the size is known without loading the scanned files.
+    scannedFilesCount = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     scannedFilesFolder = relationship(Folder.Model, foreign_keys=[scannedFilesFolderId])
     proofStamp = relationship(Stamp.Model, foreign_keys=[proofStampId])
@@ -27,7 +29,7 @@ class ProofModel(db.Model):
     createdAt = association_proxy("proofStamp", "createdAt")
 
     def close(self):
-        if self.size() is 0:
+        if self.size() == 0:
             raise ForbiddenException(
                 message="A proof required at least one evidence. Please upload at least one evidence (proofId=%d)" % self.proofId,
                 code=MESSAGE_CODE_PROOF_CANNOT_BE_CONFIRMED_WITHOUT_EVIDENCE
@@ -43,7 +45,7 @@ class ProofModel(db.Model):
         db.session.flush()
 
     def size(self):
-        return len(self.scannedFiles)
+        return self.scannedFilesCount
 
 
 Model = ProofModel
@@ -81,7 +83,7 @@ def update(proofId, finished=None):
         )
     else:
         if finished is not None:
-            if len(instance.scannedFiles) is 0:
+            if instance.size() == 0:
                 raise ForbiddenException(
                     message="A proof required at least one evidence. Please upload an evidence (proofId=%d)" % proofId,
                     code=MESSAGE_CODE_PROOF_CANNOT_BE_CONFIRMED_WITHOUT_EVIDENCE
@@ -118,6 +120,11 @@ def upload_file(proofId, fileSource, fileType):
             fileId=file.fileId
         )
 
+        # Incremented by the database rather than set from the count read here, so that the concurrent uploads to the
+        # same proof are not lost.
+        proof.scannedFilesCount = Model.scannedFilesCount + 1
+        db.session.flush()
+
         return proof
 
 
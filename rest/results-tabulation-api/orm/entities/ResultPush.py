@@ -0,0 +1,116 @@
+from datetime import datetime
+
+from sqlalchemy import or_
+from sqlalchemy.orm import relationship, aliased
+
+from app import db
+from orm.entities.IO import File
+from orm.enums import ResultPushStatusEnum
+
+
+class ResultPushModel(db.Model):
+    __tablename__ = 'resultPush'
+    resultPushId = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    idempotencyKey = db.Column(db.String(100), nullable=False, unique=True)
+    tallySheetId = db.Column(db.Integer, db.ForeignKey("tallySheet.tallySheetId"), nullable=False)
+    tallySheetVersionId = db.Column(db.Integer, db.ForeignKey("tallySheetVersion.tallySheetVersionId"),
+                                    nullable=False)
+    url = db.Column(db.String(500), nullable=False)
+    params = db.Column(db.Text, nullable=True)
+    jsonBody = db.Column(db.Text, nullable=True)
+    fileId = db.Column(db.Integer, db.ForeignKey(File.Model.__table__.c.fileId), nullable=True)
+    status = db.Column(db.Enum(ResultPushStatusEnum), nullable=False, default=ResultPushStatusEnum.Pending)
+    attemptCount = db.Column(db.Integer, nullable=False, default=0)
+    nextAttemptAt = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    lastError = db.Column(db.Text, nullable=True)
+    createdAt = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    dispatchedAt = db.Column(db.DateTime, nullable=True)
+    # Not due until the push it depends on is dispatched, e.g. the proof image of a result after the result itself.
+    dependsOnResultPushId = db.Column(db.Integer, db.ForeignKey("resultPush.resultPushId"), nullable=True)
+
+    file = relationship(File.Model, foreign_keys=[fileId])
+    dependsOnResultPush = relationship("ResultPushModel", remote_side=[resultPushId],
+                                       foreign_keys=[dependsOnResultPushId])
+
+    __table_args__ = (
+        db.Index('ix_resultPush_status_nextAttemptAt', "status", "nextAttemptAt"),
+    )
+
+    def __init__(self, idempotencyKey, tallySheetId, tallySheetVersionId, url, params=None, jsonBody=None,
+                 fileId=None, dependsOnResultPushId=None):
+        super(ResultPushModel, self).__init__(
+            idempotencyKey=idempotencyKey,
+            tallySheetId=tallySheetId,
+            tallySheetVersionId=tallySheetVersionId,
+            url=url,
+            params=params,
+            jsonBody=jsonBody,
+            fileId=fileId,
+            dependsOnResultPushId=dependsOnResultPushId,
+            status=ResultPushStatusEnum.Pending,
+            attemptCount=0,
+            nextAttemptAt=datetime.now()
+        )
+
+        db.session.add(self)
+        db.session.flush()
+
+
+Model = ResultPushModel
+
+
+def get_by_idempotency_key(idempotencyKey):
+    return Model.query.filter(Model.idempotencyKey == idempotencyKey).one_or_none()
+
+
+def get_due(limit):
+    # In progress pushes are due again once their lease is over, which happens only if the dispatcher died mid push.
+    depends_on_result_push = aliased(Model)
+    return Model.query.outerjoin(
+        depends_on_result_push,
+        depends_on_result_push.resultPushId == Model.dependsOnResultPushId
+    ).filter(
+        Model.status.in_([ResultPushStatusEnum.Pending, ResultPushStatusEnum.InProgress]),
+        Model.nextAttemptAt <= datetime.now(),
+        or_(
+            Model.dependsOnResultPushId == None,
+            depends_on_result_push.status == ResultPushStatusEnum.Dispatched
+        )
+    ).order_by(Model.nextAttemptAt).limit(limit).all()
+
+
+def claim(result_push, lease_until):
+    """
+    Marks the push as in progress, unless another dispatcher has claimed it already.
+
+    :return: True if the push was claimed.
+    """
+    claimed_count = Model.query.filter(
+        Model.resultPushId == result_push.resultPushId,
+        Model.attemptCount == result_push.attemptCount,
+        Model.nextAttemptAt == result_push.nextAttemptAt
+    ).update({
+        Model.status: ResultPushStatusEnum.InProgress,
+        Model.nextAttemptAt: lease_until
+    }, synchronize_session=False)
+
+    return claimed_count == 1
+
+
+def create(idempotencyKey, tallySheetId, tallySheetVersionId, url, params=None, jsonBody=None, fileId=None,
+           dependsOnResultPushId=None):
+    result = get_by_idempotency_key(idempotencyKey=idempotencyKey)
+
+    if result is None:
+        result = Model(
+            idempotencyKey=idempotencyKey,
+            tallySheetId=tallySheetId,
+            tallySheetVersionId=tallySheetVersionId,
+            url=url,
+            params=params,
+            jsonBody=jsonBody,
+            fileId=fileId,
+            dependsOnResultPushId=dependsOnResultPushId
+        )
+
+    return result
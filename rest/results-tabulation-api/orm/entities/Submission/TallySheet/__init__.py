@@ -1,7 +1,9 @@
+import hashlib
+from datetime import datetime
 from typing import Set
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload, lazyload
 from app import db
 from auth import get_user_access_area_ids, get_user_name, has_role_based_access
 from constants.AUTH_CONSTANTS import ACCESS_TYPE_LOCK, ACCESS_TYPE_UNLOCK
@@ -14,13 +16,15 @@ from exception.messages import MESSAGE_CODE_TALLY_SHEET_SAME_USER_CANNOT_SAVE_AN
     MESSAGE_CODE_TALLY_SHEET_CANNOT_BE_NOTIFIED_BEFORE_LOCK, \
     MESSAGE_CODE_TALLY_SHEET_CANNOT_BE_RELEASED_BEFORE_NOTIFYING, MESSAGE_CODE_TALLY_SHEET_ALREADY_RELEASED, \
     MESSAGE_CODE_TALLY_SHEET_ALREADY_NOTIFIED
-from orm.entities import Submission, Election, Template, TallySheetVersionRow, Candidate, Party, Area, Meta
+from orm.entities import Submission, Election, Template, TallySheetVersionRow, Candidate, Party, Area, Meta, Proof
 from orm.entities.Dashboard import StatusReport
 from orm.entities.Election import ElectionCandidate, ElectionParty
 from orm.entities.SubmissionVersion import TallySheetVersion
 from orm.entities.Template import TemplateRow_DerivativeTemplateRow_Model, TemplateRowModel
 from orm.enums import SubmissionTypeEnum, AreaTypeEnum
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, or_, case, null
+from util import unit_of_work
+from util.id_allocation import allocate_ids
 
 from util import get_dict_key_value_or_none
 
@@ -73,8 +77,12 @@ class TallySheetModel(db.Model):
 
     @hybrid_property
     def areaMapList(self):
-        extended_election = self.submission.election.get_extended_election()
-        area_map = extended_election.get_area_map_for_tally_sheet(tally_sheet=self)
+        # Resolved in advance for the tally sheets of a list, by load_area_map_lists.
+        area_map = getattr(self, "_areaMapList", None)
+
+        if area_map is None:
+            extended_election = self.submission.election.get_extended_election()
+            area_map = extended_election.get_area_map_for_tally_sheet(tally_sheet=self)
 
         return area_map
 
@@ -94,8 +102,9 @@ class TallySheetModel(db.Model):
                 parentTallySheetId=self.tallySheetId,
                 childTallySheetId=childTallySheet.tallySheetId
             )
-            db.session.add(tallySheetAssociation)
-            db.session.flush()
+            unit_of_work.add(tallySheetAssociation)
+
+            self.invalidate_aggregates()
 
         return self
 
@@ -169,23 +178,11 @@ class TallySheetModel(db.Model):
                 return "PENDING"
 
     def update_status_report(self):
-        election = self.submission.election.get_root_election()
-
-        if self.statusReportId is None:
-            electoral_district_name, polling_division_name, status_report_type = self.get_status_report_type()
-            status_report = StatusReport.create(
-                electionId=election.electionId,
-                reportType=status_report_type,
-                electoralDistrictName=electoral_district_name,
-                pollingDivisionName=polling_division_name,
-                status=self.get_report_status()
-            )
+        db.session.flush()
+        update_status_reports(tallySheetIds=[self.tallySheetId])
 
-            self.statusReportId = status_report.statusReportId
-        else:
-            self.statusReport.update_status(
-                status=self.get_report_status()
-            )
+        # The status report might have been created in bulk, without going through the session.
+        db.session.expire(self, ["statusReportId", "statusReport"])
 
     def set_latest_version(self, tallySheetVersion: TallySheetVersion):
         if tallySheetVersion is None:
@@ -196,6 +193,8 @@ class TallySheetModel(db.Model):
         self.update_status_report()
 
     def set_locked_version(self, tallySheetVersion: TallySheetVersion):
+        previous_locked_version_id = self.lockedVersionId
+
         if tallySheetVersion is None:
             if not has_role_based_access(self, ACCESS_TYPE_UNLOCK):
                 raise ForbiddenException(
@@ -225,6 +224,7 @@ class TallySheetModel(db.Model):
 
             self.submission.set_locked_version(submissionVersion=tallySheetVersion.submissionVersion)
 
+        self.apply_locked_version_change(previous_locked_version_id, self.lockedVersionId)
         self.update_status_report()
 
     def set_submitted_version(self, tallySheetVersion: TallySheetVersion):
@@ -292,8 +292,7 @@ class TallySheetModel(db.Model):
             metaId=metaId
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def create_empty_version(self):
         tallySheetVersion = TallySheetVersion.Model(
@@ -303,131 +302,29 @@ class TallySheetModel(db.Model):
         return tallySheetVersion
 
     def create_version(self, content=None):
-        column_name_map = {
-            "electionId": Election.Model.electionId,
-            "areaId": Area.Model.areaId,
-            "candidateId": Candidate.Model.candidateId,
-            "partyId": Party.Model.partyId,
-            "numValue": TallySheetVersionRow.Model.numValue,
-            "strValue": TallySheetVersionRow.Model.strValue,
-            "ballotBoxId": TallySheetVersionRow.Model.ballotBoxId
-        }
-        column_function_map = {
-            "sum": func.sum,
-            "count": func.count,
-            "group_concat": func.group_concat
-        }
-
         meta_data_map = {}
         for metaData in self.meta.metaDataList:
             meta_data_map[metaData.metaDataKey] = metaData.metaDataValue
 
         tally_sheet_version = self.create_empty_version()
         is_tally_sheet_version_complete = True
+        tally_sheet_version_rows = []
 
         for templateRow in self.template.rows:
-            query_args = [
-                TallySheetModel.tallySheetId
-            ]
-            group_by_args = []
-
-            for templateRowColumn in templateRow.columns:
-                column_name = templateRowColumn.templateRowColumnName
-                column = column_name_map[column_name]
-
-                if templateRowColumn.func is not None:
-                    column_func = column_function_map[templateRowColumn.func]
-                    column = column_func(column).label(column_name)
-
-                query_args.append(column)
-
-                if templateRowColumn.grouped:
-                    group_by_args.append(column)
-
             content_rows = []
 
             if templateRow.isDerived is True:
+                if _is_aggregated_template_row(templateRow):
+                    content_rows = self.get_aggregated_content_rows(templateRow)
+                else:
+                    for aggregated_result in _get_derived_template_row_results(self.tallySheetId, templateRow):
+                        content_row = {}
 
-                tally_sheet_version_row_join_condition = [
-                    TallySheetVersionRow.Model.templateRowId == TemplateRowModel.templateRowId,
-                    TallySheetVersionRow.Model.tallySheetVersionId == Submission.Model.lockedVersionId
-                ]
-
-                aggregated_results = db.session.query(
-                    *query_args
-                ).join(
-                    Submission.Model,
-                    Submission.Model.submissionId == TallySheetModel.tallySheetId
-                )
-
-                if Area.Model.areaId in query_args:
-                    aggregated_results = aggregated_results.join(
-                        Area.Model,
-                        Area.Model.areaId == Submission.Model.areaId
-                    )
-
-                if Election.Model.electionId in query_args or Candidate.Model.candidateId in query_args or Party.Model.partyId in query_args:
-                    aggregated_results = aggregated_results.join(
-                        Election.Model,
-                        Election.Model.electionId == Submission.Model.electionId
-                    )
+                        for templateRowColumn in templateRow.columns:
+                            column_name = templateRowColumn.templateRowColumnName
+                            content_row[column_name] = getattr(aggregated_result, column_name)
 
-                if Candidate.Model.candidateId in query_args:
-                    aggregated_results = aggregated_results.join(
-                        ElectionCandidate.Model,
-                        ElectionCandidate.Model.electionId == Election.Model.electionId
-                    ).join(
-                        Candidate.Model,
-                        Candidate.Model.candidateId == ElectionCandidate.Model.candidateId
-                    ).join(
-                        Party.Model,
-                        Party.Model.partyId == ElectionCandidate.Model.partyId
-                    )
-                    tally_sheet_version_row_join_condition += [
-                        TallySheetVersionRow.Model.candidateId == Candidate.Model.candidateId,
-                        TallySheetVersionRow.Model.partyId == Party.Model.partyId
-                    ]
-                elif Party.Model.partyId in query_args:
-                    aggregated_results = aggregated_results.join(
-                        ElectionParty.Model,
-                        ElectionParty.Model.electionId == Election.Model.electionId
-                    ).join(
-                        Party.Model,
-                        Party.Model.partyId == ElectionParty.Model.partyId
-                    )
-                    tally_sheet_version_row_join_condition.append(
-                        TallySheetVersionRow.Model.partyId == Party.Model.partyId)
-
-                aggregated_results = aggregated_results.join(
-                    TallySheetTallySheetModel,
-                    TallySheetTallySheetModel.childTallySheetId == TallySheetModel.tallySheetId
-                ).join(
-                    TemplateRowModel,
-                    TemplateRowModel.templateId == TallySheetModel.templateId
-                ).join(
-                    TemplateRow_DerivativeTemplateRow_Model,
-                    TemplateRow_DerivativeTemplateRow_Model.derivativeTemplateRowId == TemplateRowModel.templateRowId
-                ).join(
-                    TallySheetVersionRow.Model,
-                    and_(
-                        *tally_sheet_version_row_join_condition
-                    ),
-                    isouter=True
-                ).filter(
-                    TallySheetTallySheetModel.parentTallySheetId == self.tallySheetId,
-                    TemplateRow_DerivativeTemplateRow_Model.templateRowId == templateRow.templateRowId
-                ).group_by(
-                    *group_by_args
-                ).all()
-
-                for aggregated_result in aggregated_results:
-                    content_row = {}
-
-                    for templateRowColumn in templateRow.columns:
-                        column_name = templateRowColumn.templateRowColumnName
-                        content_row[column_name] = getattr(aggregated_result, column_name)
-
-                    content_rows.append(content_row)
+                        content_rows.append(content_row)
             else:
                 for content_row in content:
                     if content_row["templateRowId"] == templateRow.templateRowId:
@@ -447,23 +344,170 @@ class TallySheetModel(db.Model):
                 if content_row["numValue"] is None:
                     is_tally_sheet_version_complete = False
 
-                TallySheetVersionRow.create(
-                    templateRow=templateRow,
-                    tallySheetVersion=tally_sheet_version,
-                    electionId=get_dict_key_value_or_none(content_row, "electionId"),
-                    numValue=get_dict_key_value_or_none(content_row, "numValue"),
-                    strValue=get_dict_key_value_or_none(content_row, "strValue"),
-                    areaId=get_dict_key_value_or_none(content_row, "areaId"),
-                    candidateId=get_dict_key_value_or_none(content_row, "candidateId"),
-                    partyId=get_dict_key_value_or_none(content_row, "partyId"),
-                    ballotBoxId=get_dict_key_value_or_none(content_row, "ballotBoxId")
-                )
+                tally_sheet_version_rows.append({
+                    "templateRowId": templateRow.templateRowId,
+                    "electionId": get_dict_key_value_or_none(content_row, "electionId"),
+                    "numValue": get_dict_key_value_or_none(content_row, "numValue"),
+                    "strValue": get_dict_key_value_or_none(content_row, "strValue"),
+                    "areaId": get_dict_key_value_or_none(content_row, "areaId"),
+                    "candidateId": get_dict_key_value_or_none(content_row, "candidateId"),
+                    "partyId": get_dict_key_value_or_none(content_row, "partyId"),
+                    "ballotBoxId": get_dict_key_value_or_none(content_row, "ballotBoxId")
+                })
+
+        TallySheetVersionRow.create_all(tallySheetVersion=tally_sheet_version, rows=tally_sheet_version_rows)
 
         if is_tally_sheet_version_complete:
             tally_sheet_version.set_complete()
 
         return tally_sheet_version
 
+    def get_aggregated_content_rows(self, templateRow):
+        column_names = [templateRowColumn.templateRowColumnName for templateRowColumn in templateRow.columns]
+
+        aggregate_rows = TallySheetAggregateRowModel.query.filter(
+            TallySheetAggregateRowModel.tallySheetId == self.tallySheetId,
+            TallySheetAggregateRowModel.templateRowId == templateRow.templateRowId
+        ).all()
+
+        # Materialize the aggregates of the template row on first use. Afterwards they are kept up to date by
+        # applying the difference of the old and new locked versions of a child whenever it's locked or unlocked.
+        # They are materialized again if derived from other locked versions than those of the children, which happens
+        # when a child is locked by a transaction that doesn't see the aggregates materialized concurrently.
+        child_locked_versions_hash = _get_child_locked_versions_hash(self.tallySheetId)
+        if len(aggregate_rows) == 0 or any([aggregate_row.childLockedVersionsHash != child_locked_versions_hash
+                                            for aggregate_row in aggregate_rows]):
+            self.lock_aggregates()
+
+            # Read again, since the children might have been locked while waiting for the lock.
+            child_locked_versions_hash = _get_child_locked_versions_hash(self.tallySheetId)
+
+            TallySheetAggregateRowModel.query.filter(
+                TallySheetAggregateRowModel.tallySheetId == self.tallySheetId,
+                TallySheetAggregateRowModel.templateRowId == templateRow.templateRowId
+            ).delete(synchronize_session=False)
+
+            aggregate_rows = []
+            for aggregated_result in _get_derived_template_row_results(self.tallySheetId, templateRow):
+                aggregate_row = {
+                    "tallySheetId": self.tallySheetId,
+                    "templateRowId": templateRow.templateRowId,
+                    "numValue": aggregated_result.numValue,
+                    "numValueCount": aggregated_result.numValueCount,
+                    "childLockedVersionsHash": child_locked_versions_hash
+                }
+                aggregate_row.update(_get_aggregate_row_key_map(aggregated_result))
+                aggregate_rows.append(aggregate_row)
+
+            if len(aggregate_rows) > 0:
+                db.session.bulk_insert_mappings(TallySheetAggregateRowModel, aggregate_rows)
+
+            return [{column_name: aggregate_row[column_name] for column_name in column_names}
+                    for aggregate_row in aggregate_rows]
+
+        return [{column_name: getattr(aggregate_row, column_name) for column_name in column_names}
+                for aggregate_row in aggregate_rows]
+
+    def lock_aggregates(self):
+        # The aggregates are materialized and the deltas of the children are applied to them one transaction at a
+        # time, serialized on the row of the tally sheet.
+        db.session.query(TallySheetModel.tallySheetId).filter(
+            TallySheetModel.tallySheetId == self.tallySheetId
+        ).with_for_update().one()
+
+    def invalidate_aggregates(self):
+        TallySheetAggregateRowModel.query.filter(
+            TallySheetAggregateRowModel.tallySheetId == self.tallySheetId
+        ).delete(synchronize_session=False)
+
+    def apply_locked_version_change(self, previousLockedVersionId, lockedVersionId):
+        if previousLockedVersionId == lockedVersionId:
+            return
+
+        # Locked in the same order by every transaction.
+        for parent in sorted(self.parents, key=lambda parent: parent.tallySheetId):
+            parent.lock_aggregates()
+
+            aggregates = db.session.query(
+                TallySheetAggregateRowModel.templateRowId, TallySheetAggregateRowModel.childLockedVersionsHash
+            ).filter(
+                TallySheetAggregateRowModel.tallySheetId == parent.tallySheetId
+            ).group_by(
+                TallySheetAggregateRowModel.templateRowId, TallySheetAggregateRowModel.childLockedVersionsHash
+            ).all()
+
+            if len(aggregates) == 0:
+                continue
+
+            # The delta applies only to the aggregates derived from the previous locked version of this child.
+            previous_child_locked_versions_hash = _get_child_locked_versions_hash(
+                parent.tallySheetId, childLockedVersionIds={self.tallySheetId: previousLockedVersionId})
+            if any([aggregate.childLockedVersionsHash != previous_child_locked_versions_hash
+                    for aggregate in aggregates]):
+                parent.invalidate_aggregates()
+                continue
+
+            aggregated_template_row_ids = [aggregate.templateRowId for aggregate in aggregates]
+
+            for templateRow in parent.template.rows:
+                if templateRow.templateRowId not in aggregated_template_row_ids:
+                    continue
+
+                if not parent.apply_aggregate_delta(templateRow, self, previousLockedVersionId, lockedVersionId):
+                    # The materialized groups don't match the child's contribution anymore, hence rebuild on next use.
+                    parent.invalidate_aggregates()
+                    break
+            else:
+                TallySheetAggregateRowModel.query.filter(
+                    TallySheetAggregateRowModel.tallySheetId == parent.tallySheetId
+                ).update({
+                    TallySheetAggregateRowModel.childLockedVersionsHash: _get_child_locked_versions_hash(
+                        parent.tallySheetId, childLockedVersionIds={self.tallySheetId: lockedVersionId})
+                }, synchronize_session=False)
+
+    def apply_aggregate_delta(self, templateRow, childTallySheet, previousLockedVersionId, lockedVersionId):
+        deltas = {}
+        for tallySheetVersionId, sign in [(previousLockedVersionId, -1), (lockedVersionId, 1)]:
+            if tallySheetVersionId is None:
+                continue
+
+            for aggregated_result in _get_derived_template_row_results(
+                    self.tallySheetId, templateRow, childTallySheetId=childTallySheet.tallySheetId,
+                    tallySheetVersionId=tallySheetVersionId):
+                key = tuple(_get_aggregate_row_key_map(aggregated_result).items())
+                num_value_delta, num_value_count_delta = deltas.get(key, (0, 0))
+                deltas[key] = (
+                    num_value_delta + sign * (aggregated_result.numValue or 0),
+                    num_value_count_delta + sign * aggregated_result.numValueCount
+                )
+
+        for key, (num_value_delta, num_value_count_delta) in deltas.items():
+            if num_value_delta == 0 and num_value_count_delta == 0:
+                continue
+
+            query_filters = [
+                TallySheetAggregateRowModel.tallySheetId == self.tallySheetId,
+                TallySheetAggregateRowModel.templateRowId == templateRow.templateRowId
+            ]
+            for column_name, value in key:
+                column = getattr(TallySheetAggregateRowModel, column_name)
+                query_filters.append(column.is_(None) if value is None else column == value)
+
+            # numValue has to be set first since MySQL evaluates the assignments from left to right.
+            updated_count = TallySheetAggregateRowModel.query.filter(*query_filters).update([
+                (TallySheetAggregateRowModel.numValue, case(
+                    [(TallySheetAggregateRowModel.numValueCount + num_value_count_delta == 0, null())],
+                    else_=func.coalesce(TallySheetAggregateRowModel.numValue, 0) + num_value_delta
+                )),
+                (TallySheetAggregateRowModel.numValueCount,
+                 TallySheetAggregateRowModel.numValueCount + num_value_count_delta)
+            ], synchronize_session=False, update_args={"preserve_parameter_order": True})
+
+            if updated_count == 0:
+                return False
+
+        return True
+
     def get_extended_tally_sheet_version(self, tallySheetVersionId):
         tally_sheet_version = TallySheetVersion.get_by_id(tallySheetId=self.tallySheetId,
                                                           tallySheetVersionId=tallySheetVersionId)
@@ -491,6 +535,204 @@ class TallySheetTallySheetModel(db.Model):
     parentTallySheetId = db.Column(db.Integer, db.ForeignKey("tallySheet.tallySheetId"), primary_key=True)
     childTallySheetId = db.Column(db.Integer, db.ForeignKey("tallySheet.tallySheetId"), primary_key=True)
 
+    # The primary key serves the lookups by the parent.
+    __table_args__ = (
+        db.Index('ix_tallySheet_tallySheet_childTallySheetId', "childTallySheetId", "parentTallySheetId"),
+    )
+
+
+TALLY_SHEET_AGGREGATE_ROW_KEY_COLUMNS = ["electionId", "areaId", "candidateId", "partyId"]
+
+
+class TallySheetAggregateRowModel(db.Model):
+    __tablename__ = 'tallySheetAggregateRow'
+    tallySheetAggregateRowId = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    tallySheetId = db.Column(db.Integer, db.ForeignKey("tallySheet.tallySheetId"), nullable=False)
+    templateRowId = db.Column(db.Integer, db.ForeignKey("templateRow.templateRowId"), nullable=False)
+    electionId = db.Column(db.Integer, db.ForeignKey(Election.Model.__table__.c.electionId), nullable=True)
+    areaId = db.Column(db.Integer, db.ForeignKey(Area.Model.__table__.c.areaId), nullable=True)
+    candidateId = db.Column(db.Integer, db.ForeignKey(Candidate.Model.__table__.c.candidateId), nullable=True)
+    partyId = db.Column(db.Integer, db.ForeignKey(Party.Model.__table__.c.partyId), nullable=True)
+    numValue = db.Column(db.Integer, nullable=True)
+    numValueCount = db.Column(db.Integer, nullable=False, default=0)
+    # Identifies the locked versions of the children the aggregate was derived from.
+    childLockedVersionsHash = db.Column(db.String(40), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_tallySheetAggregateRow_tallySheetId_templateRowId', "tallySheetId", "templateRowId"),
+    )
+
+
+def _get_child_locked_versions_hash(tallySheetId, childLockedVersionIds=None):
+    """
+    :param childLockedVersionIds: dict of child tally sheet id to the locked version id to be used instead of the
+    current one.
+    """
+    child_locked_version_ids = db.session.query(
+        TallySheetTallySheetModel.childTallySheetId, Submission.Model.lockedVersionId
+    ).filter(
+        TallySheetTallySheetModel.parentTallySheetId == tallySheetId,
+        Submission.Model.submissionId == TallySheetTallySheetModel.childTallySheetId
+    ).order_by(
+        TallySheetTallySheetModel.childTallySheetId
+    ).all()
+
+    if childLockedVersionIds is not None:
+        child_locked_version_ids = [
+            (child_tally_sheet_id, childLockedVersionIds.get(child_tally_sheet_id, locked_version_id))
+            for child_tally_sheet_id, locked_version_id in child_locked_version_ids
+        ]
+
+    return hashlib.sha1(",".join([
+        "%d:%s" % (child_tally_sheet_id, locked_version_id)
+        for child_tally_sheet_id, locked_version_id in child_locked_version_ids
+    ]).encode("utf-8")).hexdigest()
+
+
+def _is_aggregated_template_row(templateRow):
+    # Only plain sums grouped by entity ids can be maintained incrementally.
+    has_num_value_sum = False
+    for templateRowColumn in templateRow.columns:
+        column_name = templateRowColumn.templateRowColumnName
+        if column_name == "numValue" and templateRowColumn.func == "sum":
+            has_num_value_sum = True
+        elif not (templateRowColumn.grouped and templateRowColumn.func is None
+                  and column_name in TALLY_SHEET_AGGREGATE_ROW_KEY_COLUMNS):
+            return False
+
+    return has_num_value_sum
+
+
+def _get_aggregate_row_key_map(aggregated_result):
+    keys = aggregated_result.keys()
+    return {
+        column_name: getattr(aggregated_result, column_name) if column_name in keys else None
+        for column_name in TALLY_SHEET_AGGREGATE_ROW_KEY_COLUMNS
+    }
+
+
+def _get_derived_template_row_results(tallySheetId, templateRow, childTallySheetId=None, tallySheetVersionId=None):
+    column_name_map = {
+        "electionId": Election.Model.electionId,
+        "areaId": Area.Model.areaId,
+        "candidateId": Candidate.Model.candidateId,
+        "partyId": Party.Model.partyId,
+        "numValue": TallySheetVersionRow.Model.numValue,
+        "strValue": TallySheetVersionRow.Model.strValue,
+        "ballotBoxId": TallySheetVersionRow.Model.ballotBoxId
+    }
+    column_function_map = {
+        "sum": func.sum,
+        "count": func.count,
+        "group_concat": func.group_concat
+    }
+
+    query_args = [
+        TallySheetModel.tallySheetId
+    ]
+    group_by_args = []
+
+    for templateRowColumn in templateRow.columns:
+        column_name = templateRowColumn.templateRowColumnName
+        column = column_name_map[column_name]
+
+        if templateRowColumn.func is not None:
+            column_func = column_function_map[templateRowColumn.func]
+            column = column_func(column).label(column_name)
+
+        query_args.append(column)
+
+        if templateRowColumn.grouped:
+            group_by_args.append(column)
+
+    query_args.append(func.count(TallySheetVersionRow.Model.numValue).label("numValueCount"))
+
+    # By default the locked versions of all the children are aggregated. A single child and an explicit version
+    # can be given to get the contribution of that version alone.
+    if tallySheetVersionId is None:
+        tally_sheet_version_id_column = Submission.Model.lockedVersionId
+    else:
+        tally_sheet_version_id_column = tallySheetVersionId
+
+    tally_sheet_version_row_join_condition = [
+        TallySheetVersionRow.Model.templateRowId == TemplateRowModel.templateRowId,
+        TallySheetVersionRow.Model.tallySheetVersionId == tally_sheet_version_id_column
+    ]
+
+    aggregated_results = db.session.query(
+        *query_args
+    ).join(
+        Submission.Model,
+        Submission.Model.submissionId == TallySheetModel.tallySheetId
+    )
+
+    if Area.Model.areaId in query_args:
+        aggregated_results = aggregated_results.join(
+            Area.Model,
+            Area.Model.areaId == Submission.Model.areaId
+        )
+
+    if Election.Model.electionId in query_args or Candidate.Model.candidateId in query_args or Party.Model.partyId in query_args:
+        aggregated_results = aggregated_results.join(
+            Election.Model,
+            Election.Model.electionId == Submission.Model.electionId
+        )
+
+    if Candidate.Model.candidateId in query_args:
+        aggregated_results = aggregated_results.join(
+            ElectionCandidate.Model,
+            ElectionCandidate.Model.electionId == Election.Model.electionId
+        ).join(
+            Candidate.Model,
+            Candidate.Model.candidateId == ElectionCandidate.Model.candidateId
+        ).join(
+            Party.Model,
+            Party.Model.partyId == ElectionCandidate.Model.partyId
+        )
+        tally_sheet_version_row_join_condition += [
+            TallySheetVersionRow.Model.candidateId == Candidate.Model.candidateId,
+            TallySheetVersionRow.Model.partyId == Party.Model.partyId
+        ]
+    elif Party.Model.partyId in query_args:
+        aggregated_results = aggregated_results.join(
+            ElectionParty.Model,
+            ElectionParty.Model.electionId == Election.Model.electionId
+        ).join(
+            Party.Model,
+            Party.Model.partyId == ElectionParty.Model.partyId
+        )
+        tally_sheet_version_row_join_condition.append(
+            TallySheetVersionRow.Model.partyId == Party.Model.partyId)
+
+    query_filters = [
+        TallySheetTallySheetModel.parentTallySheetId == tallySheetId,
+        TemplateRow_DerivativeTemplateRow_Model.templateRowId == templateRow.templateRowId
+    ]
+
+    if childTallySheetId is not None:
+        query_filters.append(TallySheetModel.tallySheetId == childTallySheetId)
+
+    return aggregated_results.join(
+        TallySheetTallySheetModel,
+        TallySheetTallySheetModel.childTallySheetId == TallySheetModel.tallySheetId
+    ).join(
+        TemplateRowModel,
+        TemplateRowModel.templateId == TallySheetModel.templateId
+    ).join(
+        TemplateRow_DerivativeTemplateRow_Model,
+        TemplateRow_DerivativeTemplateRow_Model.derivativeTemplateRowId == TemplateRowModel.templateRowId
+    ).join(
+        TallySheetVersionRow.Model,
+        and_(
+            *tally_sheet_version_row_join_condition
+        ),
+        isouter=True
+    ).filter(
+        *query_filters
+    ).group_by(
+        *group_by_args
+    ).all()
+
 
 def _get_electoral_district_name(polling_division):
     electoral_district_name = ""
@@ -540,8 +782,8 @@ def get_all(electionId=None, areaId=None, tallySheetCode=None, voteType=None):
         query_filters.append(Submission.Model.areaId == areaId)
 
     if electionId is not None:
-        election = Election.get_by_id(electionId=electionId)
-        query_filters.append(Election.Model.electionId.in_(election.get_this_and_below_election_ids()))
+        query_filters.append(Election.Model.electionId.in_(
+            Election.get_this_and_below_election_ids_query(electionId=electionId)))
 
     if tallySheetCode is not None:
         query_filters.append(Template.Model.templateName == tallySheetCode)
@@ -552,6 +794,45 @@ def get_all(electionId=None, areaId=None, tallySheetCode=None, voteType=None):
     return db.session.query(*query_args).filter(*query_filters).group_by(*query_group_by)
 
 
+def get_list_query_options():
+    """
+    Loads everything serialized by TallySheetSchema with a fixed number of queries, however many tally sheets are
+    listed.
+    """
+    submission = selectinload(Model.submission)
+
+    return [
+        # Not serialized in the lists.
+        lazyload(Model.children),
+        lazyload(Model.parents),
+
+        selectinload(Model.template).selectinload(Template.Model.rows),
+        selectinload(Model.meta).selectinload(Meta.Model.metaDataList),
+        submission.selectinload(Submission.Model.election),
+        submission.selectinload(Submission.Model.area).selectinload(Area.Model.election),
+        submission.selectinload(Submission.Model.latestStamp),
+        submission.selectinload(Submission.Model.lockedStamp),
+        submission.selectinload(Submission.Model.submittedStamp),
+        submission.selectinload(Submission.Model.versions)
+    ]
+
+
+def load_area_map_lists(tally_sheets):
+    """
+    Resolves the areaMapList of the tally sheets of a list together, so that each area is mapped only once.
+    """
+    election_wise_tally_sheets = {}
+    for tally_sheet in tally_sheets:
+        election_wise_tally_sheets.setdefault(tally_sheet.submission.electionId, []).append(tally_sheet)
+
+    for election_tally_sheets in election_wise_tally_sheets.values():
+        extended_election = election_tally_sheets[0].submission.election.get_extended_election()
+        area_map_lists = extended_election.get_area_map_for_tally_sheets(tally_sheets=election_tally_sheets)
+
+        for tally_sheet in election_tally_sheets:
+            tally_sheet._areaMapList = area_map_lists[tally_sheet.tallySheetId]
+
+
 def create(template, electionId, areaId, metaId):
     result = Model(
         template=template,
@@ -595,3 +876,103 @@ def create_latest_version(tallySheetId, content=None):
     tallySheet.set_latest_version(tallySheetVersion=tallySheetVersion)
 
     return tallySheet, tallySheetVersion
+
+
+STATUS_REPORT_BATCH_SIZE = 1000
+
+
+def _get_report_status_column():
+    """
+    Derives the same status as TallySheetModel.get_report_status does, in the database.
+    """
+    has_data_entry = db.session.query(TemplateRowModel.templateRowId).filter(
+        TemplateRowModel.templateId == Model.templateId,
+        TemplateRowModel.isDerived == False
+    ).exists()
+    locked = Submission.Model.lockedVersionId != None
+
+    return case(
+        [
+            (and_(locked, Submission.Model.lockedVersionId == Submission.Model.releasedVersionId), "RELEASED"),
+            (and_(locked, Submission.Model.lockedVersionId == Submission.Model.notifiedVersionId), "NOTIFIED"),
+            (and_(locked, Proof.Model.scannedFilesCount > 0), "CERTIFIED"),
+            (locked, "VERIFIED"),
+            (~has_data_entry, "PENDING"),
+            (Submission.Model.submittedVersionId != None, "SUBMITTED"),
+            (Submission.Model.latestVersionId != None, "ENTERED")
+        ],
+        else_="NOT ENTERED"
+    )
+
+
+def _get_status_report_query(*query_args):
+    return db.session.query(*query_args).select_from(Model).join(
+        Submission.Model, Submission.Model.submissionId == Model.tallySheetId
+    ).join(
+        Proof.Model, Proof.Model.proofId == Submission.Model.submissionProofId
+    )
+
+
+def update_status_reports(tallySheetIds=None, electionId=None):
+    """
+    Refreshes the dashboard status reports of the given tally sheets, or of the tally sheets of the given root
+    election, or of all the tally sheets if neither is given.
+
+    The existing reports are updated with a single statement, and the missing ones are created in batches.
+    """
+    query_filters = []
+
+    if tallySheetIds is not None:
+        query_filters.append(Model.tallySheetId.in_(tallySheetIds))
+
+    if electionId is not None:
+        query_filters.append(Submission.Model.electionId.in_(
+            db.session.query(Election.Model.electionId).filter(Election.Model.rootElectionId == electionId)
+        ))
+
+    report_status = _get_status_report_query(_get_report_status_column()).filter(
+        Model.statusReportId == StatusReport.Model.statusReportId
+    ).as_scalar()
+
+    StatusReport.Model.query.filter(
+        StatusReport.Model.statusReportId.in_(
+            _get_status_report_query(Model.statusReportId).filter(*query_filters)
+        )
+    ).update({StatusReport.Model.status: report_status}, synchronize_session="fetch")
+
+    missing_status_reports = _get_status_report_query(
+        Model.tallySheetId,
+        Election.Model.rootElectionId,
+        Template.Model.templateName,
+        _get_report_status_column()
+    ).join(
+        Election.Model, Election.Model.electionId == Submission.Model.electionId
+    ).join(
+        Template.Model, Template.Model.templateId == Model.templateId
+    ).filter(
+        Model.statusReportId == None,
+        *query_filters
+    ).order_by(Model.tallySheetId).all()
+
+    created_at = datetime.now()
+    for batch_start in range(0, len(missing_status_reports), STATUS_REPORT_BATCH_SIZE):
+        batch = missing_status_reports[batch_start:batch_start + STATUS_REPORT_BATCH_SIZE]
+        status_report_ids = allocate_ids(StatusReport.Model, len(batch))
+
+        # The district and division names are left empty, as get_status_report_type does.
+        db.session.bulk_insert_mappings(StatusReport.Model, [{
+            "statusReportId": status_report_id,
+            "electionId": root_election_id,
+            "reportType": template_name,
+            "electoralDistrictName": "",
+            "pollingDivisionName": "",
+            "status": status,
+            "createdAt": created_at
+        } for status_report_id, (tally_sheet_id, root_election_id, template_name, status) in
+            zip(status_report_ids, batch)])
+
+        db.session.bulk_update_mappings(Model, [{
+            "tallySheetId": tally_sheet_id,
+            "statusReportId": status_report_id
+        } for status_report_id, (tally_sheet_id, root_election_id, template_name, status) in
+            zip(status_report_ids, batch)])
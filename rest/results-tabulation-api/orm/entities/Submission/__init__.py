@@ -1,5 +1,6 @@
 from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
+from util import unit_of_work
 from sqlalchemy.orm import relationship
 from exception import MethodNotAllowedException
 from exception.messages import MESSAGE_CODE_SUBMISSION_IRRELEVANT_VERSION_CANNOT_BE_MAPPED
@@ -26,6 +27,11 @@ class SubmissionModel(db.Model):
     releasedVersionId = db.Column(db.Integer, db.ForeignKey("submissionVersion.submissionVersionId"), nullable=True)
     releasedStampId = db.Column(db.Integer, db.ForeignKey("stamp.stampId"), nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_submission_areaId_electionId', "areaId", "electionId"),
+        db.Index('ix_submission_electionId_areaId', "electionId", "areaId")
+    )
+
     election = relationship(Election.Model, foreign_keys=[electionId])
     area = relationship(Area.Model, foreign_keys=[areaId])
     submissionProof = relationship(Proof.Model, foreign_keys=[submissionProofId])
@@ -86,8 +92,7 @@ class SubmissionModel(db.Model):
             self.latestVersionId = submissionVersion.submissionVersionId
             self.latestStampId = Stamp.create().stampId
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def set_locked_version(self, submissionVersion: SubmissionVersion):
         if submissionVersion is None:
@@ -106,8 +111,7 @@ class SubmissionModel(db.Model):
             self.lockedVersionId = submissionVersion.submissionVersionId
             self.lockedStampId = Stamp.create().stampId
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def set_submitted_version(self, submissionVersion: SubmissionVersion):
         if submissionVersion is None:
@@ -126,8 +130,7 @@ class SubmissionModel(db.Model):
             self.submittedVersionId = submissionVersion.submissionVersionId
             self.submittedStampId = Stamp.create().stampId
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def set_notified_version(self, submissionVersion: SubmissionVersion):
         if submissionVersion is None:
@@ -146,8 +149,7 @@ class SubmissionModel(db.Model):
             self.notifiedVersionId = submissionVersion.submissionVersionId
             self.notifiedStampId = Stamp.create().stampId
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def set_released_version(self, submissionVersion: SubmissionVersion):
         if submissionVersion is None:
@@ -166,8 +168,7 @@ class SubmissionModel(db.Model):
             self.releasedVersionId = submissionVersion.submissionVersionId
             self.releasedStampId = Stamp.create().stampId
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def __init__(self, submissionType, electionId, areaId):
         submissionProof = Proof.create(proofType=get_submission_proof_type(submissionType=submissionType))
@@ -181,8 +182,7 @@ class SubmissionModel(db.Model):
             submissionProofId=submissionProof.proofId
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 Model = SubmissionModel
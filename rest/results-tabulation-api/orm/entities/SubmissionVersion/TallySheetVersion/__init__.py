@@ -1,8 +1,10 @@
+from collections import OrderedDict
 from typing import Set
 
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
+from util import unit_of_work
 from sqlalchemy.orm import relationship
 
 from exception.messages import MESSAGE_CODE_TALLY_SHEET_NOT_FOUND
@@ -12,6 +14,23 @@ from orm.entities.Submission import TallySheet
 from exception import NotFoundException
 from flask import request
 
+# Columns of the content as serialized by TallySheetVersionRow_Schema, for the content responded in columns.
+CONTENT_COLUMNS = OrderedDict([
+    ("tallySheetVersionRowId", TallySheetVersionRow.Model.tallySheetVersionRowId),
+    ("templateRowId", TemplateRowModel.templateRowId),
+    ("templateRowType", TemplateRowModel.templateRowType),
+    ("areaId", Area.Model.areaId),
+    ("areaName", Area.Model.areaName),
+    ("candidateId", Candidate.Model.candidateId),
+    ("candidateName", Candidate.Model.candidateName),
+    ("partyId", Party.Model.partyId),
+    ("partyName", Party.Model.partyName),
+    ("numValue", TallySheetVersionRow.Model.numValue),
+    ("strValue", TallySheetVersionRow.Model.strValue)
+])
+CONTENT_DICTIONARY_COLUMN_NAMES = ["templateRowType", "areaName", "candidateName", "partyName"]
+
+
 
 class TallySheetVersionModel(db.Model):
     __tablename__ = 'tallySheetVersion'
@@ -32,70 +51,73 @@ class TallySheetVersionModel(db.Model):
     def set_locked(self):
         self.submissionVersion.set_locked()
 
+    def get_content_query(self):
+        meta_data_key_to_column_map = {
+            # "areaId": Area.Model.areaId,
+            "partyId": Party.Model.partyId
+        }
+
+        tally_sheet = TallySheet.get_by_id(tallySheetId=self.tallySheetId)
+        query_filter = []
+        for meta_data in tally_sheet.meta.metaDataList:
+            if meta_data.metaDataKey in meta_data_key_to_column_map:
+                query_filter.append(
+                    meta_data_key_to_column_map[meta_data.metaDataKey] == meta_data.metaDataValue
+                )
+
+        query_args = [
+            TallySheetVersionRow.Model.tallySheetVersionRowId,
+            TallySheetVersionRow.Model.electionId,
+            TemplateRowModel.templateRowId,
+            TemplateRowModel.templateRowType,
+            Election.Model.electionId,
+            Election.Model.voteType,
+            Election.Model.rootElectionId,
+            Area.Model.areaId,
+            Area.Model.areaName,
+            Candidate.Model.candidateId,
+            Candidate.Model.candidateName,
+            Party.Model.partyId,
+            Party.Model.partyName,
+            Party.Model.partySymbol,
+            Party.Model.partyAbbreviation,
+            TallySheetVersionRow.Model.strValue,
+            TallySheetVersionRow.Model.numValue
+        ]
+        return db.session.query(
+            *query_args
+        ).join(
+            TemplateRowModel,
+            TemplateRowModel.templateRowId == TallySheetVersionRow.Model.templateRowId
+        ).join(
+            Election.Model,
+            Election.Model.electionId == TallySheetVersionRow.Model.electionId,
+            isouter=True
+        ).join(
+            Area.Model,
+            Area.Model.areaId == TallySheetVersionRow.Model.areaId,
+            isouter=True
+        ).join(
+            Candidate.Model,
+            Candidate.Model.candidateId == TallySheetVersionRow.Model.candidateId,
+            isouter=True
+        ).join(
+            Party.Model,
+            Party.Model.partyId == TallySheetVersionRow.Model.partyId,
+            isouter=True
+        ).filter(
+            TallySheetVersionRow.Model.tallySheetVersionId == self.tallySheetVersionId,
+            *query_filter
+        ).order_by(
+            Party.Model.partyId,
+            Candidate.Model.candidateId,
+            Area.Model.areaId
+        )
+
     @hybrid_property
     def content(self):
         try:
-            meta_data_key_to_column_map = {
-                # "areaId": Area.Model.areaId,
-                "partyId": Party.Model.partyId
-            }
-
-            tally_sheet = TallySheet.get_by_id(tallySheetId=self.tallySheetId)
-            query_filter = []
-            for meta_data in tally_sheet.meta.metaDataList:
-                if meta_data.metaDataKey in meta_data_key_to_column_map:
-                    query_filter.append(
-                        meta_data_key_to_column_map[meta_data.metaDataKey] == meta_data.metaDataValue
-                    )
-
-            query_args = [
-                TallySheetVersionRow.Model.tallySheetVersionRowId,
-                TallySheetVersionRow.Model.electionId,
-                TemplateRowModel.templateRowId,
-                TemplateRowModel.templateRowType,
-                Election.Model.electionId,
-                Election.Model.voteType,
-                Election.Model.rootElectionId,
-                Area.Model.areaId,
-                Area.Model.areaName,
-                Candidate.Model.candidateId,
-                Candidate.Model.candidateName,
-                Party.Model.partyId,
-                Party.Model.partyName,
-                Party.Model.partySymbol,
-                Party.Model.partyAbbreviation,
-                TallySheetVersionRow.Model.strValue,
-                TallySheetVersionRow.Model.numValue
-            ]
-            return db.session.query(
-                *query_args
-            ).join(
-                TemplateRowModel,
-                TemplateRowModel.templateRowId == TallySheetVersionRow.Model.templateRowId
-            ).join(
-                Election.Model,
-                Election.Model.electionId == TallySheetVersionRow.Model.electionId,
-                isouter=True
-            ).join(
-                Area.Model,
-                Area.Model.areaId == TallySheetVersionRow.Model.areaId,
-                isouter=True
-            ).join(
-                Candidate.Model,
-                Candidate.Model.candidateId == TallySheetVersionRow.Model.candidateId,
-                isouter=True
-            ).join(
-                Party.Model,
-                Party.Model.partyId == TallySheetVersionRow.Model.partyId,
-                isouter=True
-            ).filter(
-                TallySheetVersionRow.Model.tallySheetVersionId == self.tallySheetVersionId,
-                *query_filter
-            ).order_by(
-                Party.Model.partyId,
-                Candidate.Model.candidateId,
-                Area.Model.areaId
-            ).all()
+            return self.get_content_query().all()
         except Exception as e:
             print("\n\n\n\n\n\n\n### ERROR ### ", e)
 
@@ -119,8 +141,7 @@ class TallySheetVersionModel(db.Model):
             tallySheetVersionId=submissionVersion.submissionVersionId
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 Model = TallySheetVersionModel
@@ -1,4 +1,5 @@
 from app import db
+from util import unit_of_work
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.associationproxy import association_proxy
 
@@ -23,8 +24,7 @@ class SubmissionVersionModel(db.Model):
 
     def set_locked(self):
         self.submission.set_locked_version(self.submissionVersionId)
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def __init__(self, submissionId):
         submission = Submission.get_by_id(submissionId=submissionId)
@@ -40,8 +40,7 @@ class SubmissionVersionModel(db.Model):
             submissionId=submissionId,
             submissionVersionId=historyVersion.historyVersionId,
         )
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 Model = SubmissionVersionModel
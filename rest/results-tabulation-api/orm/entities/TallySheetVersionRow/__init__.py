@@ -2,6 +2,8 @@ from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 
 from app import db
+from util import unit_of_work
+from util.id_allocation import take_ids
 from orm.entities import Area, Election, Candidate, Party
 
 
@@ -20,6 +22,10 @@ class TallySheetVersionRow_Model(db.Model):
     strValue = db.Column(db.String(100), nullable=True)
     dateValue = db.Column(db.DateTime, nullable=True)
 
+    __table_args__ = (
+        db.Index('ix_tallySheetVersionRow_tallySheetVersionId_templateRowId', "tallySheetVersionId", "templateRowId"),
+    )
+
     election = relationship(Election.Model, foreign_keys=[electionId])
     area = relationship(Area.Model, foreign_keys=[areaId])
     candidate = relationship(Candidate.Model, foreign_keys=[candidateId])
@@ -41,8 +47,7 @@ class TallySheetVersionRow_Model(db.Model):
             partyId=partyId,
             ballotBoxId=ballotBoxId
         )
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 Model = TallySheetVersionRow_Model
@@ -59,7 +64,31 @@ def create(templateRow, electionId, tallySheetVersion, numValue=None, strValue=N
         areaId=areaId,
         candidateId=candidateId,
         partyId=partyId,
-        ballotBoxId=None
+        ballotBoxId=ballotBoxId
     )
 
     return result
+
+
+def create_all(tallySheetVersion, rows):
+    # The ids are taken from the id blocks, as for the rows created one by one.
+    mappings = [
+        {
+            "tallySheetVersionRowId": tally_sheet_version_row_id,
+            "templateRowId": row["templateRowId"],
+            "tallySheetVersionId": tallySheetVersion.tallySheetVersionId,
+            "electionId": row.get("electionId"),
+            "numValue": row.get("numValue"),
+            "strValue": row.get("strValue"),
+            "areaId": row.get("areaId"),
+            "candidateId": row.get("candidateId"),
+            "partyId": row.get("partyId"),
+            "ballotBoxId": row.get("ballotBoxId")
+        } for row, tally_sheet_version_row_id in zip(rows, take_ids(Model, len(rows)))
+    ]
+
+    # Rows of a version are written as a single multi-row insert instead of one flush per row.
+    if len(mappings) > 0:
+        db.session.bulk_insert_mappings(Model, mappings)
+
+    return mappings
@@ -4,6 +4,7 @@ from sqlalchemy.orm import relationship
 from constants import TALLY_SHEET_COLUMN_SOURCE
 from ext import ExtendedTallySheetVersion
 from app import db
+from util import unit_of_work
 
 
 class TemplateModel(db.Model):
@@ -12,6 +13,10 @@ class TemplateModel(db.Model):
     templateId = db.Column(db.Integer, primary_key=True, autoincrement=True)
     templateName = db.Column(db.String(100), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_template_templateName', "templateName"),
+    )
+
     rows = relationship("TemplateRowModel")
 
     @hybrid_property
@@ -37,8 +42,7 @@ class TemplateModel(db.Model):
             templateName=templateName
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def add_row(self, templateRowType, hasMany=False, isDerived=False, columns=[]):
         templateRow = TemplateRowModel(
@@ -82,8 +86,7 @@ class TemplateRowModel(db.Model):
             isDerived=isDerived
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
     def add_derivative_template_row(self, derivativeTemplateRow):
         TemplateRow_DerivativeTemplateRow_Model(
@@ -123,8 +126,7 @@ class TemplateRowColumnModel(db.Model):
             func=func
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 class TemplateRow_DerivativeTemplateRow_Model(db.Model):
@@ -138,8 +140,7 @@ class TemplateRow_DerivativeTemplateRow_Model(db.Model):
             derivativeTemplateRowId=derivativeTemplateRowId
         )
 
-        db.session.add(self)
-        db.session.flush()
+        unit_of_work.add(self)
 
 
 def create(templateName):
@@ -23,6 +23,8 @@ from orm.entities.Election import InvalidVoteCategory
 from orm.entities.Dashboard import StatusCE201
 from orm.entities.Dashboard import StatusPRE41
 from orm.entities.Dashboard import StatusPRE34
+from orm.entities import ResultPush
+from orm.entities import IdBlock
 
 
 # import sadisplay
@@ -0,0 +1,8 @@
+import enum
+
+
+class ResultPushStatusEnum(enum.Enum):
+    Pending = 1
+    InProgress = 2
+    Dispatched = 3
+    Failed = 4
@@ -8,3 +8,4 @@ from orm.enums.SubmissionTypeEnum import SubmissionTypeEnum
 from orm.enums.AreaTypeEnum import AreaTypeEnum
 from orm.enums.AreaCategoryEnum import AreaCategoryEnum
 from orm.enums.InvoiceStageEnum import InvoiceStageEnum
+from orm.enums.ResultPushStatusEnum import ResultPushStatusEnum
@@ -16,9 +16,17 @@ from orm.entities.Template import TemplateRowModel
 from orm.enums import StationaryItemTypeEnum, ProofTypeEnum, OfficeTypeEnum, SubmissionTypeEnum, ElectorateTypeEnum, \
     AreaTypeEnum, BallotTypeEnum
 from marshmallow_enum import EnumField
+from util import instrumentation
 
 
-class StampSchema(ma.ModelSchema):
+class ModelSchema(ma.ModelSchema):
+    def dump(self, *args, **kwargs):
+        # Timed as the serialization of the request, along with the schemas nested in it.
+        with instrumentation.timed(instrumentation.SERIALIZATION):
+            return super(ModelSchema, self).dump(*args, **kwargs)
+
+
+class StampSchema(ModelSchema):
     class Meta:
         fields = (
             "stampId",
@@ -32,7 +40,7 @@ class StampSchema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class MetaDataSchema(ma.ModelSchema):
+class MetaDataSchema(ModelSchema):
     class Meta:
         fields = (
             "metaDataKey",
@@ -45,7 +53,7 @@ class MetaDataSchema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class File_Schema(ma.ModelSchema):
+class File_Schema(ModelSchema):
     class Meta:
         fields = (
             "fileId",
@@ -64,7 +72,7 @@ class File_Schema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class CandidateSchema(ma.ModelSchema):
+class CandidateSchema(ModelSchema):
     class Meta:
         fields = (
             "candidateId",
@@ -81,7 +89,7 @@ class CandidateSchema(ma.ModelSchema):
     candidateProfileImageFile = ma.Nested(File_Schema)
 
 
-class PartySchema(ma.ModelSchema):
+class PartySchema(ModelSchema):
     class Meta:
         fields = (
             "partyId",
@@ -101,7 +109,7 @@ class PartySchema(ma.ModelSchema):
     candidates = ma.Nested(CandidateSchema, many=True)
 
 
-class ElectionSchema(ma.ModelSchema):
+class ElectionSchema(ModelSchema):
     class Meta:
         fields = (
             "electionId",
@@ -134,7 +142,7 @@ class ElectionSchema(ma.ModelSchema):
     ])
 
 
-class TallySheetVersionRow_Schema(ma.ModelSchema):
+class TallySheetVersionRow_Schema(ModelSchema):
     class Meta:
         fields = (
             "tallySheetVersionRowId",
@@ -156,7 +164,7 @@ class TallySheetVersionRow_Schema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class AreaSchema(ma.ModelSchema):
+class AreaSchema(ModelSchema):
     class Meta:
         fields = (
             "areaId",
@@ -181,7 +189,7 @@ class AreaSchema(ma.ModelSchema):
     areaMapList = ma.Nested('AreaMapSchema', many=True, partial=True)
 
 
-class AreaMapSchema(ma.ModelSchema):
+class AreaMapSchema(ModelSchema):
     class Meta:
         fields = (
             "pollingStationId",
@@ -197,7 +205,7 @@ class AreaMapSchema(ma.ModelSchema):
         )
 
 
-class AreaAreaSchema(ma.ModelSchema):
+class AreaAreaSchema(ModelSchema):
     class Meta:
         fields = (
             "parentAreaId",
@@ -210,7 +218,7 @@ class AreaAreaSchema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class ElectorateSchema(ma.ModelSchema):
+class ElectorateSchema(ModelSchema):
     class Meta:
         fields = (
             "electorateId",
@@ -239,7 +247,7 @@ class ElectorateSchema(ma.ModelSchema):
     districtCentres = ma.Nested('AreaSchema', only=["areaId", "areaName", "areaType"], many=True)
 
 
-class OfficeSchema(ma.ModelSchema):
+class OfficeSchema(ModelSchema):
     class Meta:
         fields = (
             "officeId",
@@ -268,7 +276,7 @@ class OfficeSchema(ma.ModelSchema):
     districtCentres = ma.Nested('AreaSchema', only=["areaId", "areaName", "areaType"], many=True)
 
 
-class Proof_Schema(ma.ModelSchema):
+class Proof_Schema(ModelSchema):
     class Meta:
         fields = (
             "proofId",
@@ -286,7 +294,7 @@ class Proof_Schema(ma.ModelSchema):
     proofType = EnumField(ProofTypeEnum)
 
 
-class SubmissionSchema(ma.ModelSchema):
+class SubmissionSchema(ModelSchema):
     class Meta:
         fields = (
             "submissionId",
@@ -310,7 +318,7 @@ class SubmissionSchema(ma.ModelSchema):
     submissionProof = ma.Nested(Proof_Schema)
 
 
-class SubmissionVersionSchema(ma.ModelSchema):
+class SubmissionVersionSchema(ModelSchema):
     class Meta:
         fields = (
             "submissionVersionId",
@@ -327,7 +335,7 @@ class SubmissionVersionSchema(ma.ModelSchema):
     submission = EnumField(SubmissionSchema)
 
 
-class TallySheetVersionSchema(ma.ModelSchema):
+class TallySheetVersionSchema(ModelSchema):
     class Meta:
         fields = (
             "tallySheetId",
@@ -349,7 +357,7 @@ class TallySheetVersionSchema(ma.ModelSchema):
     content = ma.Nested(TallySheetVersionRow_Schema, many=True)
 
 
-class TallySheetSchema(ma.ModelSchema):
+class TallySheetSchema(ModelSchema):
     class Meta:
         fields = (
             "tallySheetId",
@@ -393,7 +401,7 @@ class TallySheetSchema(ma.ModelSchema):
     areaMapList = ma.Nested('AreaMapSchema', many=True, partial=True)
 
 
-class TemplateRowSchema(ma.ModelSchema):
+class TemplateRowSchema(ModelSchema):
     class Meta:
         fields = (
             "templateRowId",
@@ -408,7 +416,7 @@ class TemplateRowSchema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class TemplateSchema(ma.ModelSchema):
+class TemplateSchema(ModelSchema):
     class Meta:
         fields = (
             "templateId",
@@ -425,7 +433,7 @@ class TemplateSchema(ma.ModelSchema):
     rows = ma.Nested(TemplateRowSchema, many=True)
 
 
-class StationaryItem_Schema(ma.ModelSchema):
+class StationaryItem_Schema(ModelSchema):
     stationaryItemType = EnumField(StationaryItemTypeEnum)
 
     class Meta:
@@ -442,7 +450,7 @@ class StationaryItem_Schema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class Invoice_Schema(ma.ModelSchema):
+class Invoice_Schema(ModelSchema):
     class Meta:
         fields = (
             "invoiceId",
@@ -462,7 +470,7 @@ class Invoice_Schema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class Invoice_StationaryItem_Schema(ma.ModelSchema):
+class Invoice_StationaryItem_Schema(ModelSchema):
     class Meta:
         fields = (
             "received",
@@ -488,7 +496,7 @@ class Invoice_StationaryItem_Schema(ma.ModelSchema):
     receivedProof = ma.Nested(Proof_Schema)
 
 
-class InvalidVoteCategory_Schema(ma.ModelSchema):
+class InvalidVoteCategory_Schema(ModelSchema):
     class Meta:
         fields = (
             "invalidVoteCategoryId",
@@ -501,7 +509,7 @@ class InvalidVoteCategory_Schema(ma.ModelSchema):
         sqla_session = db.session
 
 
-class Ballot_Schema(ma.ModelSchema):
+class Ballot_Schema(ModelSchema):
     class Meta:
         fields = (
             "ballotId",
@@ -520,7 +528,7 @@ class Ballot_Schema(ma.ModelSchema):
     stationaryItem = ma.Nested(StationaryItem_Schema)
 
 
-class BallotBox_Schema(ma.ModelSchema):
+class BallotBox_Schema(ModelSchema):
     class Meta:
         fields = (
             "ballotBoxId",
@@ -537,7 +545,7 @@ class BallotBox_Schema(ma.ModelSchema):
     stationaryItem = ma.Nested(StationaryItem_Schema)
 
 
-class BallotBookSchema(ma.ModelSchema):
+class BallotBookSchema(ModelSchema):
     class Meta:
         fields = (
             "stationaryItemId",
@@ -0,0 +1,155 @@
+import datetime
+import decimal
+import time
+import uuid
+
+from marshmallow import fields, missing, Schema
+
+from schemas import TallySheetSchema, TallySheetVersionSchema, ElectionSchema
+from util import instrumentation
+
+# Types of the values for which marshmallow infers a field that converts the value, if the field is not declared.
+INFERRED_TYPES = {bytes, datetime.datetime, datetime.date, datetime.time, datetime.timedelta, decimal.Decimal,
+                  uuid.UUID}
+
+_inferred_fields = {value_type: Schema.TYPE_MAPPING[value_type]() for value_type in INFERRED_TYPES}
+
+_compiled_serializers = {}
+
+
+def _get_value(obj, attr):
+    if isinstance(obj, dict):
+        return obj.get(attr, missing)
+    else:
+        return getattr(obj, attr, missing)
+
+
+def _serialize_inferred(value, attr, obj):
+    return _inferred_fields[type(value)]._serialize(value, attr, obj)
+
+
+class CompiledSerializer:
+    """
+    Dumps the same data as the schema it's compiled from would, with a function generated for the fields of the schema.
+    Hence the fields are read and converted inline rather than through the marshmallow field machinery.
+
+    Marshmallow infers the type of an undeclared field from the first object dumped, whereas here it's inferred from
+    each value.
+    """
+
+    def __init__(self, schema_class, only=None, exclude=()):
+        self.schema_class = schema_class
+        self.only = only
+        self.exclude = exclude
+        self.source = None
+        self._serialize = None
+
+    def dump(self, obj):
+        with instrumentation.timed(instrumentation.SERIALIZATION):
+            return self._serialize(obj)
+
+    def dump_many(self, objs):
+        serialize = self._serialize
+
+        with instrumentation.timed(instrumentation.SERIALIZATION):
+            return [serialize(obj) for obj in objs]
+
+
+def _get_field_expression(field_index, field, is_declared, namespace):
+    field_name = "field_%d" % field_index
+    namespace[field_name] = field
+    serialize_field = "%s._serialize(value, attr, obj)" % field_name
+
+    if not is_declared:
+        return "_serialize_inferred(value, attr, obj) if type(value) in INFERRED_TYPES else value"
+
+    field_type = type(field)
+    if field_type in (fields.Field, fields.Raw):
+        return "value"
+    elif field_type is fields.Integer and not field.as_string:
+        return "value if type(value) is int else %s" % serialize_field
+    elif field_type is fields.String:
+        return "value if type(value) is str else %s" % serialize_field
+    elif field_type is fields.Boolean:
+        return "value if type(value) is bool else %s" % serialize_field
+    elif isinstance(field, fields.Nested):
+        nested_schema = field.schema
+        nested_serializer_name = "nested_%d" % field_index
+        namespace[nested_serializer_name] = compile_serializer(type(nested_schema), only=nested_schema.only,
+                                                               exclude=nested_schema.exclude)
+
+        if isinstance(field.only, str):
+            # Only the value of the field is dumped, instead of an object.
+            serialize_nested = "%s._serialize(%%s)[%r]" % (nested_serializer_name, field.only)
+        else:
+            serialize_nested = "%s._serialize(%%s)" % nested_serializer_name
+
+        if field.many:
+            return "None if value is None else [%s for item in value]" % (serialize_nested % "item")
+        else:
+            return "None if value is None else %s" % (serialize_nested % "value")
+    else:
+        return serialize_field
+
+
+def compile_serializer(schema_class, only=None, exclude=()):
+    key = (schema_class, None if only is None else frozenset(only), frozenset(exclude))
+    if key in _compiled_serializers:
+        return _compiled_serializers[key]
+
+    # Registered before the fields are compiled, so that a schema nesting itself refers the same serializer.
+    serializer = _compiled_serializers[key] = CompiledSerializer(schema_class, only=only, exclude=exclude)
+
+    schema = schema_class(only=only, exclude=exclude)
+    namespace = {
+        "missing": missing,
+        "get_value": _get_value,
+        "INFERRED_TYPES": INFERRED_TYPES,
+        "_serialize_inferred": _serialize_inferred
+    }
+    source_lines = ["def serialize(obj):", "    data = {}"]
+    for field_index, (field_name, field) in enumerate(sorted(schema.fields.items())):
+        attr = field.attribute or field_name
+        source_lines += [
+            "    attr = %r" % attr,
+            "    value = get_value(obj, attr)",
+            "    if value is not missing:",
+            "        data[%r] = %s" % (field.dump_to or field_name, _get_field_expression(
+                field_index, field, is_declared=field_name in schema.declared_fields, namespace=namespace))
+        ]
+    source_lines.append("    return data")
+
+    serializer.source = "\n".join(source_lines)
+    exec(compile(serializer.source, "<serializer %s>" % schema_class.__name__, "exec"), namespace)
+    serializer._serialize = namespace["serialize"]
+
+    return serializer
+
+
+def benchmark(schema_class, serializer, objs, seconds=1.0):
+    """
+    Dumps the objects repeatedly for the given seconds, with the schema and then with the compiled serializer.
+
+    :return: (rows per second with the schema, rows per second with the serializer)
+    """
+
+    def _get_rows_per_second(dump_many):
+        dump_many()  # Warmed up first, so that the lazy loaded attributes are not counted.
+
+        started_at = time.time()
+        row_count = 0
+        while time.time() - started_at < seconds:
+            dump_many()
+            row_count += len(objs)
+
+        return row_count / (time.time() - started_at)
+
+    return (
+        _get_rows_per_second(lambda: schema_class(many=True).dump(objs).data),
+        _get_rows_per_second(lambda: serializer.dump_many(objs))
+    )
+
+
+TallySheetSerializer = compile_serializer(TallySheetSchema)
+TallySheetVersionSerializer = compile_serializer(TallySheetVersionSchema)
+ElectionSerializer = compile_serializer(ElectionSchema)
@@ -0,0 +1,56 @@
+from flask import Response
+from jose import jwt
+
+from app import db
+
+from auth import AREA_CLAIM_PREFIX, DATA_EDITOR_ROLE, ROLE_CLAIM, ROLE_PREFIX, SUB
+from constants.AUTH_CONSTANTS import JWT_TOKEN_HEADER_KEY
+from exception.messages import MESSAGE_CODE_TALLY_SHEET_NOT_FOUND
+from orm.entities.Submission.TallySheet import TallySheetModel
+from tests.util import audited_request_context
+
+
+def _get_token_without_areas():
+    jwt_payload = {
+        ROLE_CLAIM: [ROLE_PREFIX + DATA_EDITOR_ROLE],
+        SUB: "no-areas@carbon.super",
+        AREA_CLAIM_PREFIX + DATA_EDITOR_ROLE: str([])
+    }
+
+    return jwt.encode(jwt_payload, "jwt_secret")
+
+
+class TestTallySheetVersionApi:
+
+    def test_get_all(self, test_client):
+        tally_sheet = TallySheetModel.query.first()
+
+        response: Response = test_client.get("/tally-sheet/%d/version" % tally_sheet.tallySheetId)
+        assert response.status_code == 200
+
+    def test_get_all_without_area_access(self, test_client):
+        tally_sheet = TallySheetModel.query.first()
+
+        response: Response = test_client.get("/tally-sheet/%d/version" % tally_sheet.tallySheetId,
+                                             headers={JWT_TOKEN_HEADER_KEY: _get_token_without_areas()})
+        assert response.status_code == 404
+        assert response.get_json(force=True)["code"] == MESSAGE_CODE_TALLY_SHEET_NOT_FOUND
+
+    def test_html_weak_etag(self, test_client):
+        tally_sheet = TallySheetModel.query.first()
+
+        with audited_request_context():
+            tally_sheet_version_id = tally_sheet.create_empty_version().tallySheetVersionId
+            db.session.commit()
+
+        html_url = "/tally-sheet/%d/version/%d/html" % (tally_sheet.tallySheetId, tally_sheet_version_id)
+
+        response: Response = test_client.get(html_url)
+        assert response.status_code == 200
+
+        # Weak, since the footer carries the requesting user and the time of the request.
+        etag, is_weak = response.get_etag()
+        assert is_weak
+
+        response: Response = test_client.get(html_url, headers={"If-None-Match": 'W/"%s"' % etag})
+        assert response.status_code == 304
@@ -0,0 +1,20 @@
+from flask import Response
+
+from util import instrumentation
+
+
+class TestMetrics:
+
+    def test_get_metrics(self, test_client):
+        response: Response = test_client.get("/tally-sheet")
+        assert response.status_code == 200
+
+        response: Response = test_client.get("/metrics")
+        assert response.status_code == 200
+        assert response.content_type == instrumentation.METRICS_MIMETYPE
+
+        metrics_text = response.get_data(as_text=True)
+        assert '# TYPE tabulation_request_db_queries histogram' in metrics_text
+        assert 'tabulation_request_db_queries_count{endpoint="/tally-sheet",method="GET"}' in metrics_text
+        assert 'tabulation_request_duration_seconds_bucket{endpoint="/tally-sheet",method="GET",le="+Inf"}' in \
+               metrics_text
@@ -0,0 +1,106 @@
+import re
+
+from flask import Response
+from sqlalchemy import event
+
+from app import db
+from orm.entities import Election
+from orm.entities.Area import AreaIndex
+from orm.entities.Submission.TallySheet import TallySheetModel, TallySheetTallySheetModel, \
+    _get_derived_template_row_results
+from tests.util import audited_request_context
+
+# Tables that grow with the elections, which the hot queries must never scan in full.
+INDEXED_TABLE_NAMES = {"submission", "template", "tallySheetVersionRow", "tallySheet_tallySheet", "area"}
+
+
+def _get_table_name(table_alias):
+    # Aliases are named by SQLAlchemy after the table, e.g. area_1.
+    return re.sub(r"_\d+$", "", table_alias)
+
+
+def _get_full_scans(statement, parameters):
+    cursor = db.session.connection().connection.cursor()
+
+    if db.engine.dialect.name == "sqlite":
+        cursor.execute("EXPLAIN QUERY PLAN %s" % statement, parameters)
+        table_aliases = [match.group(1) for match in [re.match(r"^SCAN (?:TABLE )?(\w+)$", row[3])
+                                                      for row in cursor.fetchall()] if match is not None]
+    else:
+        cursor.execute("EXPLAIN %s" % statement, parameters)
+        column_names = [column[0] for column in cursor.description]
+        table_aliases = [row["table"] for row in [dict(zip(column_names, row)) for row in cursor.fetchall()]
+                         if row["type"] == "ALL"]
+
+    return [table_alias for table_alias in table_aliases if _get_table_name(table_alias) in INDEXED_TABLE_NAMES]
+
+
+def _assert_no_full_scans(callback):
+    """
+    Explains every query run by the callback, and fails if any of them scans an indexed table in full.
+    """
+    statements = []
+
+    def _capture_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", _capture_statement)
+    try:
+        callback()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _capture_statement)
+
+    assert len(statements) > 0
+
+    full_scans = {}
+    for statement, parameters in statements:
+        table_aliases = _get_full_scans(statement, parameters)
+        if len(table_aliases) > 0:
+            full_scans[statement] = table_aliases
+
+    assert full_scans == {}
+
+
+class TestQueryPlans:
+
+    def test_get_all_tally_sheets(self, test_client):
+        election = Election.Model.query.filter(Election.Model.parentElectionId == None).first()
+
+        def _get_all():
+            response: Response = test_client.get(
+                "/tally-sheet?electionId=%d&tallySheetCode=PRE-41" % election.electionId)
+            assert response.status_code == 200
+
+        _assert_no_full_scans(_get_all)
+
+    def test_get_tally_sheet_version_content(self, test_client):
+        tally_sheet = TallySheetModel.query.first()
+        with audited_request_context():
+            tally_sheet_version = tally_sheet.create_empty_version()
+            db.session.commit()
+
+        def _get_version():
+            response: Response = test_client.get("/tally-sheet/%d/version/%d" % (
+                tally_sheet.tallySheetId, tally_sheet_version.tallySheetVersionId))
+            assert response.status_code == 200
+
+        _assert_no_full_scans(_get_version)
+
+    def test_get_derived_template_row_results(self, test_client):
+        tally_sheet_tally_sheet = TallySheetTallySheetModel.query.first()
+        tally_sheet = TallySheetModel.query.filter(
+            TallySheetModel.tallySheetId == tally_sheet_tally_sheet.parentTallySheetId).one()
+        template_rows = [template_row for template_row in tally_sheet.template.rows if template_row.isDerived]
+
+        for template_row in template_rows:
+            # The template row and its columns are loaded before hand, so that only the aggregation is explained.
+            template_row.columns
+
+            _assert_no_full_scans(lambda: _get_derived_template_row_results(
+                tallySheetId=tally_sheet.tallySheetId, templateRow=template_row))
+
+    def test_build_area_index(self, test_client):
+        election = Election.Model.query.filter(Election.Model.parentElectionId == None).first()
+
+        _assert_no_full_scans(lambda: AreaIndex.AreaIndex(rootElectionId=election.electionId, hierarchyVersion=None))
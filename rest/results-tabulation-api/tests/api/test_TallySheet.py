@@ -1,4 +1,7 @@
 from flask import Response
+from sqlalchemy import event
+
+from app import db
 
 
 class TestTallySheet:
@@ -56,3 +59,47 @@ class TestTallySheet:
         )
         assert response.status_code == 200
         assert len(response.get_json()) > 0
+
+    def test_get_all_query_count(self, test_client):
+        statements = []
+
+        def _count_statement(*args):
+            statements.append(args[2])
+
+        event.listen(db.engine, "before_cursor_execute", _count_statement)
+        try:
+            query_counts = {}
+            for limit in [1, 10, 50]:
+                # Warmed up first, so that the area hierarchy cached per process is not counted.
+                test_client.get("/tally-sheet?limit=%d" % limit)
+
+                del statements[:]
+                response: Response = test_client.get("/tally-sheet?limit=%d" % limit)
+                assert response.status_code == 200
+
+                query_counts[limit] = len(statements)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _count_statement)
+
+        # The stamps are not queried for a page without any of them, hence the counts may differ by those three.
+        assert query_counts[1] <= query_counts[10] <= query_counts[50] <= query_counts[1] + 3
+
+    def test_get_all_pages(self, test_client):
+        tally_sheet_ids = []
+
+        url = "/tally-sheet?limit=10"
+        while url is not None:
+            response: Response = test_client.get(url)
+            assert response.status_code == 200
+            assert len(response.get_json()) <= 10
+
+            tally_sheet_ids += [tally_sheet["tallySheetId"] for tally_sheet in response.get_json()]
+
+            next_cursor = response.headers.get("X-Next-Cursor")
+            url = None if next_cursor is None else "/tally-sheet?limit=10&cursor=%s" % next_cursor
+
+        assert tally_sheet_ids == sorted(set(tally_sheet_ids))
+
+    def test_get_all_invalid_cursor(self, test_client):
+        response: Response = test_client.get("/tally-sheet?cursor=invalid")
+        assert response.status_code == 400
@@ -1,12 +1,13 @@
 import os
-from datetime import datetime
-from unittest.mock import patch
 
 import pytest
+from werkzeug.datastructures import FileStorage
 
 from app import create_app, db
+from constants.AUTH_CONSTANTS import JWT_TOKEN_HEADER_KEY
+from constants.ELECTION_TEMPLATES import PRESIDENTIAL_ELECTION_2019
 from orm.entities import Election
-from orm.entities.Audit.Stamp import Stamp
+from tests.util import audited_request_context
 
 
 @pytest.fixture(scope="session")
@@ -15,30 +16,25 @@ def test_client():
     flask_app = connex_app.app
     tc = flask_app.test_client()
 
-    @patch("orm.entities.Audit.Stamp.create")
-    def create_test_election(mock_stamp_create):
-        mock_stamp = Stamp()
-        mock_stamp.ip = "0.0.0.0"
-        mock_stamp.createdBy = "TestAdmin"
-        mock_stamp.createdAt = datetime.now()
-        db.session.add(mock_stamp)
-        db.session.flush()
-        mock_stamp_create.return_value = mock_stamp
-
-        from orm.entities.Election.election_helper import build_presidential_election
-        election = Election.create(electionName="Test Election")
-
-        basedir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "sample-data", "test")
-        party_candidate_dataset_file = os.path.join(basedir, "party-candidate.csv")
-        polling_station_dataset_file = os.path.join(basedir, "data.csv")
-        postal_counting_centers_dataset_file = os.path.join(basedir, "postal-data.csv")
-        invalid_vote_categories_dataset_file = os.path.join(basedir, "invalid-vote-categories.csv")
-
-        build_presidential_election(root_election=election,
-                                    party_candidate_dataset_file=party_candidate_dataset_file,
-                                    polling_station_dataset_file=polling_station_dataset_file,
-                                    postal_counting_centers_dataset_file=postal_counting_centers_dataset_file,
-                                    invalid_vote_categories_dataset_file=invalid_vote_categories_dataset_file)
+    def create_test_election():
+        basedir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "ext", "ExtendedElection",
+                               "ExtendedElectionPresidentialElection2019", "sample-config-data", "1")
+
+        def _get_dataset_file(file_name):
+            file_path = os.path.join(basedir, file_name)
+
+            return FileStorage(stream=open(file_path, "rb"), filename=file_name, content_type="text/csv")
+
+        with audited_request_context(flask_app):
+            election = Election.create(
+                electionTemplateName=PRESIDENTIAL_ELECTION_2019, electionName="Test Election", isListed=True,
+                party_candidate_dataset_file=_get_dataset_file("party-candidate-dataset.csv"),
+                polling_station_dataset_file=_get_dataset_file("polling-stations-dataset.csv"),
+                postal_counting_centers_dataset_file=_get_dataset_file("postal-counting-centres-dataset.csv"),
+                invalid_vote_categories_dataset_file=_get_dataset_file("invalid-vote-categories-dataset.csv")
+            )
+            db.session.commit()
+
         return election
 
     with connex_app.app.app_context():
@@ -50,6 +46,6 @@ def test_client():
         from orm.entities.Election.election_helper import get_root_token
         jwt_token = get_root_token(election.electionId)
 
-        tc.environ_base['HTTP_AUTHORIZATION'] = 'Bearer ' + jwt_token
+        tc.environ_base['HTTP_' + JWT_TOKEN_HEADER_KEY.upper().replace('-', '_')] = jwt_token
 
         yield tc
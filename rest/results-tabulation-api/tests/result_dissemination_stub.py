@@ -0,0 +1,46 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class ResultDisseminationStub:
+    """
+    A local stand in for the result dissemination system, which records the pushed requests.
+    """
+
+    def __init__(self, failure_count=0, status_code=200):
+        self.requests = []
+        self.failure_count = failure_count
+        self.status_code = status_code
+
+        stub = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                content_length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(content_length)
+                stub.requests.append({"path": self.path, "headers": dict(self.headers), "body": body})
+
+                status_code = stub.status_code
+                if len(stub.requests) <= stub.failure_count:
+                    status_code = 503
+
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(json.dumps({"status": status_code}).encode())
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), RequestHandler)
+        self.url = "http://127.0.0.1:%d" % self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
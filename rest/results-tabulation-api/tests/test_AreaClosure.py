@@ -0,0 +1,96 @@
+from flask import g
+
+from app import db
+from constants.VOTE_TYPES import Postal, NonPostal, PostalAndNonPostal
+from orm.entities import Area, Election
+from orm.entities.Area import AreaClosure, AreaIndex
+from orm.enums import AreaTypeEnum
+
+AREAS = [
+    (1, AreaTypeEnum.Country, PostalAndNonPostal),
+    (2, AreaTypeEnum.ElectoralDistrict, PostalAndNonPostal),
+    (3, AreaTypeEnum.PollingDivision, PostalAndNonPostal),
+    (4, AreaTypeEnum.CountingCentre, Postal),
+    (5, AreaTypeEnum.CountingCentre, NonPostal),
+    (6, AreaTypeEnum.PollingStation, PostalAndNonPostal),
+    (7, AreaTypeEnum.CountingCentre, Postal)
+]
+AREA_AREA_LIST = [(1, 2), (2, 3), (3, 6), (2, 4), (2, 5), (4, 6), (5, 6), (5, 7), (1, 6), (8, 1)]
+
+
+def _get_closure_map(closure_rows):
+    return {(closure_row["ancestorId"], closure_row["descendantId"], closure_row["voteType"]): closure_row["depth"]
+            for closure_row in closure_rows}
+
+
+def _get_election_closure_rows(root_election):
+    return sorted(db.session.query(
+        AreaClosure.Model.ancestorId, AreaClosure.Model.descendantId, AreaClosure.Model.voteType,
+        AreaClosure.Model.depth, AreaClosure.Model.ancestorType, AreaClosure.Model.descendantType
+    ).filter(
+        AreaClosure.Model.ancestorId == Area.Model.areaId,
+        Area.Model.electionId == Election.Model.electionId,
+        Election.Model.rootElectionId == root_election.electionId
+    ).all(), key=lambda closure_row: closure_row[:3])
+
+
+class TestAreaClosure:
+
+    def test_get_closure_rows(self):
+        closure_rows = AreaClosure.get_closure_rows(AREAS, AREA_AREA_LIST)
+        closure_map = _get_closure_map(closure_rows)
+
+        # Every area is paired with itself, tagged with its own vote type.
+        for area_id, area_type, vote_type in AREAS:
+            assert closure_map[(area_id, area_id, vote_type)] == 0
+
+        # Reached through the polling division and through both counting centres.
+        assert {key: depth for key, depth in closure_map.items() if key[:2] == (2, 6)} == {
+            (2, 6, PostalAndNonPostal): 2, (2, 6, Postal): 2, (2, 6, NonPostal): 2
+        }
+
+        # The shortest of the paths of the same vote type.
+        assert closure_map[(1, 6, PostalAndNonPostal)] == 1
+        assert closure_map[(1, 6, Postal)] == 3
+
+        # A path can't cross both a non postal and a postal counting centre.
+        assert [key for key in closure_map if key[:2] in [(5, 7), (2, 7), (1, 7)]] == []
+
+        # The links of the areas not given are left out.
+        assert [key for key in closure_map if 8 in key[:2]] == []
+
+        assert {(closure_row["ancestorType"], closure_row["descendantType"]) for closure_row in closure_rows
+                if closure_row["ancestorId"] == 2 and closure_row["descendantId"] == 4} == {
+                   (AreaTypeEnum.ElectoralDistrict, AreaTypeEnum.CountingCentre)}
+
+    def test_build(self, test_client):
+        root_election = Election.Model.query.filter(Election.Model.parentElectionId == None).first()
+        closure_rows = _get_election_closure_rows(root_election)
+        hierarchy_version = AreaIndex.get_hierarchy_version(rootElectionId=root_election.electionId)
+
+        # Every link of the election is a closure row of depth one.
+        closure_keys = {closure_row[:2] for closure_row in closure_rows if closure_row.depth == 1}
+        area_area_list = db.session.query(Area.AreaAreaModel.parentAreaId, Area.AreaAreaModel.childAreaId).filter(
+            Area.AreaAreaModel.parentAreaId == Area.Model.areaId,
+            Area.Model.electionId == Election.Model.electionId,
+            Election.Model.rootElectionId == root_election.electionId
+        ).all()
+        assert len(area_area_list) > 0
+        assert {tuple(area_area) for area_area in area_area_list} <= closure_keys
+
+        # Built again from scratch, with the same rows, and the area index is invalidated.
+        AreaClosure.Model.query.filter(AreaClosure.Model.ancestorId.in_(
+            db.session.query(Area.Model.areaId).filter(
+                Area.Model.electionId == Election.Model.electionId,
+                Election.Model.rootElectionId == root_election.electionId
+            )
+        )).delete(synchronize_session=False)
+        assert _get_election_closure_rows(root_election) == []
+
+        AreaClosure.build(root_election)
+
+        assert _get_election_closure_rows(root_election) == closure_rows
+        assert AreaIndex.get_hierarchy_version(rootElectionId=root_election.electionId) != hierarchy_version
+
+        db.session.rollback()
+        g.pop("area_hierarchy_versions", None)
@@ -0,0 +1,52 @@
+import pytest
+
+from orm.entities import Election
+from orm.entities.Area import AreaIndex
+from orm.enums import AreaTypeEnum
+
+
+def _get_area_index():
+    root_election = Election.Model.query.filter(Election.Model.parentElectionId == None).first()
+
+    return AreaIndex.AreaIndex(rootElectionId=root_election.electionId, hierarchyVersion=None)
+
+
+def _get_sort_key(area_map_row, column_names):
+    return [(getattr(area_map_row, column_name) is not None, getattr(area_map_row, column_name))
+            for column_name in column_names]
+
+
+class TestAreaIndex:
+
+    @pytest.mark.parametrize("group_by,sort_column_names", [
+        (["pollingDivisionId", "pollingDivisionName", "countingCentreId", "countingCentreName"],
+         ["countingCentreId", "pollingDivisionId"]),
+        (["pollingDivisionName", "countingCentreName"], ["countingCentreName", "pollingDivisionName"])
+    ])
+    def test_area_map_is_sorted(self, test_client, group_by, sort_column_names):
+        area_index = _get_area_index()
+        electoral_district_id = area_index.area_type_area_ids[AreaTypeEnum.ElectoralDistrict][0]
+
+        area_map = area_index.get_area_map(electoral_district_id, group_by)
+
+        assert len(area_map) > 1
+        # Postal counting centres are not in a polling division, hence sorted ahead of the others.
+        assert any(area_map_row.pollingDivisionName is None for area_map_row in area_map)
+        assert area_map == sorted(area_map, key=lambda area_map_row: _get_sort_key(area_map_row, sort_column_names))
+
+    def test_area_map_is_in_the_same_order_however_loaded(self, test_client):
+        group_by = ["pollingStationId", "pollingStationName", "countingCentreName", "pollingDivisionName"]
+        area_index = _get_area_index()
+        electoral_district_id = area_index.area_type_area_ids[AreaTypeEnum.ElectoralDistrict][0]
+        area_map = area_index.get_area_map(electoral_district_id, group_by)
+
+        # As if the rows were loaded in the reverse order, as another worker process might.
+        other_area_index = _get_area_index()
+        for descendant_id, ancestors in other_area_index.ancestors.items():
+            other_area_index.ancestors[descendant_id] = {
+                area_type: list(reversed(ancestor_ids)) for area_type, ancestor_ids in reversed(list(ancestors.items()))
+            }
+        for ancestor_id, descendants in other_area_index.descendants.items():
+            other_area_index.descendants[ancestor_id] = list(reversed(descendants))
+
+        assert other_area_index.get_area_map(electoral_district_id, group_by) == area_map
@@ -0,0 +1,17 @@
+from sqlalchemy import func
+
+from app import db
+import auth
+from orm.entities import Area
+
+
+class TestAuth:
+
+    def test_root_election_of_unknown_area_is_looked_up_again(self, test_client):
+        area = Area.Model.query.first()
+        unknown_area_id = db.session.query(func.max(Area.Model.areaId)).scalar() + 1
+
+        assert auth._get_root_election_ids([area.areaId, unknown_area_id]) == [area.election.rootElectionId]
+
+        # Not kept as a miss, since the area might be built later.
+        assert unknown_area_id not in auth._area_root_election_id_map
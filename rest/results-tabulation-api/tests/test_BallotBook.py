@@ -0,0 +1,138 @@
+import pytest
+from connexion import ProblemException
+from flask import current_app
+
+from app import db
+from exception.messages import MESSAGE_CODE_BALLOT_BOOK_INVALID_RANGE, MESSAGE_CODE_BALLOT_AMBIGUOUS_SERIAL
+from orm.entities import Election, Ballot, BallotBook, Invoice, Area
+from tests.util import audited_request_context
+
+
+def _get_election_id():
+    return Election.Model.query.filter(Election.Model.parentElectionId == None).first().electionId
+
+
+def _get_ballots(electionId, fromBallotSerial, toBallotSerial):
+    return [(ballot.ballotId, ballot.ballotSerial) for ballot in Ballot.Model.query.filter(
+        Ballot.Model.electionId == electionId,
+        Ballot.Model.ballotSerial.between(fromBallotSerial, toBallotSerial)
+    ).order_by(Ballot.Model.ballotSerial).all()]
+
+
+def _create_invoice(electionId, stationaryItemIds):
+    area_id = Area.Model.query.first().areaId
+    invoice = Invoice.create(electionId=electionId, issuingOfficeId=area_id, receivingOfficeId=area_id, issuedTo=1)
+    invoice.add_stationary_items(stationaryItemIds)
+
+    return invoice
+
+
+class TestBallotBook:
+
+    def test_create_range(self, test_client):
+        election_id = _get_election_id()
+
+        with audited_request_context():
+            Ballot.create(ballotId="000102", electionId=election_id)
+
+            # The ids are padded to the length of the first one, and the existing ballots are not created again.
+            assert Ballot.create_range(electionId=election_id, fromBallotId="000100", toBallotId="000104") == 4
+            assert _get_ballots(election_id, 100, 104) == [
+                ("000100", 100), ("000101", 101), ("000102", 102), ("000103", 103), ("000104", 104)
+            ]
+
+            ballot_book = BallotBook.create(electionId=election_id, fromBallotId="000101", toBallotId="000105")
+            assert (ballot_book.fromBallotId, ballot_book.toBallotId) == ("000101", "000105")
+            assert [ballot.ballotId for ballot in ballot_book.ballots] == [
+                "000101", "000102", "000103", "000104", "000105"
+            ]
+
+            db.session.rollback()
+
+    @pytest.mark.parametrize("fromBallotId,toBallotId", [("A100", "A105"), ("100", "10X"), ("105", "100")])
+    def test_invalid_range(self, test_client, fromBallotId, toBallotId):
+        with audited_request_context():
+            with pytest.raises(ProblemException) as error:
+                BallotBook.create(electionId=_get_election_id(), fromBallotId=fromBallotId, toBallotId=toBallotId)
+
+            assert error.value.instance == MESSAGE_CODE_BALLOT_BOOK_INVALID_RANGE
+
+            db.session.rollback()
+
+    def test_ballot_book_max_size(self, test_client):
+        election_id = _get_election_id()
+        ballot_book_max_size = current_app.config.get("BALLOT_BOOK_MAX_SIZE")
+        current_app.config["BALLOT_BOOK_MAX_SIZE"] = 10
+
+        try:
+            with audited_request_context():
+                BallotBook.create(electionId=election_id, fromBallotId="200", toBallotId="209")
+
+                with pytest.raises(ProblemException) as error:
+                    BallotBook.create(electionId=election_id, fromBallotId="300", toBallotId="310")
+                assert error.value.instance == MESSAGE_CODE_BALLOT_BOOK_INVALID_RANGE
+                assert _get_ballots(election_id, 300, 310) == []
+
+                db.session.rollback()
+        finally:
+            if ballot_book_max_size is None:
+                current_app.config.pop("BALLOT_BOOK_MAX_SIZE")
+            else:
+                current_app.config["BALLOT_BOOK_MAX_SIZE"] = ballot_book_max_size
+
+    def test_ambiguous_ballot_serial(self, test_client):
+        election_id = _get_election_id()
+
+        with audited_request_context():
+            Ballot.create(ballotId="401", electionId=election_id)
+            Ballot.create(ballotId="A401", electionId=election_id)
+
+            for ballot_id in ["0401", " 401", "401A"]:
+                with pytest.raises(ProblemException) as error:
+                    Ballot.create(ballotId=ballot_id, electionId=election_id)
+                assert error.value.instance == MESSAGE_CODE_BALLOT_AMBIGUOUS_SERIAL
+
+            db.session.rollback()
+
+    def test_ballot_book_of_ambiguous_ballot_serial(self, test_client):
+        election_id = _get_election_id()
+
+        with audited_request_context():
+            Ballot.create(ballotId="501", electionId=election_id)
+            ballot = Ballot.create(ballotId="X", electionId=election_id)
+
+            # Created before the serials were checked.
+            ballot.ballotId = "0501"
+            ballot.ballotSerial = 501
+            db.session.flush()
+
+            with pytest.raises(ProblemException) as error:
+                BallotBook.create(electionId=election_id, fromBallotId="501", toBallotId="505")
+            assert error.value.instance == MESSAGE_CODE_BALLOT_AMBIGUOUS_SERIAL
+
+            db.session.rollback()
+
+    def test_is_invoiced(self, test_client):
+        election_id = _get_election_id()
+
+        with audited_request_context():
+            ballot_book = BallotBook.create(electionId=election_id, fromBallotId="600", toBallotId="609")
+            invoice = _create_invoice(election_id, [ballot_book.stationaryItemId])
+
+            assert not ballot_book.available
+            assert BallotBook.is_invoiced(electionId=election_id, fromBallotSerial=605, toBallotSerial=615)
+            assert BallotBook.is_invoiced(electionId=election_id, fromBallotSerial=590, toBallotSerial=600)
+            assert not BallotBook.is_invoiced(electionId=election_id, fromBallotSerial=610, toBallotSerial=620)
+
+            # The ballot book of the deleted invoice is available again.
+            Invoice.delete(invoice.invoiceId)
+            assert BallotBook.get_by_id(ballot_book.stationaryItemId).available
+            assert not BallotBook.is_invoiced(electionId=election_id, fromBallotSerial=605, toBallotSerial=615)
+
+            # A ballot invoiced by itself, within the range.
+            ballot = Ballot.create(ballotId="612", electionId=election_id)
+            _create_invoice(election_id, [ballot.stationaryItemId])
+            assert BallotBook.is_invoiced(electionId=election_id, fromBallotSerial=610, toBallotSerial=620)
+            assert not BallotBook.is_invoiced(electionId=election_id, fromBallotSerial=613, toBallotSerial=620)
+
+            db.session.rollback()
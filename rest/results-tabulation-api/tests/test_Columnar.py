@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from util.columnar import ColumnarResult, _dictionary_encode
+
+
+def get_columnar_result():
+    return ColumnarResult(
+        column_names=["areaId", "areaName", "numValue"],
+        columns={"areaId": [1, 2, 1, None], "areaName": [0, 1, 0, None], "numValue": [10, None, 30, 40]},
+        dictionaries={"areaName": ["Colombo", "Gampaha"]},
+        row_count=4,
+        metadata={"tallySheetId": 1, "tallySheetVersionId": 2}
+    )
+
+
+class TestColumnar:
+
+    def test_dictionary_encode(self):
+        dictionary, indices = _dictionary_encode(["Colombo", "Gampaha", None, "Colombo"])
+
+        assert dictionary == ["Colombo", "Gampaha"]
+        assert indices == [0, 1, None, 0]
+
+    def test_to_json(self):
+        result = json.loads(get_columnar_result().to_json())
+
+        assert result["tallySheetId"] == 1
+        assert result["content"]["rowCount"] == 4
+        assert result["content"]["columns"]["areaName"] == [0, 1, 0, None]
+        assert result["content"]["dictionaries"]["areaName"] == ["Colombo", "Gampaha"]
+
+    def test_to_arrow_stream(self):
+        pa = pytest.importorskip("pyarrow")
+
+        table = pa.ipc.open_stream(get_columnar_result().to_arrow_stream()).read_all()
+
+        assert table.column_names == ["areaId", "areaName", "numValue"]
+        assert table.column("areaName").to_pylist() == ["Colombo", "Gampaha", "Colombo", None]
+        assert table.schema.metadata[b"tallySheetVersionId"] == b"2"
@@ -0,0 +1,56 @@
+from app import db
+from constants.VOTE_TYPES import Postal
+from orm.entities import Election
+from tests.util import audited_request_context
+
+
+def _get_parent_election_id_map():
+    return {election_id: parent_election_id for election_id, parent_election_id in db.session.query(
+        Election.Model.electionId, Election.Model.parentElectionId).all()}
+
+
+def _get_this_and_above_election_ids(parent_election_id_map, election_id):
+    election_ids = []
+    while election_id is not None:
+        election_ids.append(election_id)
+        election_id = parent_election_id_map[election_id]
+
+    return sorted(election_ids)
+
+
+def _get_this_and_below_election_ids(parent_election_id_map, election_id):
+    return sorted([sub_election_id for sub_election_id in parent_election_id_map
+                   if election_id in _get_this_and_above_election_ids(parent_election_id_map, sub_election_id)])
+
+
+def _get_election_ids(query):
+    return sorted([election_id for election_id, in query.all()])
+
+
+class TestElection:
+
+    def test_this_and_above_and_below_election_ids_query(self, test_client):
+        root_election = Election.Model.query.filter(Election.Model.parentElectionId == None).first()
+
+        with audited_request_context():
+            # A level below the sub elections, which the sample election doesn't have.
+            sub_election = Election.Model.query.filter(
+                Election.Model.parentElectionId == root_election.electionId).first()
+            sub_election.add_sub_election(electionName="Test Sub Sub Election", voteType=Postal)
+
+            parent_election_id_map = _get_parent_election_id_map()
+            assert max(len(_get_this_and_above_election_ids(parent_election_id_map, election_id))
+                       for election_id in parent_election_id_map) > 2
+
+            for election_id in parent_election_id_map:
+                assert _get_election_ids(Election.get_this_and_above_election_ids_query(election_id)) == \
+                       _get_this_and_above_election_ids(parent_election_id_map, election_id)
+                assert _get_election_ids(Election.get_this_and_below_election_ids_query(election_id)) == \
+                       _get_this_and_below_election_ids(parent_election_id_map, election_id)
+
+            # Used as a subquery of another query.
+            assert sorted([election.electionId for election in Election.Model.query.filter(
+                Election.Model.electionId.in_(Election.get_this_and_below_election_ids_query(sub_election.electionId))
+            ).all()]) == _get_this_and_below_election_ids(parent_election_id_map, sub_election.electionId)
+
+            db.session.rollback()
@@ -0,0 +1,162 @@
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from app import db
+from constants.ELECTION_TEMPLATES import PARLIAMENT_ELECTION_2020, PRESIDENTIAL_ELECTION_2019
+from ext.ExtendedElection.ElectionBuilder import ElectionBuilder
+from orm.entities import Area, Election, Submission, Meta, Template
+from orm.entities.Area import AreaClosure
+from orm.entities.Audit import Stamp
+from orm.entities.Election import ElectionParty, ElectionCandidate
+from orm.entities.Meta import MetaData
+from orm.entities.Submission import TallySheet
+from tests.util import audited_request_context
+
+EXTENDED_ELECTION_DIRECTORY_NAMES = {
+    PARLIAMENT_ELECTION_2020: "ExtendedElectionParliamentaryElection2020",
+    PRESIDENTIAL_ELECTION_2019: "ExtendedElectionPresidentialElection2019"
+}
+
+BUILT_MODELS = [Election.Model, Area.Model, Area.AreaAreaModel, ElectionParty.Model, Submission.Model,
+                TallySheet.Model, TallySheet.TallySheetTallySheetModel, Stamp.Model]
+
+
+def create_election(electionTemplateName, electionName, **kwargs):
+    basedir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "..", "ext", "ExtendedElection",
+                           EXTENDED_ELECTION_DIRECTORY_NAMES[electionTemplateName], "sample-config-data", "1")
+
+    def _get_dataset_file(file_name):
+        file_path = os.path.join(basedir, file_name)
+
+        return FileStorage(stream=open(file_path, "rb"), filename=file_name, content_type="text/csv")
+
+    return Election.create(
+        electionTemplateName=electionTemplateName, electionName=electionName, isListed=True,
+        party_candidate_dataset_file=_get_dataset_file("party-candidate-dataset.csv"),
+        polling_station_dataset_file=_get_dataset_file("polling-stations-dataset.csv"),
+        postal_counting_centers_dataset_file=_get_dataset_file("postal-counting-centres-dataset.csv"),
+        invalid_vote_categories_dataset_file=_get_dataset_file("invalid-vote-categories-dataset.csv"),
+        **kwargs
+    )
+
+
+def _get_row_counts():
+    return {model.__tablename__: db.session.query(model).count() for model in BUILT_MODELS}
+
+
+def _get_built_rows(root_election):
+    """
+    The rows built for an election, by the names of the rows they refer instead of the ids.
+    """
+    # The sub elections are named after the root election.
+    election_keys = {
+        election.electionId: (election.electionName.replace(root_election.electionName, "", 1), election.voteType)
+        for election in Election.Model.query.filter(Election.Model.rootElectionId == root_election.electionId)
+        if election.electionId != root_election.electionId
+    }
+    election_keys[root_election.electionId] = None
+
+    area_keys = {
+        area.areaId: (area.areaName, area.areaType, election_keys[area.electionId])
+        for area in Area.Model.query.filter(Area.Model.electionId.in_(election_keys.keys()))
+    }
+
+    tally_sheet_keys = {
+        tally_sheet_id: (template_name, area_keys[area_id], election_keys[election_id])
+        for tally_sheet_id, template_name, area_id, election_id in db.session.query(
+            TallySheet.Model.tallySheetId, Template.Model.templateName, Submission.Model.areaId,
+            Submission.Model.electionId
+        ).filter(
+            Template.Model.templateId == TallySheet.Model.templateId,
+            Submission.Model.submissionId == TallySheet.Model.tallySheetId,
+            Submission.Model.electionId.in_(election_keys.keys())
+        )
+    }
+
+    return {
+        "election": sorted(election_keys.values(), key=str),
+        "area": sorted(area_keys.values(), key=str),
+        "area_area": sorted([
+            (area_keys[area_area.parentAreaId], area_keys[area_area.childAreaId])
+            for area_area in Area.AreaAreaModel.query.filter(Area.AreaAreaModel.parentAreaId.in_(area_keys.keys()))
+        ], key=str),
+        "area_closure": sorted([
+            (area_keys[area_closure.ancestorId], area_keys[area_closure.descendantId], area_closure.voteType,
+             area_closure.depth)
+            for area_closure in AreaClosure.Model.query.filter(AreaClosure.Model.ancestorId.in_(area_keys.keys()))
+        ], key=str),
+        "election_party": sorted([
+            (election_keys[election_party.electionId], election_party.partyName)
+            for election_party in ElectionParty.Model.query.filter(
+                ElectionParty.Model.electionId.in_(election_keys.keys()))
+        ], key=str),
+        "election_candidate": sorted([
+            (election_keys[election_candidate.electionId], election_candidate.candidateName)
+            for election_candidate in ElectionCandidate.Model.query.filter(
+                ElectionCandidate.Model.electionId.in_(election_keys.keys()))
+        ], key=str),
+        "tallySheet": sorted(tally_sheet_keys.values(), key=str),
+        "tallySheet_tallySheet": sorted([
+            (tally_sheet_keys[tally_sheet_tally_sheet.parentTallySheetId],
+             tally_sheet_keys[tally_sheet_tally_sheet.childTallySheetId])
+            for tally_sheet_tally_sheet in TallySheet.TallySheetTallySheetModel.query.filter(
+                TallySheet.TallySheetTallySheetModel.parentTallySheetId.in_(tally_sheet_keys.keys()))
+        ], key=str)
+    }
+
+
+class TestElectionBuilder:
+
+    @pytest.mark.parametrize("electionTemplateName", [PARLIAMENT_ELECTION_2020, PRESIDENTIAL_ELECTION_2019])
+    def test_dry_run(self, test_client, electionTemplateName):
+        row_counts = _get_row_counts()
+
+        # As the build_election command does.
+        with audited_request_context():
+            create_election(electionTemplateName=electionTemplateName, electionName="Dry Run Election", dry_run=True)
+            db.session.rollback()
+
+        assert _get_row_counts() == row_counts
+
+    def test_presidential_election_workers(self, test_client):
+        with audited_request_context():
+            with pytest.raises(NotImplementedError):
+                create_election(electionTemplateName=PRESIDENTIAL_ELECTION_2019, electionName="Parallel Election",
+                                workers=2)
+
+            db.session.rollback()
+
+    def test_workers_build_same_rows(self, test_client):
+        with audited_request_context():
+            election = create_election(electionTemplateName=PARLIAMENT_ELECTION_2020, electionName="Serial Election")
+            db.session.commit()
+
+            parallel_election = create_election(electionTemplateName=PARLIAMENT_ELECTION_2020,
+                                                electionName="Parallel Election", workers=2)
+            db.session.commit()
+
+        built_rows = _get_built_rows(election)
+        assert len(built_rows["tallySheet"]) > 0
+        assert _get_built_rows(parallel_election) == built_rows
+
+    def test_entries_referred_across_partitions(self, test_client):
+        with audited_request_context():
+            election_builder = ElectionBuilder(progress=lambda *args: None)
+
+        election_builder.set_partition("A")
+        meta = election_builder.add(Meta.Model)
+        other_meta = election_builder.add(Meta.Model)
+        meta_data = election_builder.add(MetaData.Model, metaId=meta, metaDataKey="key", metaDataValue="A")
+
+        election_builder.set_partition("B")
+        other_meta_data = election_builder.add(MetaData.Model, metaId=meta, metaDataKey="key", metaDataValue="B")
+
+        partitions = election_builder.get_partitions()
+
+        # Inserted before the partitions, since both of them refer it.
+        assert partitions[None][Meta.Model] == [meta]
+        assert partitions["A"][Meta.Model] == [other_meta]
+        assert partitions["A"][MetaData.Model] == [meta_data]
+        assert partitions["B"][MetaData.Model] == [other_meta_data]
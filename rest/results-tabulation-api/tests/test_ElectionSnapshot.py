@@ -0,0 +1,169 @@
+from flask import g
+
+from app import db
+from orm.entities import Election, Party, Candidate
+from orm.entities.Election import ElectionSnapshot
+from tests.util import audited_request_context
+
+
+# The recursive lookups the snapshot replaced, walking the relationships of the models.
+
+def _get_this_and_above_election_ids(election):
+    if election.parentElectionId is None:
+        return [election.electionId]
+    else:
+        return [election.electionId] + _get_this_and_above_election_ids(election.parentElection)
+
+
+def _get_this_and_below_election_ids(election):
+    this_and_below_election_ids = [election.electionId]
+    for sub_election in election.subElections:
+        this_and_below_election_ids += _get_this_and_below_election_ids(sub_election)
+
+    return this_and_below_election_ids
+
+
+def _get_official_name(election):
+    if election.parentElectionId is None:
+        return election.electionName
+    else:
+        return _get_official_name(election.parentElection)
+
+
+def _get_invalid_vote_categories(election):
+    if election.parentElectionId is None:
+        return election._invalidVoteCategories
+    else:
+        return _get_invalid_vote_categories(election.parentElection)
+
+
+def _get_root_election():
+    return Election.Model.query.filter(Election.Model.parentElectionId == None).first()
+
+
+def _get_metadata_version(root_election):
+    return db.session.query(Election.Model.metadataVersion).filter(
+        Election.Model.electionId == root_election.electionId
+    ).scalar()
+
+
+class TestElectionSnapshot:
+
+    def test_matches_recursive_lookups(self, test_client):
+        root_election = _get_root_election()
+        elections = Election.Model.query.filter(Election.Model.rootElectionId == root_election.electionId).all()
+
+        # Built with sub elections, so that the recursion is covered.
+        assert len(elections) > 1
+
+        for election in elections:
+            assert election.get_this_and_above_election_ids() == _get_this_and_above_election_ids(election)
+            assert sorted(election.get_this_and_below_election_ids()) == sorted(
+                _get_this_and_below_election_ids(election))
+            assert election.get_official_name() == _get_official_name(election)
+            assert [(invalid_vote_category.invalidVoteCategoryId, invalid_vote_category.categoryDescription)
+                    for invalid_vote_category in election.invalidVoteCategories] == sorted(
+                [(invalid_vote_category.invalidVoteCategoryId, invalid_vote_category.categoryDescription)
+                 for invalid_vote_category in _get_invalid_vote_categories(election)])
+
+    def test_built_election_is_invalidated(self, test_client):
+        root_election = _get_root_election()
+
+        # Invalidated once the sub elections, parties and candidates are built in bulk.
+        assert _get_metadata_version(root_election) > 0
+
+        election_snapshot = ElectionSnapshot.get_by_election(root_election)
+        assert election_snapshot.metadataVersion == _get_metadata_version(root_election)
+        assert len(election_snapshot.get_election(root_election.electionId).subElections) > 0
+
+    def test_mutations_rebuild_snapshot(self, test_client):
+        root_election = _get_root_election()
+        root_metadata_version = _get_metadata_version(root_election)
+
+        def _assert_rebuilt(mutate, is_visible):
+            metadata_version = _get_metadata_version(root_election)
+            election_snapshot = ElectionSnapshot.get_by_election(root_election)
+
+            result = mutate()
+
+            assert _get_metadata_version(root_election) == metadata_version + 1
+
+            rebuilt_election_snapshot = ElectionSnapshot.get_by_election(root_election)
+            assert rebuilt_election_snapshot is not election_snapshot
+            assert rebuilt_election_snapshot.metadataVersion == metadata_version + 1
+            assert is_visible(rebuilt_election_snapshot, result)
+
+            return result
+
+        with audited_request_context():
+            sub_election = _assert_rebuilt(
+                lambda: root_election.add_sub_election(electionName="Snapshot Sub Election", voteType="Postal"),
+                lambda election_snapshot, sub_election: sub_election.electionId in
+                                                        election_snapshot.get_this_and_below_election_ids(
+                                                            root_election.electionId)
+            )
+
+            party = Party.create(partyName="Snapshot Party", partySymbol="Snapshot", partyAbbreviation="SP")
+            _assert_rebuilt(
+                lambda: sub_election.add_party(partyId=party.partyId),
+                lambda election_snapshot, election_party: party.partyId in [
+                    _party.partyId for _party in election_snapshot.get_election(sub_election.electionId).parties]
+            )
+
+            def _get_candidate_ids(election_snapshot):
+                return [candidate.candidateId
+                        for _party in election_snapshot.get_election(sub_election.electionId).parties
+                        if _party.partyId == party.partyId for candidate in _party.candidates]
+
+            candidate = Candidate.create(candidateName="Snapshot Candidate")
+            _assert_rebuilt(
+                lambda: sub_election.add_candidate(partyId=party.partyId, candidateId=candidate.candidateId),
+                lambda election_snapshot, election_candidate: candidate.candidateId in _get_candidate_ids(
+                    election_snapshot)
+            )
+
+            election_party = sub_election.add_party(partyId=party.partyId)
+            other_candidate = Candidate.create(candidateName="Other Snapshot Candidate")
+            _assert_rebuilt(
+                lambda: election_party.add_candidate(candidateId=other_candidate.candidateId),
+                lambda election_snapshot, election_candidate: other_candidate.candidateId in _get_candidate_ids(
+                    election_snapshot)
+            )
+
+            _assert_rebuilt(
+                lambda: root_election.add_invalid_vote_category(categoryDescription="Snapshot category."),
+                lambda election_snapshot, invalid_vote_category: invalid_vote_category.invalidVoteCategoryId in [
+                    _invalid_vote_category.invalidVoteCategoryId for _invalid_vote_category in
+                    election_snapshot.get_election(sub_election.electionId).invalidVoteCategories]
+            )
+
+            db.session.rollback()
+
+        election_snapshot = ElectionSnapshot.get_by_election(root_election)
+        assert election_snapshot.metadataVersion == root_metadata_version
+        assert election_snapshot.get_election(sub_election.electionId) is None
+
+    def test_rolled_back_snapshot_is_not_shared(self, test_client):
+        root_election = _get_root_election()
+        metadata_version = _get_metadata_version(root_election)
+
+        with audited_request_context():
+            sub_election = root_election.add_sub_election(electionName="Rolled Back Sub Election", voteType="Postal")
+            sub_election_id = sub_election.electionId
+            assert ElectionSnapshot.get_by_election(root_election).get_election(sub_election_id) is not None
+
+            db.session.rollback()
+
+        # Another worker commits a change, which takes the same version as the rolled back one.
+        Election.Model.query.filter(Election.Model.electionId == root_election.electionId).update(
+            {Election.Model.metadataVersion: Election.Model.metadataVersion + 1}, synchronize_session=False
+        )
+        db.session.commit()
+        assert _get_metadata_version(root_election) == metadata_version + 1
+
+        # As read by the next request.
+        g.pop("election_metadata_versions", None)
+
+        election_snapshot = ElectionSnapshot.get_by_election(root_election)
+        assert election_snapshot.metadataVersion == metadata_version + 1
+        assert election_snapshot.get_election(sub_election_id) is None
@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+from app import db
+from orm.entities.IO.File import FileBlob
+
+CONTENT = b"0123456789"
+
+
+class _Stream:
+    """Stream which can't be seeked, as a request body."""
+
+    def __init__(self, content):
+        self._stream = io.BytesIO(content)
+
+    def read(self, size=-1):
+        return self._stream.read(size)
+
+
+@pytest.fixture()
+def file_blob_chunk_size(monkeypatch):
+    monkeypatch.setattr(FileBlob, "FILE_BLOB_CHUNK_SIZE", 4)
+
+    yield 4
+
+    db.session.rollback()
+
+
+def _get_chunks(fileBlobHash):
+    return [chunk for chunk, in db.session.query(FileBlob.FileBlobChunkModel.fileBlobChunkContent).filter(
+        FileBlob.FileBlobChunkModel.fileBlobHash == fileBlobHash
+    ).order_by(FileBlob.FileBlobChunkModel.fileBlobChunkIndex).all()]
+
+
+class TestFileBlob:
+
+    def test_create_in_chunks(self, test_client, file_blob_chunk_size):
+        file_blob = FileBlob.create_from_stream(stream=io.BytesIO(CONTENT))
+
+        assert file_blob.fileBlobSize == len(CONTENT)
+        assert _get_chunks(file_blob.fileBlobHash) == [b"0123", b"4567", b"89"]
+        assert file_blob.fileBlobContent == CONTENT
+
+        # The same content is stored once.
+        assert FileBlob.create_from_stream(stream=_Stream(CONTENT)) is file_blob
+        assert _get_chunks(file_blob.fileBlobHash) == [b"0123", b"4567", b"89"]
+
+    def test_create_empty(self, test_client, file_blob_chunk_size):
+        file_blob = FileBlob.create_from_stream(stream=_Stream(b""))
+
+        assert file_blob.fileBlobSize == 0
+        assert _get_chunks(file_blob.fileBlobHash) == []
+        assert file_blob.fileBlobContent == b""
+
+    @pytest.mark.parametrize("start,stop", [(0, 10), (0, 4), (3, 5), (4, 8), (5, 10), (9, 10), (2, 2)])
+    def test_iter_content(self, test_client, file_blob_chunk_size, start, stop):
+        file_blob = FileBlob.create_from_stream(stream=io.BytesIO(CONTENT))
+
+        chunks = list(FileBlob.iter_content(fileBlobHash=file_blob.fileBlobHash, start=start, stop=stop))
+
+        assert b"".join(chunks) == CONTENT[start:stop]
+        # Never more than a chunk is read at a time.
+        assert all(0 < len(chunk) <= file_blob_chunk_size for chunk in chunks)
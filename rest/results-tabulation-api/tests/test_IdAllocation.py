@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from app import db
+from orm.entities.Audit import Stamp
+from orm.entities.Submission.TallySheet import TallySheetModel
+from tests.util import audited_request_context
+from util import id_allocation
+
+
+def alternate_workers(count):
+    """
+    Yields count times, alternating between the id blocks of two worker processes, which are kept between the turns.
+    """
+    worker_id_blocks = [{}, {}]
+    for index in range(count):
+        with patch.object(id_allocation, "_id_blocks", worker_id_blocks[index % 2]):
+            yield index
+
+
+class TestIdAllocation:
+
+    def test_take_ids_of_two_workers(self, test_client):
+        taken_ids = []
+        for _ in alternate_workers(3):
+            taken_ids.append(list(id_allocation.take_ids(Stamp.Model, 3)))
+
+        # The blocks of the workers never overlap.
+        assert len(sum(taken_ids, [])) == len(set(sum(taken_ids, [])))
+
+        # But the ids are not in the order they were taken in, hence must not be used to order the rows by time.
+        assert taken_ids[2] < taken_ids[1]
+
+
+    def test_allocate_ids_after_blocks_of_workers(self, test_client):
+        taken_ids = []
+        for _ in alternate_workers(2):
+            taken_ids += list(id_allocation.take_ids(Stamp.Model, 3))
+
+        # The bulk inserts of the election builder never reuse the ids held by the workers.
+        allocated_ids = list(id_allocation.allocate_ids(Stamp.Model, 5))
+        assert min(allocated_ids) > max(taken_ids)
+
+    def test_versions_of_two_workers_are_in_order(self, test_client):
+        tally_sheet = TallySheetModel.query.first()
+
+        tally_sheet_version_ids = []
+        with audited_request_context():
+            for _ in alternate_workers(4):
+                tally_sheet_version_ids.append(tally_sheet.create_empty_version().tallySheetVersionId)
+
+            db.session.commit()
+
+        assert tally_sheet_version_ids == sorted(set(tally_sheet_version_ids))
+
+        # The latest version first.
+        versions = [version for version in tally_sheet.submission.versions
+                    if version.submissionVersionId in tally_sheet_version_ids]
+        assert [version.submissionVersionId for version in versions] == list(reversed(tally_sheet_version_ids))
@@ -0,0 +1,64 @@
+import importlib.util
+import io
+import os
+
+import pytest
+import sqlalchemy as sa
+from werkzeug.datastructures import FileStorage
+
+from app import db
+from orm.entities import Proof
+from orm.entities.Submission.TallySheet import TallySheetModel
+from orm.enums import FileTypeEnum
+from tests.util import audited_request_context
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(__file__)), "migrations", "versions")
+
+
+def _upload_file(proof, content):
+    return Proof.upload_file(proofId=proof.proofId, fileType=FileTypeEnum.Image, fileSource=FileStorage(
+        stream=io.BytesIO(content), filename="scanned.png", content_type="image/png"))
+
+
+def _load_migration(revision):
+    spec = importlib.util.spec_from_file_location(revision, os.path.join(MIGRATIONS_DIRECTORY, "%s_.py" % revision))
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    return migration
+
+
+class TestProof:
+
+    def test_upload_file_increments_scanned_files_count(self, test_client):
+        proof = TallySheetModel.query.first().submission.submissionProof
+
+        with audited_request_context():
+            scanned_files_count = proof.scannedFilesCount
+
+            _upload_file(proof, b"first page")
+            _upload_file(proof, b"second page")
+            db.session.expire(proof)
+
+            assert proof.scannedFilesCount == scanned_files_count + 2 == len(proof.scannedFiles)
+            assert proof.size() == proof.scannedFilesCount
+
+            db.session.rollback()
+
+    def test_migration_counts_scanned_files(self):
+        pytest.importorskip("alembic")
+        from alembic.migration import MigrationContext
+        from alembic.operations import Operations
+
+        engine = sa.create_engine("sqlite://")
+        with engine.connect() as connection:
+            connection.execute("CREATE TABLE proof (proofId INTEGER PRIMARY KEY, scannedFilesFolderId INTEGER)")
+            connection.execute("CREATE TABLE folder_file (folderId INTEGER, fileId INTEGER)")
+            connection.execute("INSERT INTO proof VALUES (1, 10), (2, 20), (3, 30)")
+            connection.execute("INSERT INTO folder_file VALUES (10, 100), (10, 101), (10, 102), (20, 200)")
+
+            with Operations.context(MigrationContext.configure(connection)):
+                _load_migration("d41c7a9e5f28").upgrade()
+
+            assert connection.execute(
+                "SELECT proofId, scannedFilesCount FROM proof ORDER BY proofId").fetchall() == [(1, 3), (2, 1), (3, 0)]
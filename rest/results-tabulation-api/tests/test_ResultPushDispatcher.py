@@ -0,0 +1,93 @@
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from requests import HTTPError
+
+from app import db
+from orm.entities import ResultPush
+from orm.entities.Submission.TallySheet import TallySheetModel
+from orm.enums import ResultPushStatusEnum
+from tests.result_dissemination_stub import ResultDisseminationStub
+from tests.util import audited_request_context
+from util.result_push_dispatcher import ResultPushDispatcher, IDEMPOTENCY_KEY_HEADER
+
+
+def get_result_push(url, **kwargs):
+    result_push = dict(idempotencyKey="release-1-1", url=url, params=None, jsonBody=None, fileId=None, file=None)
+    result_push.update(kwargs)
+
+    return SimpleNamespace(**result_push)
+
+
+class TestResultPushDispatcher:
+
+    def test_send(self):
+        dispatcher = ResultPushDispatcher({})
+
+        with ResultDisseminationStub() as stub:
+            result_push = get_result_push("%s/result/data/2019PRE/PRESIDENTIAL-FIRST/01" % stub.url,
+                                          params=json.dumps({"level": "NATIONAL-FINAL"}),
+                                          jsonBody=json.dumps({"type": "PRESIDENTIAL-FIRST"}))
+            response = dispatcher.send(result_push)
+
+        assert response.status_code == 200
+        assert len(stub.requests) == 1
+        assert stub.requests[0]["path"] == "/result/data/2019PRE/PRESIDENTIAL-FIRST/01?level=NATIONAL-FINAL"
+        assert stub.requests[0]["headers"][IDEMPOTENCY_KEY_HEADER] == "release-1-1"
+        assert json.loads(stub.requests[0]["body"]) == {"type": "PRESIDENTIAL-FIRST"}
+
+    def test_send_failure(self):
+        dispatcher = ResultPushDispatcher({})
+
+        with ResultDisseminationStub(failure_count=1) as stub:
+            result_push = get_result_push("%s/result/notification" % stub.url)
+
+            with pytest.raises(HTTPError):
+                dispatcher.send(result_push)
+
+            # Retried with the same idempotency key.
+            dispatcher.send(result_push)
+
+        assert len(stub.requests) == 2
+        assert stub.requests[0]["headers"][IDEMPOTENCY_KEY_HEADER] == stub.requests[1]["headers"][
+            IDEMPOTENCY_KEY_HEADER]
+
+    def test_get_backoff_delay(self):
+        dispatcher = ResultPushDispatcher({"RESULT_PUSH_BACKOFF_SECONDS": 5, "RESULT_PUSH_MAX_BACKOFF_SECONDS": 60})
+
+        assert dispatcher.get_backoff_delay(1) == timedelta(seconds=5)
+        assert dispatcher.get_backoff_delay(2) == timedelta(seconds=10)
+        assert dispatcher.get_backoff_delay(3) == timedelta(seconds=20)
+        assert dispatcher.get_backoff_delay(10) == timedelta(seconds=60)
+
+    def test_get_session(self):
+        dispatcher = ResultPushDispatcher({})
+
+        assert dispatcher.get_session("http://a.lk/result/data") is dispatcher.get_session("http://a.lk/result/image")
+        assert dispatcher.get_session("http://a.lk/result/data") is not dispatcher.get_session("http://b.lk/")
+
+    def test_get_due_after_depended_push(self, test_client):
+        tally_sheet = TallySheetModel.query.first()
+        with audited_request_context():
+            tally_sheet_version = tally_sheet.create_empty_version()
+
+        release_result_push = ResultPush.create(idempotencyKey="release-due-1", tallySheetId=tally_sheet.tallySheetId,
+                                                tallySheetVersionId=tally_sheet_version.tallySheetVersionId,
+                                                url="http://a.lk/result/data")
+        image_result_push = ResultPush.create(idempotencyKey="image-due-1", tallySheetId=tally_sheet.tallySheetId,
+                                              tallySheetVersionId=tally_sheet_version.tallySheetVersionId,
+                                              url="http://a.lk/result/image",
+                                              dependsOnResultPushId=release_result_push.resultPushId)
+
+        due_result_pushes = ResultPush.get_due(limit=100)
+        assert release_result_push in due_result_pushes
+        assert image_result_push not in due_result_pushes
+
+        release_result_push.status = ResultPushStatusEnum.Dispatched
+        db.session.flush()
+
+        assert image_result_push in ResultPush.get_due(limit=100)
+
+        db.session.rollback()
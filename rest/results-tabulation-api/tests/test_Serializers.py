@@ -0,0 +1,83 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from schemas import TallySheetSchema, TallySheetVersionSchema, ElectionSchema
+from schemas.serializers import compile_serializer, TallySheetSerializer, TallySheetVersionSerializer, \
+    ElectionSerializer
+
+
+def get_stamp(stampId):
+    return SimpleNamespace(stampId=stampId, createdBy="data_editor", createdAt=datetime(2020, 8, 5, 10, 30, stampId))
+
+
+def get_tally_sheet(tallySheetId, locked=False):
+    template = SimpleNamespace(templateId=1, templateName="PE-27", isDerived=False, rows=[
+        SimpleNamespace(templateRowId=1, templateRowType="PARTY_WISE_VOTE", hasMany=True, isDerived=False),
+        SimpleNamespace(templateRowId=2, templateRowType="REJECTED_VOTE", hasMany=False, isDerived=False)
+    ])
+
+    return SimpleNamespace(
+        tallySheetId=tallySheetId, tallySheetCode="PE-27", templateId=1, template=template, electionId=2,
+        areaId=10, area=SimpleNamespace(areaId=10, areaName="Colombo Central", electionId=2),
+        areaMapList=[{
+            "pollingStationId": 11, "pollingStationName": "1", "pollingDistrictId": 12, "pollingDistrictName": "A",
+            "countingCentreId": 13, "countingCentreName": "1", "pollingDivisionId": 14,
+            "pollingDivisionName": "Colombo Central", "electoralDistrictId": 15, "electoralDistrictName": "Colombo"
+        }],
+        latestVersionId=tallySheetId + 1, latestStamp=get_stamp(1),
+        lockedVersionId=tallySheetId + 1 if locked else None, lockedStamp=get_stamp(2) if locked else None,
+        submittedVersionId=None, submittedStamp=None, locked=locked, submitted=False, notified=False, released=False,
+        submissionProofId=tallySheetId + 2, versions=[SimpleNamespace(submissionVersionId=tallySheetId + 1)],
+        metaDataList=[SimpleNamespace(metaDataKey="partyId", metaDataValue="3")]
+    )
+
+
+class TestSerializers:
+
+    def test_tally_sheet(self):
+        tally_sheets = [get_tally_sheet(1), get_tally_sheet(5, locked=True)]
+
+        assert TallySheetSerializer.dump_many(tally_sheets) == TallySheetSchema(many=True).dump(tally_sheets).data
+        assert TallySheetSerializer.dump(tally_sheets[1]) == TallySheetSchema().dump(tally_sheets[1]).data
+
+    def test_tally_sheet_version(self):
+        content_row = SimpleNamespace(tallySheetVersionRowId=1, templateRowId=1, templateRowType="PARTY_WISE_VOTE",
+                                      areaId=10, areaName="Colombo Central", candidateId=None, candidateName=None,
+                                      partyId=3, partyName="Party A", numValue=1200, strValue=None)
+        tally_sheet_version = SimpleNamespace(tallySheetId=1, tallySheetVersionId=2, createdBy="data_editor",
+                                              createdAt=datetime(2020, 8, 5, 10, 30), isComplete=True,
+                                              content=[content_row])
+
+        assert TallySheetVersionSerializer.dump(tally_sheet_version) == TallySheetVersionSchema().dump(
+            tally_sheet_version).data
+
+    def test_election(self):
+        party = SimpleNamespace(partyId=1, partyName="Party A", partySymbol="Tree", partyAbbreviation="PA",
+                                partySymbolFile=None, candidates=[
+                SimpleNamespace(candidateId=1, candidateName="Candidate A", qualifiedForPreferences=True,
+                                candidateProfileImageFile=None)
+            ])
+        invalid_vote_categories = [SimpleNamespace(invalidVoteCategoryId=1, categoryDescription="No votes")]
+        root_election = SimpleNamespace(electionId=1, electionName="Parliamentary Election 2020",
+                                        electionTemplateName="PARLIAMENT_ELECTION_2020", voteType=None,
+                                        rootElectionId=1, rootElection=None, parentElection=None, parties=[party],
+                                        invalidVoteCategories=invalid_vote_categories, isListed=True)
+        sub_election = SimpleNamespace(electionId=2, electionName="Colombo", electionTemplateName=None,
+                                       voteType="NonPostal", rootElectionId=1, rootElection=root_election,
+                                       parentElection=root_election, parties=[party], subElections=[],
+                                       invalidVoteCategories=invalid_vote_categories, isListed=False)
+        root_election.subElections = [sub_election]
+
+        elections = [root_election, sub_election]
+
+        assert ElectionSerializer.dump_many(elections) == ElectionSchema(many=True).dump(elections).data
+
+    def test_none_and_exclude(self):
+        assert TallySheetVersionSerializer.dump(None) == TallySheetVersionSchema().dump(None).data
+
+        serializer = compile_serializer(TallySheetVersionSchema, exclude=("content",))
+        tally_sheet_version = SimpleNamespace(tallySheetId=1, tallySheetVersionId=2, createdBy="data_editor",
+                                              createdAt=datetime(2020, 8, 5, 10, 30), isComplete=False)
+
+        assert serializer.dump(tally_sheet_version) == TallySheetVersionSchema(exclude=("content",)).dump(
+            tally_sheet_version).data
@@ -0,0 +1,96 @@
+from app import db
+from orm.entities import Election
+from orm.entities.Dashboard import StatusReport
+from orm.entities.Submission.TallySheet import TallySheetModel, update_status_reports
+from tests.util import audited_request_context
+
+
+def _get_tally_sheets():
+    root_election = Election.Model.query.filter(Election.Model.parentElectionId == None).first()
+
+    return root_election, [tally_sheet for tally_sheet in TallySheetModel.query.order_by(
+        TallySheetModel.tallySheetId).all() if tally_sheet.election.rootElectionId == root_election.electionId]
+
+
+def _set_versions(tally_sheet, *version_names):
+    tally_sheet_version = tally_sheet.create_empty_version()
+    for version_name in version_names:
+        setattr(tally_sheet.submission, "%sVersionId" % version_name, tally_sheet_version.tallySheetVersionId)
+
+
+def _assert_status_report(tally_sheet, root_election):
+    status_report = StatusReport.Model.query.filter(
+        StatusReport.Model.statusReportId == tally_sheet.statusReportId
+    ).one()
+
+    assert status_report.status == tally_sheet.get_report_status()
+    assert status_report.reportType == tally_sheet.template.templateName
+    assert status_report.electionId == root_election.electionId
+
+
+class TestStatusReports:
+
+    def test_update_status_reports(self, test_client):
+        root_election, tally_sheets = _get_tally_sheets()
+        data_entry_tally_sheets = [tally_sheet for tally_sheet in tally_sheets if tally_sheet.template.has_data_entry()]
+
+        with audited_request_context():
+            update_status_reports(electionId=root_election.electionId)
+
+            _set_versions(data_entry_tally_sheets[0], "latest")
+            _set_versions(data_entry_tally_sheets[1], "latest", "submitted")
+            _set_versions(data_entry_tally_sheets[2], "latest", "locked")
+            _set_versions(data_entry_tally_sheets[3], "latest", "locked", "notified")
+            _set_versions(data_entry_tally_sheets[4], "latest", "locked", "released")
+            data_entry_tally_sheets[5].submission.submissionProof.scannedFilesCount = 1
+            _set_versions(data_entry_tally_sheets[5], "latest", "locked")
+
+            # Half of the tally sheets are left without a report, to be created in bulk.
+            status_report_ids = {}
+            for tally_sheet in tally_sheets:
+                if tally_sheet.tallySheetId % 2 == 0:
+                    tally_sheet.statusReportId = None
+                else:
+                    status_report_ids[tally_sheet.tallySheetId] = tally_sheet.statusReportId
+            db.session.flush()
+
+            update_status_reports(electionId=root_election.electionId)
+            db.session.expire_all()
+
+            assert [tally_sheet.get_report_status() for tally_sheet in data_entry_tally_sheets[:6]] == [
+                "ENTERED", "SUBMITTED", "VERIFIED", "NOTIFIED", "RELEASED", "CERTIFIED"
+            ]
+            for tally_sheet in tally_sheets:
+                _assert_status_report(tally_sheet, root_election)
+
+                # The existing reports are updated in place.
+                if tally_sheet.tallySheetId in status_report_ids:
+                    assert tally_sheet.statusReportId == status_report_ids[tally_sheet.tallySheetId]
+
+            assert len({tally_sheet.statusReportId for tally_sheet in tally_sheets}) == len(tally_sheets)
+
+            db.session.rollback()
+
+    def test_update_status_reports_of_tally_sheets(self, test_client):
+        root_election, tally_sheets = _get_tally_sheets()
+        tally_sheet, other_tally_sheet = [tally_sheet for tally_sheet in tally_sheets
+                                          if tally_sheet.template.has_data_entry()][:2]
+
+        with audited_request_context():
+            update_status_reports(electionId=root_election.electionId)
+            other_status = other_tally_sheet.statusReport.status
+
+            _set_versions(tally_sheet, "latest")
+            _set_versions(other_tally_sheet, "latest", "submitted")
+            db.session.flush()
+
+            update_status_reports(tallySheetIds=[tally_sheet.tallySheetId])
+            db.session.expire_all()
+
+            _assert_status_report(tally_sheet, root_election)
+            assert tally_sheet.statusReport.status == "ENTERED"
+
+            # Not refreshed, since it wasn't asked for.
+            assert other_tally_sheet.statusReport.status == other_status != other_tally_sheet.get_report_status()
+
+            db.session.rollback()
@@ -0,0 +1,105 @@
+from app import db
+from ext.ExtendedElection.ExtendedElectionPresidentialElection2019.TALLY_SHEET_CODES import PRE_30_PD
+from orm.entities import Template
+from orm.entities.Submission.TallySheet import TallySheetModel, TallySheetAggregateRowModel, \
+    _get_derived_template_row_results, _is_aggregated_template_row
+from orm.entities.TallySheetVersionRow import create_all
+from tests.util import audited_request_context
+
+
+def _get_aggregated_tally_sheet():
+    tally_sheet = TallySheetModel.query.join(
+        Template.Model, Template.Model.templateId == TallySheetModel.templateId
+    ).filter(
+        Template.Model.templateName == PRE_30_PD
+    ).first()
+
+    template_row = [template_row for template_row in tally_sheet.template.rows
+                    if template_row.templateRowType == "REJECTED_VOTE"][0]
+    assert _is_aggregated_template_row(template_row)
+
+    return tally_sheet, template_row
+
+
+def _create_child_version(child_tally_sheet, num_value):
+    tally_sheet_version = child_tally_sheet.create_empty_version()
+
+    child_template_row = [template_row for template_row in child_tally_sheet.template.rows
+                          if template_row.templateRowType == "REJECTED_VOTE"][0]
+    create_all(tallySheetVersion=tally_sheet_version, rows=[{
+        "templateRowId": child_template_row.templateRowId,
+        "electionId": child_tally_sheet.submission.electionId,
+        "areaId": child_tally_sheet.submission.areaId,
+        "numValue": num_value
+    }])
+
+    return tally_sheet_version
+
+
+def _lock_child_version(child_tally_sheet, tally_sheet_version, is_applied=True):
+    previous_locked_version_id = child_tally_sheet.lockedVersionId
+    child_tally_sheet.submission.set_locked_version(submissionVersion=tally_sheet_version.submissionVersion)
+
+    # Not applied by a transaction which doesn't see the aggregates materialized concurrently.
+    if is_applied:
+        child_tally_sheet.apply_locked_version_change(previous_locked_version_id, child_tally_sheet.lockedVersionId)
+
+
+def _get_rows(content_rows, column_names):
+    return sorted([tuple(content_row[column_name] for column_name in column_names) for content_row in content_rows],
+                  key=str)
+
+
+def _assert_aggregated_rows(tally_sheet, template_row):
+    column_names = [template_row_column.templateRowColumnName for template_row_column in template_row.columns]
+
+    aggregated_rows = _get_rows(tally_sheet.get_aggregated_content_rows(template_row), column_names)
+    derived_rows = _get_rows([
+        {column_name: getattr(derived_result, column_name) for column_name in column_names}
+        for derived_result in _get_derived_template_row_results(tally_sheet.tallySheetId, template_row)
+    ], column_names)
+
+    assert aggregated_rows == derived_rows
+
+    return aggregated_rows
+
+
+def _get_aggregate_row_ids(tally_sheet):
+    return sorted([aggregate_row.tallySheetAggregateRowId for aggregate_row in TallySheetAggregateRowModel.query.filter(
+        TallySheetAggregateRowModel.tallySheetId == tally_sheet.tallySheetId)])
+
+
+class TestTallySheetAggregates:
+
+    def test_child_lock_applies_delta(self, test_client):
+        tally_sheet, template_row = _get_aggregated_tally_sheet()
+        child_tally_sheet = tally_sheet.children[0]
+
+        with audited_request_context():
+            _assert_aggregated_rows(tally_sheet, template_row)
+            aggregate_row_ids = _get_aggregate_row_ids(tally_sheet)
+
+            _lock_child_version(child_tally_sheet, _create_child_version(child_tally_sheet, num_value=10))
+            aggregated_rows = _assert_aggregated_rows(tally_sheet, template_row)
+            assert 10 in [aggregated_row[-1] for aggregated_row in aggregated_rows]
+
+            # Kept up to date by the delta, rather than materialized again.
+            assert _get_aggregate_row_ids(tally_sheet) == aggregate_row_ids
+
+            db.session.rollback()
+
+    def test_child_locked_concurrently_with_materialization(self, test_client):
+        tally_sheet, template_row = _get_aggregated_tally_sheet()
+        child_tally_sheet = tally_sheet.children[0]
+
+        with audited_request_context():
+            _assert_aggregated_rows(tally_sheet, template_row)
+
+            # Locked by a transaction which read the aggregates before the materialization above was committed.
+            _lock_child_version(child_tally_sheet, _create_child_version(child_tally_sheet, num_value=20),
+                                is_applied=False)
+
+            aggregated_rows = _assert_aggregated_rows(tally_sheet, template_row)
+            assert 20 in [aggregated_row[-1] for aggregated_row in aggregated_rows]
+
+            db.session.rollback()
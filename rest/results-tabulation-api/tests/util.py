@@ -1,3 +1,6 @@
+from flask import current_app
+
+from auth import USER_NAME
 from orm.enums import AreaTypeEnum
 from ext.ExtendedElection.ExtendedElectionPresidentialElection2019.TALLY_SHEET_CODES import PRE_41, PRE_30_PD, \
     PRE_30_ED, PRE_21, PRE_34_CO, PRE_34_I_RO, PRE_34_II_RO, PRE_34, PRE_ALL_ISLAND_RESULTS_BY_ELECTORAL_DISTRICTS, \
@@ -60,3 +63,13 @@ def get_area_type(area_type):
         return AreaTypeEnum.ElectionCommission
     elif area_type == "AdministrativeDistrict":
         return AreaTypeEnum.AdministrativeDistrict
+
+
+def audited_request_context(app=None, user_name="TestAdmin"):
+    """
+    Request context to create the audited entities in, such as the tally sheet versions, outside of the API requests.
+    """
+    request_context = (app or current_app).test_request_context(environ_base={"REMOTE_ADDR": "127.0.0.1"})
+    request_context.connexion_context = {USER_NAME: user_name}
+
+    return request_context
@@ -2,7 +2,6 @@ import connexion
 
 from orm.enums import BallotTypeEnum, AreaTypeEnum
 from sqlalchemy import func
-import base64
 import numpy as np
 
 
@@ -105,15 +104,6 @@ def to_comma_seperated_num(value):
         return f'{int(value):,}'
 
 
-def convert_image_to_data_uri(value):
-    data_image = ''
-
-    with open(value, "rb") as img_file:
-        data_image = base64.b64encode(img_file.read()).decode()
-
-    return data_image
-
-
 def get_dict_key_value_or_none(dict, key):
     if key in dict:
         return dict[key]
@@ -0,0 +1,123 @@
+import io
+import json
+
+from app import db
+
+MIMETYPE_JSON = "application/json"
+MIMETYPE_COLUMNAR_JSON = "application/vnd.tabulation.columnar+json"
+MIMETYPE_ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MIMETYPE_PARQUET = "application/vnd.apache.parquet"
+
+COLUMNAR_MIMETYPES = [MIMETYPE_JSON, MIMETYPE_COLUMNAR_JSON, MIMETYPE_ARROW_STREAM, MIMETYPE_PARQUET]
+
+
+def _dictionary_encode(values):
+    dictionary = []
+    dictionary_indices = {}
+    indices = []
+    for value in values:
+        if value is None:
+            indices.append(None)
+            continue
+
+        index = dictionary_indices.get(value)
+        if index is None:
+            index = dictionary_indices[value] = len(dictionary)
+            dictionary.append(value)
+
+        indices.append(index)
+
+    return dictionary, indices
+
+
+class ColumnarResult:
+    """
+    Results of a query as parallel arrays of values, one per column. The values of the dictionary columns, such as the
+    names repeated on every row, are replaced with their indices in a dictionary of the distinct values.
+    """
+
+    def __init__(self, column_names, columns, dictionaries, row_count, metadata=None):
+        self.column_names = column_names
+        self.columns = columns
+        self.dictionaries = dictionaries
+        self.row_count = row_count
+        self.metadata = metadata or {}
+
+    def to_dict(self):
+        return {
+            "rowCount": self.row_count,
+            "columns": {column_name: self.columns[column_name] for column_name in self.column_names},
+            "dictionaries": self.dictionaries
+        }
+
+    def to_json(self):
+        return json.dumps(dict(self.metadata, content=self.to_dict()), default=str)
+
+    def to_arrow_table(self):
+        import pyarrow as pa
+
+        arrays = []
+        for column_name in self.column_names:
+            if column_name in self.dictionaries:
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(self.columns[column_name], type=pa.int32()),
+                    pa.array(self.dictionaries[column_name], type=pa.string())
+                ))
+            else:
+                arrays.append(pa.array(self.columns[column_name]))
+
+        table = pa.Table.from_arrays(arrays, names=self.column_names)
+
+        return table.replace_schema_metadata({key: str(value) for key, value in self.metadata.items()})
+
+    def to_arrow_stream(self):
+        import pyarrow as pa
+
+        table = self.to_arrow_table()
+        sink = pa.BufferOutputStream()
+        writer = pa.RecordBatchStreamWriter(sink, table.schema)
+        writer.write_table(table)
+        writer.close()
+
+        return sink.getvalue().to_pybytes()
+
+    def to_parquet(self):
+        import pyarrow.parquet as pq
+
+        sink = io.BytesIO()
+        pq.write_table(self.to_arrow_table(), sink)
+
+        return sink.getvalue()
+
+    def serialize(self, mimetype):
+        if mimetype == MIMETYPE_ARROW_STREAM:
+            return self.to_arrow_stream()
+        elif mimetype == MIMETYPE_PARQUET:
+            return self.to_parquet()
+        else:
+            return self.to_json()
+
+
+def get_columnar_result(query, columns, dictionary_column_names=(), metadata=None):
+    """
+    Executes the query for the columns given, without building a result object per row, and transposes the rows into
+    columns.
+
+    :param columns: OrderedDict of the column name to the column expression.
+    """
+    column_names = list(columns.keys())
+    statement = query.with_entities(*columns.values()).statement
+    rows = db.session.execute(statement).fetchall()
+
+    if len(rows) > 0:
+        column_values = [list(values) for values in zip(*rows)]
+    else:
+        column_values = [[] for _ in column_names]
+
+    result_columns = dict(zip(column_names, column_values))
+    dictionaries = {}
+    for column_name in dictionary_column_names:
+        dictionaries[column_name], result_columns[column_name] = _dictionary_encode(result_columns[column_name])
+
+    return ColumnarResult(column_names=column_names, columns=result_columns, dictionaries=dictionaries,
+                          row_count=len(rows), metadata=metadata)
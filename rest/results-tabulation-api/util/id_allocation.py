@@ -0,0 +1,103 @@
+import threading
+
+from flask import current_app, has_app_context
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import db
+
+DEFAULT_ID_BLOCK_SIZE = 100
+
+# Blocks of ids reserved by this worker process, by table name, as (next id, end of the block).
+_id_blocks = {}
+_id_blocks_lock = threading.Lock()
+
+
+def _reserve_ids_in_session(session, model, count, min_first_id):
+    from orm.entities import IdBlock
+
+    primary_key = model.__mapper__.primary_key[0]
+    table_name = model.__tablename__
+
+    id_block = session.query(IdBlock.Model).filter(
+        IdBlock.Model.tableName == table_name
+    ).with_for_update().one_or_none()
+    if id_block is None:
+        id_block = IdBlock.Model(tableName=table_name, nextId=1)
+        session.add(id_block)
+
+    # Rows inserted without the allocator are skipped as well.
+    last_id = session.query(func.max(primary_key)).scalar()
+    first_id = max(id_block.nextId, (last_id or 0) + 1, min_first_id)
+
+    id_block.nextId = first_id + count
+    session.flush()
+
+    return first_id
+
+
+def reserve_ids(model, count, min_first_id=1):
+    """
+    Reserves a block of consecutive primary keys by moving the next id of the table past it in the idBlock table.
+
+    The reservation is committed in a transaction of its own, so that the idBlock row is not locked until the end of
+    the request. The ids of a rolled back request are therefore left unused.
+    """
+    if db.engine.dialect.name == "sqlite":
+        # The in memory database of the unit tests is not shared between connections.
+        return _reserve_ids_in_session(db.session, model, count, min_first_id)
+
+    session = Session(bind=db.engine)
+    try:
+        first_id = _reserve_ids_in_session(session, model, count, min_first_id)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    return first_id
+
+
+def take_ids(model, count=1):
+    """
+    Takes primary keys from the block reserved by this worker process, reserving another block once it's used up.
+    Hence most of the rows are given an id without a round trip, and can be inserted together on the next flush.
+    """
+    table_name = model.__tablename__
+
+    id_block_size = DEFAULT_ID_BLOCK_SIZE
+    if has_app_context():
+        id_block_size = current_app.config.get("ID_BLOCK_SIZE", DEFAULT_ID_BLOCK_SIZE)
+
+    with _id_blocks_lock:
+        next_id, end_id = _id_blocks.get(table_name, (0, 0))
+        if end_id - next_id < count:
+            block_size = max(id_block_size, count)
+            next_id = reserve_ids(model, block_size)
+            end_id = next_id + block_size
+
+        _id_blocks[table_name] = (next_id + count, end_id)
+
+    return range(next_id, next_id + count)
+
+
+def take_id(model):
+    return take_ids(model, 1)[0]
+
+
+def allocate_ids(model, count):
+    """
+    Reserves a block of consecutive primary keys after the largest existing one.
+
+    The row with the largest key is locked for update, which on InnoDB locks the gap after it as well. Hence no other
+    transaction can insert in to the reserved block until this transaction is over. The block is reserved in the
+    idBlock table too, so that it doesn't overlap the blocks taken by the worker processes.
+    """
+    primary_key = model.__mapper__.primary_key[0]
+
+    last_id = db.session.query(primary_key).order_by(primary_key.desc()).limit(1).with_for_update().scalar()
+    first_id = reserve_ids(model, count, min_first_id=(last_id or 0) + 1)
+
+    return range(first_id, first_id + count)
@@ -0,0 +1,258 @@
+import heapq
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from jinja2 import Template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+METRICS_MIMETYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRIC_PREFIX = "tabulation_request_"
+
+SERIALIZATION = "serialization"
+RENDER = "render"
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+ROW_COUNT_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+DEFAULT_SLOW_STATEMENT_LOG_SIZE = 10
+DEFAULT_SLOW_STATEMENT_MIN_SECONDS = 0.1
+
+# Name, help and buckets of the histograms recorded per endpoint.
+HISTOGRAMS = [
+    ("duration_seconds", "Duration of the requests.", DURATION_BUCKETS),
+    ("db_queries", "Number of SQL statements executed per request.", QUERY_COUNT_BUCKETS),
+    ("db_seconds", "Time spent executing SQL statements per request.", DURATION_BUCKETS),
+    ("db_rows", "Number of rows fetched per request, as reported by the database driver.", ROW_COUNT_BUCKETS),
+    ("serialization_seconds", "Time spent dumping the response data per request.", DURATION_BUCKETS),
+    ("render_seconds", "Time spent rendering templates per request.", DURATION_BUCKETS)
+]
+
+logger = logging.getLogger(__name__)
+
+_base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+_slow_statement_log_size = DEFAULT_SLOW_STATEMENT_LOG_SIZE
+_slow_statement_min_seconds = DEFAULT_SLOW_STATEMENT_MIN_SECONDS
+_slowest_statements = []
+_slowest_statements_lock = threading.Lock()
+
+_is_listening = False
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for index, bucket in enumerate(self.buckets):
+            if value <= bucket:
+                self.bucket_counts[index] += 1
+
+        self.count += 1
+        self.sum += value
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.startedAt = time.time()
+        self.queryCount = 0
+        self.dbSeconds = 0
+        self.rowCount = 0
+        self.timedSeconds = {SERIALIZATION: 0, RENDER: 0}
+        self.timerDepths = {SERIALIZATION: 0, RENDER: 0}
+
+
+def get_request_metrics():
+    """
+    :return: the metrics of the current request, or None if there's no request or it's not instrumented.
+    """
+    if has_request_context():
+        return g.get("request_metrics")
+
+    return None
+
+
+@contextmanager
+def timed(metric):
+    """
+    Adds the time spent within the block to the metric of the current request. The blocks nested in one of the same
+    metric are counted along with it.
+    """
+    request_metrics = get_request_metrics()
+    if request_metrics is None:
+        yield
+        return
+
+    request_metrics.timerDepths[metric] += 1
+    started_at = time.time()
+    try:
+        yield
+    finally:
+        request_metrics.timerDepths[metric] -= 1
+        if request_metrics.timerDepths[metric] == 0:
+            request_metrics.timedSeconds[metric] += time.time() - started_at
+
+
+class TimedTemplate(Template):
+    def render(self, *args, **kwargs):
+        with timed(RENDER):
+            return super(TimedTemplate, self).render(*args, **kwargs)
+
+
+def _get_call_site():
+    # The innermost frame of the application, skipping SQLAlchemy and the other libraries.
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(_base_dir) and filename != os.path.abspath(__file__) and "site-packages" not in filename:
+            return "%s:%d in %s" % (os.path.relpath(filename, _base_dir), frame.lineno, frame.name)
+
+    return None
+
+
+def _log_if_slowest(statement, seconds):
+    if seconds < _slow_statement_min_seconds:
+        return
+
+    with _slowest_statements_lock:
+        if len(_slowest_statements) >= _slow_statement_log_size and seconds <= _slowest_statements[0][0]:
+            return
+
+        call_site = _get_call_site()
+        if len(_slowest_statements) >= _slow_statement_log_size:
+            heapq.heapreplace(_slowest_statements, (seconds, statement, call_site))
+        else:
+            heapq.heappush(_slowest_statements, (seconds, statement, call_site))
+
+    logger.warning("Slow statement (%.3f seconds) at %s\n%s", seconds, call_site, statement)
+
+
+def get_slowest_statements():
+    """
+    :return: list of (seconds, statement, call site) of the slowest statements so far, the slowest first.
+    """
+    with _slowest_statements_lock:
+        return sorted(_slowest_statements, reverse=True)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context of the statement, which is left behind along with it if the statement fails.
+    if context is not None:
+        context._statement_started_at = time.time()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, "_statement_started_at", None)
+    if started_at is None:
+        return
+
+    seconds = time.time() - started_at
+
+    request_metrics = get_request_metrics()
+    if request_metrics is not None:
+        request_metrics.queryCount += 1
+        request_metrics.dbSeconds += seconds
+
+        # Some drivers, such as sqlite3, don't report the number of rows selected.
+        if cursor.description is not None and cursor.rowcount > 0:
+            request_metrics.rowCount += cursor.rowcount
+
+    _log_if_slowest(statement, seconds)
+
+
+def _start_request_metrics():
+    g.request_metrics = RequestMetrics()
+
+
+def _record_request_metrics(response):
+    request_metrics = get_request_metrics()
+    if request_metrics is None:
+        return response
+
+    endpoint = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    labels = (endpoint, request.method)
+    values = {
+        "duration_seconds": time.time() - request_metrics.startedAt,
+        "db_queries": request_metrics.queryCount,
+        "db_seconds": request_metrics.dbSeconds,
+        "db_rows": request_metrics.rowCount,
+        "serialization_seconds": request_metrics.timedSeconds[SERIALIZATION],
+        "render_seconds": request_metrics.timedSeconds[RENDER]
+    }
+
+    with _histograms_lock:
+        for name, help_text, buckets in HISTOGRAMS:
+            histograms = _histograms.setdefault(name, {})
+            if labels not in histograms:
+                histograms[labels] = Histogram(buckets)
+
+            histograms[labels].observe(values[name])
+
+    return response
+
+
+def _escape_label_value(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def get_metrics_text():
+    """
+    Formats the histograms of all the endpoints in the Prometheus text exposition format.
+    """
+    lines = []
+
+    with _histograms_lock:
+        for name, help_text, buckets in HISTOGRAMS:
+            metric_name = METRIC_PREFIX + name
+            lines += ["# HELP %s %s" % (metric_name, help_text), "# TYPE %s histogram" % metric_name]
+
+            histograms = _histograms.get(name, {})
+            for (endpoint, method) in sorted(histograms):
+                histogram = histograms[(endpoint, method)]
+                labels = 'endpoint="%s",method="%s"' % (_escape_label_value(endpoint), method)
+
+                for bucket, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+                    lines.append('%s_bucket{%s,le="%s"} %d' % (metric_name, labels, _format_number(bucket),
+                                                              bucket_count))
+
+                lines += [
+                    '%s_bucket{%s,le="+Inf"} %d' % (metric_name, labels, histogram.count),
+                    '%s_sum{%s} %s' % (metric_name, labels, _format_number(histogram.sum)),
+                    '%s_count{%s} %d' % (metric_name, labels, histogram.count)
+                ]
+
+    return "\n".join(lines) + "\n"
+
+
+def init_app(app):
+    global _is_listening, _slow_statement_log_size, _slow_statement_min_seconds
+
+    _slow_statement_log_size = app.config.get("SLOW_STATEMENT_LOG_SIZE", DEFAULT_SLOW_STATEMENT_LOG_SIZE)
+    _slow_statement_min_seconds = app.config.get("SLOW_STATEMENT_MIN_SECONDS", DEFAULT_SLOW_STATEMENT_MIN_SECONDS)
+
+    if not _is_listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _is_listening = True
+
+    # Registered first, so that the request metrics are started before any other hook runs a query.
+    app.before_request_funcs.setdefault(None, []).insert(0, _start_request_metrics)
+    app.after_request(_record_request_metrics)
+    app.jinja_env.template_class = TimedTemplate
@@ -0,0 +1,105 @@
+import base64
+import binascii
+import json
+
+import connexion
+from flask import current_app, request
+from sqlalchemy import and_, or_
+from werkzeug.urls import url_encode
+
+from exception import BadRequestException
+from exception.messages import MESSAGE_CODE_INVALID_PAGINATION_CURSOR
+
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_MAX_PAGE_SIZE = 1000
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def get_page_size():
+    default_page_size = current_app.config.get("PAGINATION_DEFAULT_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+    max_page_size = current_app.config.get("PAGINATION_MAX_PAGE_SIZE", DEFAULT_MAX_PAGE_SIZE)
+
+    page_size = connexion.request.args.get("limit", default=default_page_size, type=int)
+    if page_size is None:
+        page_size = default_page_size
+
+    return max(1, min(page_size, max_page_size))
+
+
+def encode_cursor(keyset_values):
+    return base64.urlsafe_b64encode(json.dumps(keyset_values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, keyset_length):
+    try:
+        keyset_values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError):
+        keyset_values = None
+
+    if not isinstance(keyset_values, list) or len(keyset_values) != keyset_length:
+        BadRequestException(
+            message="Invalid pagination cursor (cursor=%s)" % cursor,
+            code=MESSAGE_CODE_INVALID_PAGINATION_CURSOR
+        )
+
+    return keyset_values
+
+
+def _get_after_keyset_filter(keyset_columns, keyset_values):
+    # (a, b) > (x, y) expanded as a > x OR (a = x AND b > y), which every database can use an index for.
+    conditions = []
+    for index, keyset_column in enumerate(keyset_columns):
+        conditions.append(and_(
+            *[keyset_columns[i] == keyset_values[i] for i in range(index)],
+            keyset_column > keyset_values[index]
+        ))
+
+    return or_(*conditions)
+
+
+def get_keyset_page(query, keyset_columns):
+    """
+    Gets a page of the query results after the cursor requested, if any.
+
+    The results are ordered by the keyset columns, which together have to be unique, replacing any order of the query.
+    Hence a page is looked up through the index of the keyset instead of skipping all the preceding rows as an offset
+    would.
+
+    :return: (results of the page, cursor of the next page or None if this is the last page)
+    """
+    page_size = get_page_size()
+
+    query = query.order_by(None).order_by(*keyset_columns)
+
+    cursor = connexion.request.args.get("cursor")
+    if cursor is not None:
+        query = query.filter(_get_after_keyset_filter(keyset_columns, decode_cursor(cursor, len(keyset_columns))))
+
+    # The keyset values are selected along with the results, so that the next cursor can be built from the last row.
+    # One more row is fetched to find out whether there's a next page.
+    rows = query.add_columns(*keyset_columns).limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(list(rows[-1][1:]))
+
+    return [row[0] for row in rows], next_cursor
+
+
+def get_keyset_paginated_response(data, next_cursor):
+    """
+    Responds a page with the link to the next page, if any, in the Link and X-Next-Cursor headers. The body is left as
+    the array of results.
+    """
+    headers = {}
+
+    if next_cursor is not None:
+        args = request.args.copy()
+        args["cursor"] = next_cursor
+
+        headers["Link"] = '<%s?%s>; rel="next"' % (request.base_url, url_encode(args))
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return data, 200, headers
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app, g
+from markupsafe import escape
+
+# Bump this whenever a change to the report templates or the extended tally sheet versions changes the rendered
+# output, so that the reports rendered by the previous code are not served anymore.
+RENDERER_VERSION = 2
+
+RENDER_TYPE_HTML = "html"
+RENDER_TYPE_LETTER_HTML = "letter-html"
+
+# The footer of a report carries the requesting user and the time of the request. Those are rendered as placeholders
+# into the cached report and filled in for each response.
+CURRENT_USER_PLACEHOLDER = "__RENDERED_REPORT_CURRENT_USER__"
+CURRENT_TIMESTAMP_PLACEHOLDER = "__RENDERED_REPORT_CURRENT_TIMESTAMP__"
+
+CACHE_TYPE_MEMORY = "memory"
+CACHE_TYPE_FILESYSTEM = "filesystem"
+CACHE_TYPE_NULL = "null"
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class RenderedReport:
+    def __init__(self, content, etag=None):
+        self.content = content
+        self.etag = etag or hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def get_html(self):
+        from auth import get_user_name
+
+        try:
+            current_user_name = get_user_name()
+        except (AttributeError, KeyError):
+            # Not rendered for an authorized request.
+            current_user_name = ""
+
+        return self.content.replace(
+            CURRENT_USER_PLACEHOLDER, str(escape(current_user_name))
+        ).replace(
+            CURRENT_TIMESTAMP_PLACEHOLDER, datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+
+
+class NullRenderedReportCache:
+    def get(self, key):
+        return None
+
+    def set(self, key, rendered_report):
+        pass
+
+
+class InMemoryRenderedReportCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._rendered_reports = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._rendered_reports:
+                return None
+
+            self._rendered_reports.move_to_end(key)
+
+            return self._rendered_reports[key][0]
+
+    def set(self, key, rendered_report):
+        size = len(rendered_report.content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._rendered_reports:
+                self.size -= self._rendered_reports.pop(key)[1]
+
+            # Evict the least recently used reports until the new one fits in.
+            while self.size + size > self.max_bytes:
+                evicted_key, (evicted_rendered_report, evicted_size) = self._rendered_reports.popitem(last=False)
+                self.size -= evicted_size
+
+            self._rendered_reports[key] = (rendered_report, size)
+            self.size += size
+
+
+class FileSystemRenderedReportCache:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _get_file_path(self, key):
+        return os.path.join(self.directory, "%s.html" % hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def get(self, key):
+        file_path = self._get_file_path(key)
+        if not os.path.exists(file_path):
+            return None
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            return RenderedReport(content=file.read())
+
+    def set(self, key, rendered_report):
+        file_path = self._get_file_path(key)
+
+        # Written to a temporary file first, so that other workers never read a partially written report.
+        temp_file_path = "%s.%d.tmp" % (file_path, os.getpid())
+        with open(temp_file_path, "w", encoding="utf-8") as file:
+            file.write(rendered_report.content)
+
+        os.replace(temp_file_path, file_path)
+
+
+_rendered_report_cache = None
+
+
+def get_rendered_report_cache():
+    global _rendered_report_cache
+
+    if _rendered_report_cache is None:
+        cache_type = current_app.config.get("RENDERED_REPORT_CACHE_TYPE", CACHE_TYPE_MEMORY)
+
+        if cache_type == CACHE_TYPE_MEMORY:
+            _rendered_report_cache = InMemoryRenderedReportCache(
+                max_bytes=current_app.config.get("RENDERED_REPORT_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES)
+            )
+        elif cache_type == CACHE_TYPE_FILESYSTEM:
+            _rendered_report_cache = FileSystemRenderedReportCache(
+                directory=current_app.config["RENDERED_REPORT_CACHE_DIR"]
+            )
+        else:
+            _rendered_report_cache = NullRenderedReportCache()
+
+    return _rendered_report_cache
+
+
+def is_rendering_cached_report():
+    return g.get("is_rendering_cached_report", False)
+
+
+def get_rendered_report_key(tally_sheet, tallySheetVersionId, render_type):
+    return "%d:%s:%s:%d" % (tallySheetVersionId, tally_sheet.template.templateName, render_type, RENDERER_VERSION)
+
+
+def get_rendered_report(tally_sheet, tallySheetVersionId, render_type):
+    """
+    Tally sheet versions are immutable, hence each of them is rendered only once per template and renderer version.
+
+    :return: RenderedReport
+    """
+    rendered_report_cache = get_rendered_report_cache()
+    key = get_rendered_report_key(tally_sheet, tallySheetVersionId, render_type)
+
+    rendered_report = rendered_report_cache.get(key)
+    if rendered_report is None:
+        g.is_rendering_cached_report = True
+        try:
+            if render_type == RENDER_TYPE_LETTER_HTML:
+                content = tally_sheet.html_letter(tallySheetVersionId=tallySheetVersionId)
+            else:
+                content = tally_sheet.html(tallySheetVersionId=tallySheetVersionId)
+        finally:
+            g.is_rendering_cached_report = False
+
+        rendered_report = RenderedReport(content=content)
+        rendered_report_cache.set(key, rendered_report)
+
+    return rendered_report
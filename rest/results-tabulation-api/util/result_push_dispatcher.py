@@ -0,0 +1,158 @@
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app import db
+from orm.enums import ResultPushStatusEnum
+
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_BACKOFF_SECONDS = 5
+DEFAULT_MAX_BACKOFF_SECONDS = 60 * 60
+DEFAULT_POLL_INTERVAL_SECONDS = 2
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_POOL_SIZE = 4
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+logger = logging.getLogger(__name__)
+
+
+class ResultPushDispatcher:
+    def __init__(self, config):
+        self.timeout = (
+            config.get("RESULT_PUSH_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT),
+            config.get("RESULT_PUSH_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)
+        )
+        self.max_attempts = config.get("RESULT_PUSH_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+        self.backoff_seconds = config.get("RESULT_PUSH_BACKOFF_SECONDS", DEFAULT_BACKOFF_SECONDS)
+        self.max_backoff_seconds = config.get("RESULT_PUSH_MAX_BACKOFF_SECONDS", DEFAULT_MAX_BACKOFF_SECONDS)
+        self.batch_size = config.get("RESULT_PUSH_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        self.pool_size = config.get("RESULT_PUSH_POOL_SIZE", DEFAULT_POOL_SIZE)
+        self.verify = config.get("RESULT_PUSH_VERIFY_SSL", False)
+
+        self._sessions = {}
+
+    def get_session(self, url):
+        # One session per endpoint, so that the connections to it are kept alive and reused.
+        url_parts = urlsplit(url)
+        endpoint = "%s://%s" % (url_parts.scheme, url_parts.netloc)
+
+        if endpoint not in self._sessions:
+            session = requests.Session()
+            session.verify = self.verify
+            session.mount(endpoint, HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size))
+            self._sessions[endpoint] = session
+
+        return self._sessions[endpoint]
+
+    def get_backoff_delay(self, attempt_count):
+        return timedelta(seconds=min(self.backoff_seconds * (2 ** (attempt_count - 1)), self.max_backoff_seconds))
+
+    def send(self, result_push):
+        request_args = {
+            "headers": {IDEMPOTENCY_KEY_HEADER: result_push.idempotencyKey},
+            "timeout": self.timeout
+        }
+
+        if result_push.params is not None:
+            request_args["params"] = json.loads(result_push.params)
+
+        if result_push.jsonBody is not None:
+            request_args["json"] = json.loads(result_push.jsonBody)
+
+        if result_push.fileId is not None:
+            request_args["data"] = result_push.file.fileContent
+            request_args["headers"]["Content-Type"] = result_push.file.fileContentType
+
+        response = self.get_session(result_push.url).post(result_push.url, **request_args)
+        logger.info("Result push %s answered with %d", result_push.idempotencyKey, response.status_code)
+        response.raise_for_status()
+
+        return response
+
+    def dispatch(self, result_push):
+        from orm.entities import ResultPush
+
+        lease_until = datetime.now() + timedelta(seconds=sum(self.timeout) * 2)
+        if not ResultPush.claim(result_push, lease_until=lease_until):
+            db.session.rollback()
+            return False
+
+        db.session.commit()
+
+        try:
+            self.send(result_push)
+
+            result_push.status = ResultPushStatusEnum.Dispatched
+            result_push.dispatchedAt = datetime.now()
+            result_push.lastError = None
+        except Exception as e:
+            result_push.attemptCount = result_push.attemptCount + 1
+            result_push.lastError = str(e)
+
+            if result_push.attemptCount >= self.max_attempts:
+                result_push.status = ResultPushStatusEnum.Failed
+            else:
+                result_push.status = ResultPushStatusEnum.Pending
+                result_push.nextAttemptAt = datetime.now() + self.get_backoff_delay(result_push.attemptCount)
+
+        db.session.commit()
+
+        return result_push.status is ResultPushStatusEnum.Dispatched
+
+    def dispatch_due(self):
+        """
+        Dispatches a batch of due pushes.
+
+        :return: number of pushes attempted.
+        """
+        from orm.entities import ResultPush
+
+        result_pushes = ResultPush.get_due(limit=self.batch_size)
+        for result_push in result_pushes:
+            self.dispatch(result_push)
+
+        return len(result_pushes)
+
+
+class ResultPushDispatcherThread(threading.Thread):
+    def __init__(self, app):
+        super(ResultPushDispatcherThread, self).__init__(name="result-push-dispatcher", daemon=True)
+        self.app = app
+        self.dispatcher = ResultPushDispatcher(app.config)
+        self.poll_interval = app.config.get("RESULT_PUSH_POLL_INTERVAL_SECONDS", DEFAULT_POLL_INTERVAL_SECONDS)
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            attempted_count = 0
+
+            with self.app.app_context():
+                try:
+                    attempted_count = self.dispatcher.dispatch_due()
+                except Exception:
+                    logger.exception("Failed to dispatch the due result pushes")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+            # Keep draining while there are due pushes, otherwise wait for new ones.
+            if attempted_count == 0:
+                self.stopped.wait(self.poll_interval)
+
+    def stop(self):
+        self.stopped.set()
+
+
+def start(app):
+    dispatcher_thread = ResultPushDispatcherThread(app)
+    dispatcher_thread.start()
+
+    return dispatcher_thread
@@ -1,8 +1,10 @@
 from exception import MethodNotAllowedException
 from exception.messages import MESSAGE_CODE_TALLY_SHEET_NOT_ALLOWED_TO_BE_RELEASED, \
     MESSAGE_CODE_TALLY_SHEET_NOT_ALLOWED_TO_BE_NOTIFIED
+import json
+
+from orm.entities import ResultPush
 from orm.entities.SubmissionVersion import TallySheetVersion
-import requests
 from app import connex_app
 from ext.ExtendedElection.ExtendedElectionPresidentialElection2019.TALLY_SHEET_CODES import PRE_30_PD, PRE_30_ED, \
     PRE_ALL_ISLAND_RESULTS, PRE_34_PD, PRE_34_ED, PRE_34_AI
@@ -58,7 +60,12 @@ def get_result_level(tally_sheet):
         return RESULT_LEVEL_ELECTORAL_DISTRICT
 
 
-def upload_proof_last_image(tally_sheet, tally_sheet_version):
+def get_idempotency_key(push_type, tally_sheet_version_id, stamp_id):
+    # A retried push keeps its key, while a tally sheet released or notified again gets a new stamp and hence a new key.
+    return "%s-%d-%d" % (push_type, tally_sheet_version_id, stamp_id)
+
+
+def upload_proof_last_image(tally_sheet, tally_sheet_version, release_result_push=None):
     if tally_sheet.tallySheetCode in release_allowed_tally_sheet_codes:
         response, result_code = tally_sheet_version.json_data()
 
@@ -78,17 +85,19 @@ def upload_proof_last_image(tally_sheet, tally_sheet_version):
         files = tally_sheet.submissionProof.scannedFiles
         last_file = files[len(files) - 1]
 
-        last_file_data = last_file.fileContent
-
-        print("#### RESULT_DISSEMINATION_API - Image Upload #### ", [url, response, last_file_data])
+        print("#### RESULT_DISSEMINATION_API - Image Upload #### ", [url, response, last_file.fileId])
 
-        result = requests.post(
+        # The file content is read only when the push is dispatched.
+        return ResultPush.create(
+            idempotencyKey=get_idempotency_key("image", tally_sheet_version.tallySheetVersionId,
+                                               tally_sheet.releasedStampId),
+            tallySheetId=tally_sheet.tallySheetId,
+            tallySheetVersionId=tally_sheet_version.tallySheetVersionId,
             url=url,
-            data=last_file_data,
-            headers={'Content-Type': last_file.fileContentType}
+            fileId=last_file.fileId,
+            # The image is accepted only for a result which is released already.
+            dependsOnResultPushId=release_result_push.resultPushId if release_result_push is not None else None
         )
-        print(result.status_code, result.content)
-        return result
     else:
         raise MethodNotAllowedException(
             message="Tally sheet is not allowed to be released.",
@@ -119,10 +128,16 @@ def release_results(tally_sheet, tally_sheet_version_id):
         )
 
         print("#### RESULT_DISSEMINATION_API - Release #### ", [url, response])
-        result = requests.post(url, verify=False, json=response)
-        print(result.status_code, result.content)
+        result = ResultPush.create(
+            idempotencyKey=get_idempotency_key("release", tally_sheet_version.tallySheetVersionId,
+                                               tally_sheet.releasedStampId),
+            tallySheetId=tally_sheet.tallySheetId,
+            tallySheetVersionId=tally_sheet_version.tallySheetVersionId,
+            url=url,
+            jsonBody=json.dumps(response)
+        )
 
-        upload_proof_last_image(tally_sheet, tally_sheet_version)
+        upload_proof_last_image(tally_sheet, tally_sheet_version, release_result_push=result)
 
         return result
     else:
@@ -164,9 +179,14 @@ def notify_results(tally_sheet, tally_sheet_version_id):
                 params[required_param] = response[required_param]
 
         print("#### RESULT_DISSEMINATION_API - Notify #### ", [url, response, params])
-        result = requests.post(url, verify=False, params=params)
-        print(result.status_code, result.content)
-        return result
+        return ResultPush.create(
+            idempotencyKey=get_idempotency_key("notify", tally_sheet_version.tallySheetVersionId,
+                                               tally_sheet.notifiedStampId),
+            tallySheetId=tally_sheet.tallySheetId,
+            tallySheetVersionId=tally_sheet_version.tallySheetVersionId,
+            url=url,
+            params=json.dumps(params)
+        )
     else:
         raise MethodNotAllowedException(
             message="Tally sheet is not allowed to be notified.",
@@ -0,0 +1,73 @@
+import base64
+import hashlib
+import mimetypes
+import os
+from collections import namedtuple
+from types import MappingProxyType
+
+from flask import current_app, url_for
+
+StaticAsset = namedtuple("StaticAsset", ["filename", "mimeType", "base64Content", "contentHash"])
+
+STATIC_ASSET_EXTENSIONS = [".png", ".jpg", ".jpeg", ".gif", ".svg", ".css"]
+
+# Loaded once at the startup and never modified afterwards.
+_static_asset_map = MappingProxyType({})
+
+
+def load(static_folder):
+    global _static_asset_map
+
+    static_asset_map = {}
+    for directory_path, directory_names, file_names in os.walk(static_folder):
+        for file_name in file_names:
+            if os.path.splitext(file_name)[1].lower() not in STATIC_ASSET_EXTENSIONS:
+                continue
+
+            file_path = os.path.join(directory_path, file_name)
+            filename = os.path.relpath(file_path, static_folder).replace(os.sep, "/")
+
+            with open(file_path, "rb") as file:
+                content = file.read()
+
+            static_asset_map[filename] = StaticAsset(
+                filename=filename,
+                mimeType=mimetypes.guess_type(file_name)[0] or "application/octet-stream",
+                base64Content=base64.b64encode(content).decode(),
+                contentHash=hashlib.sha1(content).hexdigest()
+            )
+
+    _static_asset_map = MappingProxyType(static_asset_map)
+
+    return _static_asset_map
+
+
+def get_all():
+    return _static_asset_map
+
+
+def get(filename):
+    return _static_asset_map[filename]
+
+
+def get_base64_content(filename):
+    return get(filename).base64Content
+
+
+def get_url(filename):
+    # The content hash makes the URL change along with the asset, so that the asset can be cached by the browsers.
+    return url_for('static', filename=filename, v=get(filename).contentHash)
+
+
+def get_src(filename):
+    """
+    Gets the value for a src attribute referring a static asset.
+
+    The asset is inlined as a data URI unless STATIC_ASSETS_INLINE is disabled, in which case the static URL of the
+    asset is returned instead.
+    """
+    if current_app.config.get("STATIC_ASSETS_INLINE", True):
+        static_asset = get(filename)
+        return "data:%s;base64,%s" % (static_asset.mimeType, static_asset.base64Content)
+    else:
+        return get_url(filename)
@@ -0,0 +1,113 @@
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+from util import instrumentation
+from util.id_allocation import take_id
+
+FLUSH_COUNT_HEADER = "X-DB-Flush-Count"
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+_is_listening = False
+
+
+def is_deferred():
+    return has_app_context() and g.get("unit_of_work_depth", 0) > 0
+
+
+@contextmanager
+def begin():
+    """
+    Defers the flushes of the ORM helpers until the end of the block, where the pending objects are flushed at once.
+
+    The queries run within the block still see the pending objects, as the session flushes them first. Nested blocks
+    are flushed along with the outermost one.
+    """
+    g.unit_of_work_depth = g.get("unit_of_work_depth", 0) + 1
+    try:
+        yield
+
+        if g.unit_of_work_depth == 1:
+            db.session.flush()
+    finally:
+        g.unit_of_work_depth -= 1
+
+
+def deferred(func):
+    """
+    Runs the decorated function in a unit of work.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with begin():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def flush():
+    """
+    Flushes the session, unless in a unit of work.
+    """
+    if not is_deferred():
+        db.session.flush()
+
+
+def add(instance):
+    """
+    Adds a new instance to the session, taking its id from the id blocks if the primary key is generated. Hence the id
+    is known to the caller before the instance is inserted, and the flush can be deferred.
+
+    Only the primary keys declared with autoincrement=True are taken from the blocks. Those of the submissions and
+    versions are the history ids, which are generated by the database, so that they stay in the order of creation.
+    """
+    primary_keys = instance.__mapper__.primary_key
+    if len(primary_keys) == 1 and primary_keys[0].autoincrement is True:
+        primary_key_attr = instance.__mapper__.get_property_by_column(primary_keys[0]).key
+        if getattr(instance, primary_key_attr) is None:
+            setattr(instance, primary_key_attr, take_id(type(instance)))
+
+    db.session.add(instance)
+    flush()
+
+
+def _increment_counter(name):
+    # Counted per request only, not for the management commands or the background threads.
+    if has_request_context():
+        setattr(g, name, g.get(name, 0) + 1)
+
+
+def _after_flush(session, flush_context):
+    _increment_counter("unit_of_work_flush_count")
+
+
+def _reset_counters():
+    g.unit_of_work_flush_count = 0
+
+
+def _add_debug_headers(response):
+    if current_app.config.get("UNIT_OF_WORK_DEBUG_HEADERS", current_app.config.get("DEBUG", False)):
+        response.headers[FLUSH_COUNT_HEADER] = str(g.get("unit_of_work_flush_count", 0))
+
+        # The queries are counted along with the other metrics of the request.
+        request_metrics = instrumentation.get_request_metrics()
+        if request_metrics is not None:
+            response.headers[QUERY_COUNT_HEADER] = str(request_metrics.queryCount)
+
+    return response
+
+
+def init_app(app):
+    global _is_listening
+
+    if not _is_listening:
+        event.listen(Session, "after_flush", _after_flush)
+        _is_listening = True
+
+    app.before_request(_reset_counters)
+    app.after_request(_add_debug_headers)
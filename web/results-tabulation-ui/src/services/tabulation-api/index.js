@@ -52,6 +52,19 @@ export function request(config) {
     return axiosInstance.request(config).then((res) => res.data)
 }
 
+// Follows the cursors of a paginated list endpoint until the last page.
+export async function requestAllPages(config) {
+    let results = [];
+    let cursor = undefined;
+    do {
+        const res = await axiosInstance.request({...config, params: {...config.params, cursor}});
+        results = results.concat(res.data);
+        cursor = res.headers["x-next-cursor"];
+    } while (cursor);
+
+    return results;
+}
+
 export function getElections() {
     return request({
         url: ENDPOINT_PATH_ELECTIONS(),
@@ -59,11 +72,11 @@ export function getElections() {
     })
 }
 
-export function getAreas({electionId, associatedAreaId, areaType, limit = 10000, offset = 0}) {
-    return request({
+export function getAreas({electionId, associatedAreaId, areaType, limit = 1000}) {
+    return requestAllPages({
         url: ENDPOINT_PATH_AREAS(),
         method: 'get', // default,
-        params: {electionId, associatedAreaId, areaType, limit, offset}
+        params: {electionId, associatedAreaId, areaType, limit}
     })
 }
 
@@ -132,11 +145,11 @@ async function refactorTallySheetObject(tallySheet) {
     return tallySheet
 }
 
-export async function getTallySheet({electionId, areaId, tallySheetCode, voteType, limit = 10000, offset = 0}) {
-    const tallySheets = await request({
+export async function getTallySheet({electionId, areaId, tallySheetCode, voteType, limit = 1000}) {
+    const tallySheets = await requestAllPages({
         url: ENDPOINT_PATH_TALLY_SHEETS(),
         method: 'get',
-        params: {electionId, areaId, tallySheetCode, voteType, limit, offset}
+        params: {electionId, areaId, tallySheetCode, voteType, limit}
     });
 
     for (let i = 0; i < tallySheets.length; i++) {